@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 from functools import partial
 from importlib.metadata import version
 import re
@@ -9,28 +10,44 @@ import threading
 from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 import ynca
 
+from .browse_cache import YncaBrowseCache
+from .capabilities import build_capabilities
+from .command_worker import YncaCommandWorker
 from .const import (
     COMMUNICATION_LOG_SIZE,
     CONF_SERIAL_URL,
+    DATA_CAPABILITIES,
     DATA_ZONES,
     DOMAIN,
     LOGGER,
     MANUFACTURER_NAME,
+    SIGNAL_OPTIONS_UPDATED,
     ZONE_ATTRIBUTE_NAMES,
 )
+from .entity_plan import build_entity_plan
 from .helpers import DomainEntryData, receiver_requires_audio_input_workaround
 from .input_helpers import InputHelper
 from .migrations import async_migrate_entry as migrations_async_migrate_entry
+from .refresh_scheduler import YncaRefreshScheduler
+from .registry_index import YncaRegistryIndex
+from .scene_learner import YncaSceneLearner, async_remove_learned_scenes
 from .services import async_setup_services
+from .transport import YncaSocketApi, is_socket_url
+from .update_filter import YncaUpdateFilter
+from .warmup_gate import YncaWarmupGate
+from .write_acknowledger import YncaWriteAcknowledger
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Callable
+
+    from homeassistant.core import Event, HomeAssistant
     from homeassistant.helpers.typing import ConfigType
 
 LOGGER.debug(
@@ -48,9 +65,10 @@ PLATFORMS: list[Platform] = [
 ]
 
 
-async def update_device_registry(
-    hass: HomeAssistant, config_entry: ConfigEntry, receiver: ynca.YncaApi
-) -> None:
+def build_device_attributes(
+    config_entry: ConfigEntry, receiver: ynca.YncaApi
+) -> dict[tuple[str, str], dict[str, str | None]]:
+    """Build the desired device attributes per device identifier."""
     # Configuration URL for devices connected through IP
     configuration_url = None
     if matches := re.match(
@@ -59,33 +77,66 @@ async def update_device_registry(
     ):
         configuration_url = f"http://{matches[1]}"
 
-    # Add device explicitly to registry so other entities just have to report the identifier to link up
+    devicenames = {
+        zone_subunit.id: build_zone_devicename(receiver, zone_subunit)
+        for zone_attr_name in ZONE_ATTRIBUTE_NAMES
+        if (zone_subunit := getattr(receiver, zone_attr_name))
+    }
+    if receiver.main and receiver.main.zonebavail is ynca.ZoneBAvail.READY:
+        devicenames["ZONEB"] = build_zoneb_devicename(receiver)
+
+    return {
+        (DOMAIN, f"{config_entry.entry_id}_{zone_id}"): {
+            "manufacturer": MANUFACTURER_NAME,
+            "name": devicename,
+            "model": receiver.sys.modelname,  # type: ignore[union-attr]
+            "sw_version": receiver.sys.version,  # type: ignore[union-attr]
+            "configuration_url": configuration_url,
+        }
+        for zone_id, devicename in devicenames.items()
+    }
+
+
+async def update_device_registry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    receiver: ynca.YncaApi,
+    registry_index: YncaRegistryIndex,
+) -> None:
+    # Add devices explicitly to registry so other entities just have to report the identifier to link up
+    # Setup runs on every reconnect, so only touch the registry for devices that are new or changed
     registry = dr.async_get(hass)
 
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(receiver, zone_attr_name):
-            devicename = build_zone_devicename(receiver, zone_subunit)
+    created = updated = 0
+    for identifier, attributes in build_device_attributes(
+        config_entry, receiver
+    ).items():
+        device = (
+            registry.async_get(device_id)
+            if (device_id := registry_index.device_id(identifier))
+            else None
+        )
+        if device is None:
             registry.async_get_or_create(
                 config_entry_id=config_entry.entry_id,
-                identifiers={(DOMAIN, f"{config_entry.entry_id}_{zone_subunit.id}")},
-                manufacturer=MANUFACTURER_NAME,
-                name=devicename,
-                model=receiver.sys.modelname,  # type: ignore[union-attr]
-                sw_version=receiver.sys.version,  # type: ignore[union-attr]
-                configuration_url=configuration_url,
+                identifiers={identifier},
+                **attributes,  # type: ignore[arg-type]
             )
-
-    if receiver.main and receiver.main.zonebavail is ynca.ZoneBAvail.READY:
-        devicename = build_zoneb_devicename(receiver)
-        registry.async_get_or_create(
-            config_entry_id=config_entry.entry_id,
-            identifiers={(DOMAIN, f"{config_entry.entry_id}_ZONEB")},
-            manufacturer=MANUFACTURER_NAME,
-            name=devicename,
-            model=receiver.sys.modelname,  # type: ignore[union-attr]
-            sw_version=receiver.sys.version,  # type: ignore[union-attr]
-            configuration_url=configuration_url,
-        )
+            created += 1
+        elif changes := {
+            key: value
+            for key, value in attributes.items()
+            if getattr(device, key) != value
+        }:
+            registry.async_update_device(device.id, **changes)  # type: ignore[arg-type]
+            updated += 1
+
+    LOGGER.debug(
+        "Device registry of %s: %d created, %d updated",
+        config_entry.title,
+        created,
+        updated,
+    )
 
 
 def build_zone_devicename(receiver: ynca.YncaApi, zone_subunit: ynca.ZoneBase) -> str:
@@ -113,14 +164,20 @@ async def update_configentry(
     # Older configurations setup before 5.3.0 will not have zones data filled
     # So fill it when not set already
     # If not set, options will not show for zones
+    new_data = dict(config_entry.data)
     if DATA_ZONES not in config_entry.data:
-        new_data = dict(config_entry.data)
         zones = [
             zone_attr.upper()
             for zone_attr in ZONE_ATTRIBUTE_NAMES
             if getattr(receiver, zone_attr, None)
         ]
         new_data[DATA_ZONES] = zones
+
+    # Store capabilities so the options flow does not need a connection
+    new_data[DATA_CAPABILITIES] = build_capabilities(receiver)
+
+    # Only write when something changed to avoid needless storage writes
+    if new_data != config_entry.data:
         hass.config_entries.async_update_entry(config_entry, data=new_data)
 
 
@@ -130,8 +187,9 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    # Just reload the integration on update. Crude, but it works
-    await hass.config_entries.async_reload(entry.entry_id)
+    # Apply the options to the existing entities instead of reloading
+    # Reloading would reconnect and initialize the receiver again which takes long
+    async_dispatcher_send(hass, f"{SIGNAL_OPTIONS_UPDATED}_{entry.entry_id}")
 
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
@@ -147,8 +205,15 @@ async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
 type YamahaYncaConfigEntry = ConfigEntry[DomainEntryData]
 
 
+def get_platforms(domain_entry_data: DomainEntryData) -> list[Platform]:
+    """Return the platforms that have entities in the entity plan."""
+    return [
+        platform for platform in PLATFORMS if platform in domain_entry_data.entity_plan
+    ]
+
+
 async def preset_support_detection_hack(
-    hass: HomeAssistant, ynca_receiver: ynca.YncaApi
+    command_worker: YncaCommandWorker, ynca_receiver: ynca.YncaApi
 ) -> None:
     """Check which subunits explicitly do not support presets and remove the attribute from the subunit. This will make it easy to show presets for correct subunits."""
 
@@ -195,7 +260,98 @@ async def preset_support_detection_hack(
                     ynca_message_callback_with_additional_parameters
                 )
 
-    await hass.async_add_executor_job(do_the_check)
+    await command_worker.async_run(do_the_check, timeout=None)
+
+
+async def async_shutdown_receiver(domain_entry_data: DomainEntryData) -> None:
+    """Close the connection and stop the command worker, safe to call multiple times."""
+    command_worker = domain_entry_data.command_worker
+    if command_worker.is_running:
+        await command_worker.async_run(domain_entry_data.api.close)
+        await command_worker.async_stop()
+
+
+async def async_setup_receiver(
+    hass: HomeAssistant,
+    entry: YamahaYncaConfigEntry,
+    ynca_receiver: ynca.YncaApi,
+    command_worker: YncaCommandWorker,
+) -> None:
+    LOGGER.info("%s connected", entry.title)
+
+    # Index the registries once, entities use it to find their devices cheaply
+    registry_index = YncaRegistryIndex(hass, entry.entry_id)
+    entry.async_on_unload(registry_index.async_start())
+
+    await update_device_registry(hass, entry, ynca_receiver, registry_index)
+    await preset_support_detection_hack(command_worker, ynca_receiver)
+
+    if receiver_requires_audio_input_workaround(str(ynca_receiver.sys.modelname)):  # type: ignore[union-attr]
+        # Pretend AUDIO provides a name like a normal input
+        # This makes it work with standard code
+        # Note that this _adds_ an attribute to the SYS subunit which essentially is a hack
+        ynca_receiver.sys.inpnameaudio = "AUDIO"  # type: ignore[union-attr]
+
+    # After the workaround so the capabilities include the AUDIO input
+    await update_configentry(hass, entry, ynca_receiver)
+
+    # Registered once, the connection goes away with the receiver
+    connection = ynca_receiver.get_raw_connection()
+    update_filter = YncaUpdateFilter(hass.loop, connection)
+    update_filter.attach(ynca_receiver)
+    write_acknowledger = YncaWriteAcknowledger(hass.loop, command_worker, connection)
+    connection.register_message_callback(write_acknowledger.message_callback)
+    warmup_gate = YncaWarmupGate(hass.loop, command_worker, connection)
+    connection.register_message_callback(warmup_gate.message_callback)
+    entry.async_on_unload(warmup_gate.async_stop)
+    refresh_scheduler = YncaRefreshScheduler(hass.loop, command_worker, ynca_receiver)
+    connection.register_message_callback(refresh_scheduler.message_callback)
+    entry.async_on_unload(refresh_scheduler.async_stop)
+    scene_learner = YncaSceneLearner(hass, entry.entry_id)
+    await scene_learner.async_load()
+    browse_cache = YncaBrowseCache(ynca_receiver)
+    ynca_receiver.sys.register_update_callback(browse_cache.update_sys_callback)  # type: ignore[union-attr]
+
+    domain_entry_data = DomainEntryData(
+        api=ynca_receiver,
+        initialization_events=ynca_receiver.get_communication_log_items(),
+        command_worker=command_worker,
+        registry_index=registry_index,
+        entity_plan=build_entity_plan(ynca_receiver),
+        write_acknowledger=write_acknowledger,
+        warmup_gate=warmup_gate,
+        refresh_scheduler=refresh_scheduler,
+        scene_learner=scene_learner,
+        update_filter=update_filter,
+        browse_cache=browse_cache,
+    )
+    entry.runtime_data = domain_entry_data
+
+    # Config entries are not unloaded on shutdown, so stop the worker explicitly
+    async def async_shutdown(_event: Event) -> None:
+        await async_shutdown_receiver(domain_entry_data)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown)
+    )
+
+    # Only forward the platforms that will have entities
+    await hass.config_entries.async_forward_entry_setups(
+        entry, get_platforms(domain_entry_data)
+    )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+
+def create_ynca_api(
+    hass: HomeAssistant, serial_url: str, on_disconnect: Callable[[], None]
+) -> ynca.YncaApi:
+    if is_socket_url(serial_url):
+        # Network connections are handled on the event loop, no threads needed
+        return YncaSocketApi(
+            serial_url, on_disconnect, COMMUNICATION_LOG_SIZE, loop=hass.loop
+        )
+    return ynca.YncaApi(serial_url, on_disconnect, COMMUNICATION_LOG_SIZE)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: YamahaYncaConfigEntry) -> bool:
@@ -228,45 +384,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: YamahaYncaConfigEntry) -
         # HA will take care of re-init and retries with backoff
         hass.add_job(hass.config_entries.async_schedule_reload, entry.entry_id)
 
-    ynca_receiver = ynca.YncaApi(
-        entry.data[CONF_SERIAL_URL],
-        on_disconnect,
-        COMMUNICATION_LOG_SIZE,
-    )
-    initialized = await hass.async_add_executor_job(initialize_ynca, ynca_receiver)
-
-    if initialized:
-        LOGGER.info("%s connected", entry.title)
-
-        await update_device_registry(hass, entry, ynca_receiver)
-        await update_configentry(hass, entry, ynca_receiver)
-        await preset_support_detection_hack(hass, ynca_receiver)
-
-        if receiver_requires_audio_input_workaround(str(ynca_receiver.sys.modelname)):  # type: ignore[union-attr]
-            # Pretend AUDIO provides a name like a normal input
-            # This makes it work with standard code
-            # Note that this _adds_ an attribute to the SYS subunit which essentially is a hack
-            ynca_receiver.sys.inpnameaudio = "AUDIO"  # type: ignore[union-attr]
+    ynca_receiver = create_ynca_api(hass, entry.data[CONF_SERIAL_URL], on_disconnect)
 
-        entry.runtime_data = DomainEntryData(
-            api=ynca_receiver,
-            initialization_events=ynca_receiver.get_communication_log_items(),
+    # Blocking calls for this receiver are done on its own worker thread
+    # so a slow or hanging receiver can not starve the shared executor
+    command_worker = YncaCommandWorker(entry.title)
+    command_worker.start()
+    try:
+        initialized = await command_worker.async_run(
+            initialize_ynca, ynca_receiver, timeout=None
         )
-
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-        entry.async_on_unload(entry.add_update_listener(async_update_options))
+        if initialized:
+            await async_setup_receiver(hass, entry, ynca_receiver, command_worker)
+    except BaseException:
+        # Do not leave the connection open, e.g. when setup fails after connecting.
+        # Closing is safe at any time
+        with contextlib.suppress(Exception):
+            await command_worker.async_run(ynca_receiver.close)
+        await command_worker.async_stop()
+        raise
+
+    if not initialized:
+        await command_worker.async_stop()
 
     return initialized
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: YamahaYncaConfigEntry) -> bool:
     """Unload a config entry."""
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, get_platforms(entry.runtime_data)
+    ):
+        await async_shutdown_receiver(entry.runtime_data)
 
-    def close_ynca(ynca_receiver: ynca.YncaApi) -> None:
-        ynca_receiver.close()
+    return unload_ok
 
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        await hass.async_add_executor_job(close_ynca, entry.runtime_data.api)
 
-    return unload_ok
+async def async_remove_entry(hass: HomeAssistant, entry: YamahaYncaConfigEntry) -> None:
+    """Remove data stored for a config entry."""
+    await async_remove_learned_scenes(hass, entry.entry_id)
@@ -0,0 +1,115 @@
+"""Cache the preset browse trees of a Yamaha (YNCA) receiver."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import SUPPORTED_MEDIA_ID_TYPES
+from .input_helpers import InputHelper
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.components.media_player import BrowseMedia
+
+    import ynca
+
+# Preset lists with fixed names, they do not depend on the input names
+FIXED_NAME_PRESETLISTS = ["dab:dabpresets", "dab:fmpresets"]
+
+
+@dataclass
+class BrowseMetrics:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class YncaBrowseCache:
+    """Caches the preset browse trees of a receiver, shared by all zones.
+
+    The trees only depend on the input names, the selected inputs of a zone and
+    the preset support of the subunits. Roots are cached per selection of inputs,
+    so zones with the same selection share them and a new selection gets its own root.
+    Preset support is detected once during setup, a new connection gets a new cache.
+
+    Input names are reported by the SYS subunit, when they change the trees that
+    contain names are dropped. Returned trees are shared and must not be modified.
+
+    Only preset lists of known subunits and preset commands are cached, so browsing
+    arbitrary media content ids does not grow the cache.
+    """
+
+    def __init__(self, api: ynca.YncaApi) -> None:
+        self._api = api
+        self._source_mapping: dict[ynca.Input, str] | None = None
+        self._roots: dict[frozenset[str], BrowseMedia] = {}
+        self._presetlists: dict[str, BrowseMedia] = {}
+        self.metrics = BrowseMetrics()
+
+    @property
+    def source_mapping(self) -> dict[ynca.Input, str]:
+        if self._source_mapping is None:
+            self._source_mapping = InputHelper.get_source_mapping(self._api)
+        return self._source_mapping
+
+    def get_root(
+        self, selected_inputs: list[str], build: Callable[[], BrowseMedia]
+    ) -> BrowseMedia:
+        key = frozenset(selected_inputs)
+        if (root := self._roots.get(key)) is None:
+            self.metrics.misses += 1
+            root = self._roots[key] = build()
+        else:
+            self.metrics.hits += 1
+        return root
+
+    def _is_presetlist(self, media_content_id: str) -> bool:
+        # Preset list ids look like "<subunit>:<preset command>s", e.g. "dab:fmpresets"
+        subunit_attribute_name, _, presets = media_content_id.partition(":")
+        command = presets.removesuffix("s")
+        return (
+            presets.endswith("s")
+            and command in SUPPORTED_MEDIA_ID_TYPES
+            and (subunit := getattr(self._api, subunit_attribute_name, None))
+            is not None
+            and hasattr(subunit, command)
+        )
+
+    def get_presetlist(
+        self, media_content_id: str, build: Callable[[], BrowseMedia]
+    ) -> BrowseMedia:
+        if not self._is_presetlist(media_content_id):
+            return build()
+
+        if (presetlist := self._presetlists.get(media_content_id)) is None:
+            self.metrics.misses += 1
+            presetlist = self._presetlists[media_content_id] = build()
+        else:
+            self.metrics.hits += 1
+        return presetlist
+
+    def update_sys_callback(self, function: str | None, _value: Any) -> None:
+        if (
+            function is None
+            or not function.startswith("INPNAME")
+            or self._source_mapping is None
+        ):
+            return
+
+        source_mapping = InputHelper.get_source_mapping(self._api)
+        if source_mapping == self._source_mapping:
+            return
+
+        self.metrics.invalidations += 1
+        self._source_mapping = source_mapping
+        self._roots = {}
+        self._presetlists = {
+            media_content_id: presetlist
+            for media_content_id, presetlist in self._presetlists.items()
+            if media_content_id in FIXED_NAME_PRESETLISTS
+        }
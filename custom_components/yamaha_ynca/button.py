@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.button import ButtonEntity
+from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 
 from .const import (
     CONF_NUMBER_OF_SCENES,
+    CONF_OPTIMISTIC_STATE,
     DOMAIN,
     MAX_NUMBER_OF_SCENES,
     NUMBER_OF_SCENES_AUTODETECT,
-    ZONE_ATTRIBUTE_NAMES,
+)
+from .entity import (
+    async_listen_options_updated,
+    async_run_command,
+    update_ha_state,
 )
 
 if TYPE_CHECKING:
@@ -22,33 +31,62 @@ if TYPE_CHECKING:
     from . import YamahaYncaConfigEntry
 
 
+def get_number_of_scenes(
+    config_entry: YamahaYncaConfigEntry, zone_subunit: ynca.subunits.zone.ZoneBase
+) -> int:
+    number_of_scenes = config_entry.options.get(zone_subunit.id, {}).get(
+        CONF_NUMBER_OF_SCENES, NUMBER_OF_SCENES_AUTODETECT
+    )
+    if number_of_scenes == NUMBER_OF_SCENES_AUTODETECT:
+        number_of_scenes = 0
+        for scene_id in range(1, MAX_NUMBER_OF_SCENES + 1):
+            if getattr(zone_subunit, f"scene{scene_id}name"):
+                number_of_scenes += 1
+    return min(MAX_NUMBER_OF_SCENES, number_of_scenes)
+
+
 async def async_setup_entry(
-    _hass: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    domain_entry_data = config_entry.runtime_data
-
-    entities: list[ButtonEntity] = []
-
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(domain_entry_data.api, zone_attr_name):
-            number_of_scenes = config_entry.options.get(zone_subunit.id, {}).get(
-                CONF_NUMBER_OF_SCENES, NUMBER_OF_SCENES_AUTODETECT
-            )
-            if number_of_scenes == NUMBER_OF_SCENES_AUTODETECT:
-                number_of_scenes = 0
-                for scene_id in range(1, MAX_NUMBER_OF_SCENES + 1):
-                    if getattr(zone_subunit, f"scene{scene_id}name"):
-                        number_of_scenes += 1
-            number_of_scenes = min(MAX_NUMBER_OF_SCENES, number_of_scenes)
-
-            entities.extend(
+    zone_subunits: list[ynca.subunits.zone.ZoneBase] = [
+        planned.subunit  # type: ignore[misc]
+        for planned in config_entry.runtime_data.entity_plan.get(Platform.BUTTON, [])
+    ]
+    scene_buttons: dict[str, list[YamahaYncaSceneButton]] = {
+        zone_subunit.id: [] for zone_subunit in zone_subunits
+    }
+
+    @callback
+    def async_update_scene_buttons() -> None:
+        entities: list[ButtonEntity] = []
+
+        for zone_subunit in zone_subunits:
+            buttons = scene_buttons[zone_subunit.id]
+            number_of_scenes = get_number_of_scenes(config_entry, zone_subunit)
+
+            new_buttons = [
                 YamahaYncaSceneButton(config_entry.entry_id, zone_subunit, scene_id)
-                for scene_id in range(1, number_of_scenes + 1)
-            )
+                for scene_id in range(len(buttons) + 1, number_of_scenes + 1)
+            ]
+            buttons.extend(new_buttons)
+            entities.extend(new_buttons)
+
+            # Removing from the entity registry also removes the entity from HA
+            # so no unavailable leftovers remain
+            entity_registry = er.async_get(hass)
+            while len(buttons) > number_of_scenes:
+                button = buttons.pop()
+                if button.registry_entry is not None:
+                    entity_registry.async_remove(button.entity_id)
+                else:
+                    hass.async_create_task(button.async_remove(force_remove=True))
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_update_scene_buttons()
+    async_listen_options_updated(hass, config_entry, async_update_scene_buttons)
 
 
 class YamahaYncaSceneButton(ButtonEntity):
@@ -72,7 +110,7 @@ class YamahaYncaSceneButton(ButtonEntity):
 
     def update_callback(self, function: str, _value: Any) -> None:
         if function == self._update_functioname:
-            self.schedule_update_ha_state()
+            update_ha_state(self, function)
 
     async def async_added_to_hass(self) -> None:
         self._zone.register_update_callback(self.update_callback)
@@ -89,3 +127,14 @@ class YamahaYncaSceneButton(ButtonEntity):
 
     def press(self) -> None:
         self._zone.scene(self._scene_id)
+
+    async def async_press(self) -> None:
+        # The scene learner coalesces the many updates the recall causes
+        # and shows the learned outcome right away when optimistic state is enabled
+        config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+        await config_entry.runtime_data.scene_learner.async_recall(
+            self._zone,
+            self._scene_id,
+            partial(async_run_command, self, self.press),
+            predict=config_entry.options.get(CONF_OPTIMISTIC_STATE, False),
+        )
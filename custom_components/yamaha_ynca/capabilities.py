@@ -0,0 +1,61 @@
+"""Capabilities of a Yamaha (YNCA) receiver as stored in the config entry.
+
+The options flow needs to know which inputs, scenes, sound modes and surround
+decoders a receiver supports. That information is only available from the
+receiver itself, so a compact record of it is stored in the config entry data
+on setup. This allows the options flow to be used while the receiver is
+offline or the connection is in use by something else.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import ynca
+
+from .const import MAX_NUMBER_OF_SCENES, ZONE_ATTRIBUTE_NAMES
+from .input_helpers import InputHelper
+
+CAPABILITY_INPUTS = "inputs"
+CAPABILITY_SCENES = "scenes"
+CAPABILITY_SOUNDPRG = "soundprg"
+CAPABILITY_TWOCHDECODER = "twochdecoder"
+CAPABILITY_ZONEB = "zoneb"
+
+
+def get_supported_sound_modes(modelname: str | None) -> list[str]:
+    """Return the sound modes supported by the model, sorted by name."""
+    modelinfo = ynca.YncaModelInfo.get(modelname) if modelname else None
+    sound_modes = [
+        sound_mode.value
+        for sound_mode in ynca.SoundPrg
+        if sound_mode is not ynca.SoundPrg.UNKNOWN
+        and (not modelinfo or sound_mode in modelinfo.soundprg)
+    ]
+    return sorted(sound_modes, key=str.lower)
+
+
+def build_capabilities(api: ynca.YncaApi) -> dict[str, Any]:
+    """Build the JSON serializable capability record of an initialized receiver."""
+    scenes = {}
+    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
+        if zone_subunit := getattr(api, zone_attr_name, None):
+            scenes[zone_attr_name.upper()] = sum(
+                1
+                for scene_id in range(1, MAX_NUMBER_OF_SCENES + 1)
+                if getattr(zone_subunit, f"scene{scene_id}name", None)
+            )
+
+    return {
+        CAPABILITY_INPUTS: {
+            input_.value: name.strip()
+            for input_, name in InputHelper.get_source_mapping(api).items()
+        },
+        CAPABILITY_SCENES: scenes,
+        CAPABILITY_SOUNDPRG: get_supported_sound_modes(api.sys.modelname),  # type: ignore[union-attr]
+        # Technically twochdecoder could have different values per zone, but that seems unlikely
+        CAPABILITY_TWOCHDECODER: api.main is not None
+        and api.main.twochdecoder is not None,
+        CAPABILITY_ZONEB: api.main is not None
+        and api.main.zonebavail is ynca.ZoneBAvail.READY,
+    }
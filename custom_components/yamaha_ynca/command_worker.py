@@ -0,0 +1,171 @@
+"""Dedicated command worker for a Yamaha (YNCA) receiver."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import asdict, dataclass
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_T = TypeVar("_T")
+
+COMMAND_QUEUE_SIZE = 32
+COMMAND_TIMEOUT = 10.0
+STOP_TIMEOUT = 5.0
+
+
+@dataclass
+class CommandWorkerMetrics:
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    commands_executed: int = 0
+    commands_failed: int = 0
+    commands_rejected: int = 0
+    commands_timed_out: int = 0
+    last_command_duration: float = 0.0
+    max_command_duration: float = 0.0
+    max_queue_wait: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Command:
+    future: asyncio.Future
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    queued_at: float
+
+
+class YncaCommandWorker:
+    """Runs blocking YNCA calls for one receiver serialized on its own thread.
+
+    This keeps a slow or hanging receiver from occupying the threads of the
+    executor that is shared by all of Home Assistant.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_queue_size: int = COMMAND_QUEUE_SIZE,
+    ) -> None:
+        self._name = name
+        self._max_queue_size = max_queue_size
+        # Queue itself is unbounded so stopping is always possible,
+        # the size limit is enforced when adding commands
+        self._queue: queue.Queue[_Command | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self.metrics = CommandWorkerMetrics()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"yamaha_ynca {self._name}", daemon=True
+        )
+        self._thread.start()
+
+    async def async_stop(self) -> None:
+        """Stop the worker after the already queued commands have been handled."""
+        if (thread := self._thread) is None:
+            return
+        self._thread = None
+        self._queue.put(None)
+        await asyncio.get_running_loop().run_in_executor(
+            None, thread.join, STOP_TIMEOUT
+        )
+        if thread.is_alive():
+            LOGGER.warning("Command worker for %s did not stop in time", self._name)
+
+    async def async_run(
+        self,
+        func: Callable[..., _T],
+        *args: Any,
+        timeout: float | None = COMMAND_TIMEOUT,  # noqa: ASYNC109
+    ) -> _T:
+        """Run func on the worker thread and wait for the result.
+
+        Raises HomeAssistantError when the queue is full or the command did not finish in time.
+        """
+        if not self.is_running:
+            msg = f"Command worker for {self._name} is not running"
+            raise HomeAssistantError(msg)
+
+        if self._queue.qsize() >= self._max_queue_size:
+            self.metrics.commands_rejected += 1
+            msg = f"Too many pending commands for {self._name}"
+            raise HomeAssistantError(msg)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put(_Command(future, func, args, time.monotonic()))
+        self.metrics.queue_depth = self._queue.qsize()
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, self.metrics.queue_depth
+        )
+
+        try:
+            async with asyncio.timeout(timeout):
+                return await future
+        except TimeoutError as e:
+            self.metrics.commands_timed_out += 1
+            msg = f"Command for {self._name} did not complete within {timeout} seconds"
+            raise HomeAssistantError(msg) from e
+
+    def _run(self) -> None:
+        while (command := self._queue.get()) is not None:
+            self.metrics.queue_depth = self._queue.qsize()
+            if command.future.done():
+                # Timed out while waiting in the queue
+                continue
+
+            start = time.monotonic()
+            self.metrics.max_queue_wait = max(
+                self.metrics.max_queue_wait, start - command.queued_at
+            )
+            try:
+                result = command.func(*command.args)
+            except Exception as e:  # noqa: BLE001
+                self.metrics.commands_failed += 1
+                _call_soon_threadsafe(command.future, _set_future_exception, e)
+            else:
+                _call_soon_threadsafe(command.future, _set_future_result, result)
+
+            duration = time.monotonic() - start
+            self.metrics.commands_executed += 1
+            self.metrics.last_command_duration = duration
+            self.metrics.max_command_duration = max(
+                self.metrics.max_command_duration, duration
+            )
+
+        self.metrics.queue_depth = 0
+
+
+def _call_soon_threadsafe(
+    future: asyncio.Future, callback: Callable[[asyncio.Future, Any], None], arg: Any
+) -> None:
+    # Loop can be closed already, nobody is waiting for the result anymore then
+    with contextlib.suppress(RuntimeError):
+        future.get_loop().call_soon_threadsafe(callback, future, arg)
+
+
+def _set_future_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: asyncio.Future, exception: Exception) -> None:
+    if not future.done():
+        future.set_exception(exception)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 from homeassistant.config_entries import (
     SOURCE_RECONFIGURE,
@@ -19,16 +20,36 @@ import ynca
 from .const import (
     CONF_HOST,
     CONF_PORT,
+    CONF_SCAN_NETWORK,
     CONF_SERIAL_URL,
     DATA_MODELNAME,
     DATA_ZONES,
     DOMAIN,
     LOGGER,
+    YNCA_DEFAULT_PORT,
+)
+from .discovery import (
+    YncaProbeResult,
+    YncaSerialProbeResult,
+    async_probe_receiver_cached,
+    async_probe_serial_ports,
+    async_scan_network,
+    list_serial_ports,
+    parse_scan_network,
 )
 from .options_flow import OptionsFlowHandler
+from .transport import SOCKET_URL_REGEX
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
 
 STEP_ID_SERIAL = "serial"
+STEP_ID_SERIAL_DETECT = "serial_detect"
+STEP_ID_SERIAL_DETECT_RESULTS = "serial_detect_results"
 STEP_ID_NETWORK = "network"
+STEP_ID_SCAN = "scan"
+STEP_ID_SCAN_RESULTS = "scan_results"
+STEP_ID_SSDP_CONFIRM = "ssdp_confirm"
 STEP_ID_ADVANCED = "advanced"
 PYSERIAL_URL_HANDLERS_LINK = (
     "https://pyserial.readthedocs.io/en/latest/url_handlers.html"
@@ -51,7 +72,51 @@ def get_network_schema(user_input: dict[str, Any]) -> vol.Schema:
             vol.Required(
                 CONF_HOST, default=user_input.get(CONF_HOST, vol.UNDEFINED)
             ): str,
-            vol.Required(CONF_PORT, default=user_input.get(CONF_PORT, 50000)): int,
+            vol.Required(
+                CONF_PORT, default=user_input.get(CONF_PORT, YNCA_DEFAULT_PORT)
+            ): int,
+        }
+    )
+
+
+def get_scan_schema(user_input: dict[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SCAN_NETWORK,
+                default=user_input.get(CONF_SCAN_NETWORK, vol.UNDEFINED),
+            ): str,
+            vol.Required(
+                CONF_PORT, default=user_input.get(CONF_PORT, YNCA_DEFAULT_PORT)
+            ): int,
+        }
+    )
+
+
+def get_serial_detect_results_schema(
+    detect_results: list[YncaSerialProbeResult],
+) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(CONF_SERIAL_URL): vol.In(
+                {
+                    detect_result.serial_url: f"{detect_result.modelname} ({detect_result.serial_url})"
+                    for detect_result in detect_results
+                }
+            )
+        }
+    )
+
+
+def get_scan_results_schema(scan_results: list[YncaProbeResult]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(CONF_SERIAL_URL): vol.In(
+                {
+                    scan_result.serial_url: f"{scan_result.modelname} ({scan_result.host})"
+                    for scan_result in scan_results
+                }
+            )
         }
     )
 
@@ -77,6 +142,11 @@ class YamahaYncaConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 7
     MINOR_VERSION = 8
 
+    def __init__(self) -> None:
+        self._scan_results: list[YncaProbeResult] = []
+        self._serial_detect_results: list[YncaSerialProbeResult] = []
+        self._discovered_receiver: YncaProbeResult | None = None
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlowHandler:
@@ -88,7 +158,13 @@ class YamahaYncaConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         return self.async_show_menu(
             step_id="user",
-            menu_options=[STEP_ID_SERIAL, STEP_ID_NETWORK, STEP_ID_ADVANCED],
+            menu_options=[
+                STEP_ID_SERIAL,
+                STEP_ID_SERIAL_DETECT,
+                STEP_ID_NETWORK,
+                STEP_ID_SCAN,
+                STEP_ID_ADVANCED,
+            ],
         )
 
     async def async_try_connect(
@@ -161,6 +237,45 @@ class YamahaYncaConfigFlow(ConfigFlow, domain=DOMAIN):
             STEP_ID_SERIAL, get_serial_url_schema(user_input), user_input
         )
 
+    async def async_step_serial_detect(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        # Ports in use by the integration are skipped, probing would disturb the connection
+        configured_serial_urls = {
+            entry.data.get(CONF_SERIAL_URL)
+            for entry in self._async_current_entries(include_ignore=False)
+        }
+        serial_urls = [
+            serial_url
+            for serial_url in await self.hass.async_add_executor_job(list_serial_ports)
+            if serial_url not in configured_serial_urls
+        ]
+        self._serial_detect_results = await async_probe_serial_ports(
+            self.hass, serial_urls
+        )
+
+        if not self._serial_detect_results:
+            return self.async_show_form(
+                step_id=STEP_ID_SERIAL,
+                data_schema=get_serial_url_schema({}),
+                errors={"base": "no_serial_receivers_found"},
+            )
+
+        return await self.async_step_serial_detect_results()
+
+    async def async_step_serial_detect_results(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        data_schema = get_serial_detect_results_schema(self._serial_detect_results)
+        if user_input is None:
+            return self.async_show_form(
+                step_id=STEP_ID_SERIAL_DETECT_RESULTS, data_schema=data_schema
+            )
+
+        return await self.async_try_connect(
+            STEP_ID_SERIAL_DETECT_RESULTS, data_schema, user_input
+        )
+
     async def async_step_network(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -187,6 +302,105 @@ class YamahaYncaConfigFlow(ConfigFlow, domain=DOMAIN):
             STEP_ID_NETWORK, get_network_schema(user_input), connection_data
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        if user_input is None:
+            return self.async_show_form(
+                step_id=STEP_ID_SCAN, data_schema=get_scan_schema({})
+            )
+
+        errors = {}
+        try:
+            network = parse_scan_network(user_input[CONF_SCAN_NETWORK])
+        except ValueError:
+            errors["base"] = "invalid_scan_network"
+        else:
+            # Configured receivers are not probed to not interfere with their connection
+            self._scan_results = await async_scan_network(
+                network, user_input[CONF_PORT], self._async_configured_hosts()
+            )
+            if self._scan_results:
+                return await self.async_step_scan_results()
+            errors["base"] = "no_receivers_found"
+
+        return self.async_show_form(
+            step_id=STEP_ID_SCAN, data_schema=get_scan_schema(user_input), errors=errors
+        )
+
+    async def async_step_scan_results(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        data_schema = get_scan_results_schema(self._scan_results)
+        if user_input is None:
+            return self.async_show_form(
+                step_id=STEP_ID_SCAN_RESULTS, data_schema=data_schema
+            )
+
+        return await self.async_try_connect(
+            STEP_ID_SCAN_RESULTS, data_schema, user_input
+        )
+
+    def _async_configured_hosts(self) -> set[str]:
+        return {
+            matches["host"]
+            for entry in self._async_current_entries(include_ignore=False)
+            if (matches := SOCKET_URL_REGEX.match(entry.data.get(CONF_SERIAL_URL, "")))
+        }
+
+    async def async_step_ssdp(
+        self, discovery_info: SsdpServiceInfo
+    ) -> ConfigFlowResult:
+        """Handle a receiver announced with SSDP."""
+        host = urlparse(discovery_info.ssdp_location or "").hostname
+        if host is None:
+            return self.async_abort(reason="not_ynca_device")
+
+        await self.async_set_unique_id(discovery_info.ssdp_udn)
+        self._abort_if_unique_id_configured()
+
+        # Entries added manually have no unique id, so match on host.
+        # Checked before probing to not interfere with the connection of the integration.
+        if host in self._async_configured_hosts():
+            return self.async_abort(reason="already_configured")
+
+        receiver = await async_probe_receiver_cached(self.hass, host)
+        if receiver is None:
+            return self.async_abort(reason="not_ynca_device")
+
+        self._discovered_receiver = receiver
+        self.context["title_placeholders"] = {"name": receiver.modelname}
+        return await self.async_step_ssdp_confirm()
+
+    async def async_step_ssdp_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        receiver = self._discovered_receiver
+        if TYPE_CHECKING:  # pragma: no cover
+            assert receiver is not None
+
+        if user_input is None:
+            self._set_confirm_only()
+            return self.async_show_form(
+                step_id=STEP_ID_SSDP_CONFIRM,
+                description_placeholders={
+                    "modelname": receiver.modelname,
+                    "host": receiver.host,
+                },
+            )
+
+        # Could have been added manually in the meantime
+        self._async_abort_entries_match({CONF_SERIAL_URL: receiver.serial_url})
+
+        return self.async_create_entry(
+            title=receiver.modelname,
+            data={
+                CONF_SERIAL_URL: receiver.serial_url,
+                DATA_MODELNAME: receiver.modelname,
+                DATA_ZONES: list(receiver.zones),
+            },
+        )
+
     async def async_step_advanced(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
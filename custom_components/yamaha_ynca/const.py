@@ -12,12 +12,19 @@ COMMUNICATION_LOG_SIZE = 5000
 CONF_SERIAL_URL = "serial_url"
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_SCAN_NETWORK = "scan_network"
+
+YNCA_DEFAULT_PORT = 50000
 
 DATA_MODELNAME = "modelname"
 DATA_ZONES = "zones"
+DATA_CAPABILITIES = "capabilities"
 
 ATTR_COMMANDS = "commands"
 
+# Suffixed with the config entry id
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated"
+
 MANUFACTURER_NAME = "Yamaha"
 
 ZONE_MAX_VOLUME = 16.5  # Seems to be 16.5 when MAXVOL function not implemented
@@ -34,10 +41,13 @@ CONF_SELECTED_SOUND_MODES = "selected_sound_modes"
 CONF_SELECTED_INPUTS = "selected_inputs"
 CONF_SELECTED_SURROUND_DECODERS = "selected_surround_decoders"
 CONF_NUMBER_OF_SCENES = "number_of_scenes"
+CONF_OPTIMISTIC_STATE = "optimistic_state"
+CONF_ZONE_GROUP = "zone_group"
 NUMBER_OF_SCENES_AUTODETECT = -1
 MAX_NUMBER_OF_SCENES = 12
 
 NUM_PRESETS = 40
+SUPPORTED_MEDIA_ID_TYPES = ["dabpreset", "fmpreset", "preset"]
 
 TWOCHDECODER_STRINGS = {
     "dolby_pl": "Dolby Pro Logic",
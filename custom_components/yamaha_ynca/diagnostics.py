@@ -32,5 +32,19 @@ async def async_get_config_entry_diagnostics(
             "initialization": domain_entry_data.initialization_events,
             "history": api.get_communication_log_items(),
         }
+        data["command_worker"] = domain_entry_data.command_worker.metrics.as_dict()
+        write_acknowledger = domain_entry_data.write_acknowledger
+        data["writes"] = write_acknowledger.metrics.as_dict()
+        data["writes"]["pending"] = [
+            pending_write.as_dict()
+            for pending_write in write_acknowledger.pending_writes
+        ]
+        data["warmup"] = domain_entry_data.warmup_gate.metrics.as_dict()
+        data["refreshes"] = domain_entry_data.refresh_scheduler.metrics.as_dict()
+        data["updates"] = domain_entry_data.update_filter.metrics.as_dict()
+        data["browse"] = domain_entry_data.browse_cache.metrics.as_dict()
+        scene_learner = domain_entry_data.scene_learner
+        data["scenes"] = scene_learner.metrics.as_dict()
+        data["scenes"]["learned"] = scene_learner.learned_scenes
 
     return data
@@ -0,0 +1,229 @@
+"""Discovery of Yamaha (YNCA) receivers on the network."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import ipaddress
+import re
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.util.hass_dict import HassKey
+import serial  # type: ignore[import-untyped]
+import serial.tools.list_ports  # type: ignore[import-untyped]
+
+from .const import DOMAIN, LOGGER, YNCA_DEFAULT_PORT
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from homeassistant.core import HomeAssistant
+
+PROBE_TIMEOUT = 1.0
+PROBE_CACHE_TIME = 300
+SCAN_MAX_CONCURRENCY = 64
+SCAN_MAX_HOSTS = 1024
+SERIAL_READ_TIMEOUT = 0.05
+
+# Everything is requested in one go to keep the connection open as short as possible,
+# only one YNCA connection is allowed so a probe can block the setup of the integration.
+# When the receiver is in low power mode the first command is to wake up and gets lost,
+# so modelname is requested twice. VERSION marks the end.
+_PROBE_REQUEST = b"".join(
+    f"{line}\r\n".encode()
+    for line in [
+        "@SYS:MODELNAME=?",
+        "@SYS:MODELNAME=?",
+        "@MAIN:AVAIL=?",
+        "@ZONE2:AVAIL=?",
+        "@ZONE3:AVAIL=?",
+        "@ZONE4:AVAIL=?",
+        "@SYS:VERSION=?",
+    ]
+)
+_PROBE_RESPONSE_REGEX = re.compile(
+    rb"@(?P<subunit>SYS|MAIN|ZONE\d):(?P<function>MODELNAME|AVAIL|VERSION)=(?P<value>.*?)\r?\n"
+)
+
+DATA_PROBE_CACHE: HassKey[dict[str, tuple[float, YncaProbeResult | None]]] = HassKey(
+    f"{DOMAIN}_probe_cache"
+)
+
+
+@dataclass(frozen=True)
+class YncaProbeResult:
+    host: str
+    port: int
+    modelname: str
+    zones: tuple[str, ...] = ()
+
+    @property
+    def serial_url(self) -> str:
+        return f"socket://{self.host}:{self.port}"
+
+
+@dataclass(frozen=True)
+class YncaSerialProbeResult:
+    serial_url: str
+    modelname: str
+    zones: tuple[str, ...] = ()
+
+
+@dataclass
+class _ProbeResponse:
+    modelname: str | None = None
+    zones: list[str] = field(default_factory=list)
+    complete: bool = False
+
+    def handle_line(self, line: bytes) -> bool:
+        """Handle a received line, returns True when the complete response was received."""
+        if matches := _PROBE_RESPONSE_REGEX.match(line):
+            if matches["function"] == b"MODELNAME":
+                self.modelname = matches["value"].decode("utf-8", "replace")
+            elif matches["function"] == b"AVAIL":
+                self.zones.append(matches["subunit"].decode())
+            else:
+                self.complete = True
+        return self.complete
+
+    @property
+    def valid(self) -> bool:
+        return self.complete and self.modelname is not None
+
+
+async def async_probe_receiver(
+    host: str, port: int = YNCA_DEFAULT_PORT, probe_timeout: float = PROBE_TIMEOUT
+) -> YncaProbeResult | None:
+    """Check if a YNCA receiver is listening on host:port and get modelname and zones in a single round trip.
+
+    Returns None when nothing answers or the answer is not YNCA.
+    """
+    response = _ProbeResponse()
+    writer = None
+    try:
+        async with asyncio.timeout(probe_timeout):
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(_PROBE_REQUEST)
+            await writer.drain()
+            while line := await reader.readline():
+                if response.handle_line(line):
+                    break
+    except (TimeoutError, OSError, ValueError):
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if not response.valid:
+        return None
+    return YncaProbeResult(host, port, response.modelname, tuple(response.zones))  # type: ignore[arg-type]
+
+
+def probe_serial_port(
+    serial_url: str, probe_timeout: float = PROBE_TIMEOUT
+) -> YncaSerialProbeResult | None:
+    """Check if a YNCA receiver is connected to the serial port, same handshake as for the network.
+
+    Blocking, returns None when nothing answers or the answer is not YNCA.
+    """
+    response = _ProbeResponse()
+    deadline = time.monotonic() + probe_timeout
+    try:
+        with serial.serial_for_url(
+            serial_url, timeout=SERIAL_READ_TIMEOUT, write_timeout=probe_timeout
+        ) as port:
+            port.write(_PROBE_REQUEST)
+            buffer = b""
+            while time.monotonic() < deadline and not response.complete:
+                buffer += port.read(port.in_waiting or 1)
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if response.handle_line(line + b"\n"):
+                        break
+    except (serial.SerialException, OSError, ValueError):
+        pass
+
+    if not response.valid:
+        return None
+    return YncaSerialProbeResult(
+        serial_url,
+        response.modelname,  # type: ignore[arg-type]
+        tuple(response.zones),
+    )
+
+
+def list_serial_ports() -> list[str]:
+    """List the serial ports of this machine, blocking."""
+    return sorted(port.device for port in serial.tools.list_ports.comports())
+
+
+async def async_probe_serial_ports(
+    hass: HomeAssistant, serial_urls: list[str], probe_timeout: float = PROBE_TIMEOUT
+) -> list[YncaSerialProbeResult]:
+    """Probe the serial ports concurrently, returns the ports with a receiver in the same order."""
+    results = await asyncio.gather(
+        *(
+            hass.async_add_executor_job(probe_serial_port, serial_url, probe_timeout)
+            for serial_url in serial_urls
+        )
+    )
+    return [result for result in results if result is not None]
+
+
+async def async_probe_receiver_cached(
+    hass: HomeAssistant, host: str, port: int = YNCA_DEFAULT_PORT
+) -> YncaProbeResult | None:
+    """Probe the receiver unless it was probed recently, also caches failed probes."""
+    cache = hass.data.setdefault(DATA_PROBE_CACHE, {})
+    key = f"{host}:{port}"
+    if (cached := cache.get(key)) and time.monotonic() - cached[0] < PROBE_CACHE_TIME:
+        return cached[1]
+
+    result = await async_probe_receiver(host, port)
+    cache[key] = (time.monotonic(), result)
+    return result
+
+
+def parse_scan_network(network: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    """Parse network in CIDR notation, e.g. 192.168.1.0/24.
+
+    Raises ValueError when the network is invalid or has too many hosts to scan.
+    """
+    parsed_network = ipaddress.ip_network(network.strip(), strict=False)
+    if parsed_network.num_addresses > SCAN_MAX_HOSTS:
+        msg = f"Network {network} is too large to scan"
+        raise ValueError(msg)
+    return parsed_network
+
+
+async def async_scan_network(
+    network: ipaddress.IPv4Network | ipaddress.IPv6Network,
+    port: int = YNCA_DEFAULT_PORT,
+    exclude_hosts: Collection[str] = (),
+    max_concurrency: int = SCAN_MAX_CONCURRENCY,
+    probe_timeout: float = PROBE_TIMEOUT,
+) -> list[YncaProbeResult]:
+    """Probe all hosts in the network concurrently, returns the found receivers ordered by address.
+
+    Excluded hosts are not probed, e.g. receivers that are already connected
+    since they only allow one connection.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def probe(host: str) -> YncaProbeResult | None:
+        async with semaphore:
+            return await async_probe_receiver(host, port, probe_timeout)
+
+    LOGGER.debug("Scanning %s on port %d", network, port)
+    results = await asyncio.gather(
+        *(
+            probe(str(host))
+            for host in network.hosts()
+            if str(host) not in exclude_hosts
+        )
+    )
+    found = [result for result in results if result is not None]
+    LOGGER.debug("Scan of %s found %s", network, found)
+
+    return found
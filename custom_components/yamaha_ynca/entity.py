@@ -2,17 +2,108 @@
 
 from __future__ import annotations
 
+from functools import partial
+import threading
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 
-from custom_components.yamaha_ynca.const import DOMAIN
+from custom_components.yamaha_ynca.const import (
+    CONF_OPTIMISTIC_STATE,
+    DOMAIN,
+    SIGNAL_OPTIONS_UPDATED,
+)
 import ynca
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import Entity
+
     from ynca.subunit import SubunitBase
     from ynca.subunits.zone import ZoneBase
 
+    from . import YamahaYncaConfigEntry
+
+
+async def async_run_command(
+    entity: Entity, func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> None:
+    """Run a blocking receiver command on the command worker of the receiver of the entity."""
+    config_entry: YamahaYncaConfigEntry = entity.platform.config_entry  # type: ignore[assignment]
+    await config_entry.runtime_data.command_worker.async_run(
+        partial(func, *args, **kwargs)
+    )
+
+
+async def async_write_acknowledged(
+    entity: Entity, subunit: SubunitBase, attribute: str, value: Any
+) -> None:
+    """Write a value to the receiver and wait for the receiver to acknowledge it, retries when needed.
+
+    With optimistic state enabled the entity shows the value while waiting.
+    """
+    config_entry: YamahaYncaConfigEntry = entity.platform.config_entry  # type: ignore[assignment]
+    await config_entry.runtime_data.write_acknowledger.async_write(
+        subunit,
+        attribute,
+        value,
+        on_optimistic_update=partial(update_ha_state, entity)
+        if config_entry.options.get(CONF_OPTIMISTIC_STATE, False)
+        else None,
+    )
+
+
+def get_optimistic_value(entity: Entity, subunit: SubunitBase, attribute: str) -> Any:
+    """Return the value of the attribute, or the value of a pending optimistic write to it.
+
+    While a scene is recalled the predicted value of the scene is used until the receiver reports it.
+    """
+    value = getattr(subunit, attribute, None)
+    if entity.platform is None:
+        return value
+    config_entry: YamahaYncaConfigEntry = entity.platform.config_entry  # type: ignore[assignment]
+    runtime_data = config_entry.runtime_data
+    return runtime_data.write_acknowledger.get_optimistic_value(
+        subunit,
+        attribute,
+        runtime_data.scene_learner.get_predicted_value(subunit, attribute, value),
+    )
+
+
+def async_listen_options_updated(
+    hass: HomeAssistant,
+    config_entry: YamahaYncaConfigEntry,
+    target: Callable[[], None],
+) -> None:
+    """Call target on the event loop when the options of the config entry were updated, until the entry is unloaded."""
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_OPTIONS_UPDATED}_{config_entry.entry_id}", target
+        )
+    )
+
+
+def update_ha_state(entity: Entity, function: str | None = None) -> None:
+    """Write the state of the entity, function is the reported function that caused the update.
+
+    Updates from network connected receivers arrive on the event loop and are
+    written immediately, updates from the serial reader thread are scheduled.
+    While a scene is recalled the writes for functions the scene is expected to change
+    are coalesced until the receiver is done.
+    """
+    if entity.platform is not None and function is not None:
+        config_entry: YamahaYncaConfigEntry = entity.platform.config_entry  # type: ignore[assignment]
+        if config_entry.runtime_data.scene_learner.defer_update(entity, function):
+            return
+
+    if entity.hass is not None and entity.hass.loop_thread_id == threading.get_ident():
+        entity.async_write_ha_state()
+    else:
+        entity.schedule_update_ha_state()
+
 
 class YamahaYncaSettingEntity:
     """Common code for YamahaYnca settings entities.
@@ -60,8 +151,8 @@ class YamahaYncaSettingEntity:
 
     def update_callback(self, function: str, _value: Any) -> None:
         if function in self._relevant_updates:
-            # schedule_update_ha_state is part of Entity, but typechecker does not know
-            self.schedule_update_ha_state()  # type: ignore[attr-defined]
+            # Derived classes are also an Entity, but typechecker does not know
+            update_ha_state(self, function)  # type: ignore[arg-type]
 
     async def async_added_to_hass(self) -> None:
         self._subunit.register_update_callback(self.update_callback)
@@ -0,0 +1,138 @@
+"""Plan of the entities to create for a Yamaha (YNCA) receiver.
+
+The capabilities of a receiver are scanned once after initialization.
+The resulting plan determines which platforms get set up and each platform
+creates the entities from its part of the plan without probing the receiver again.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.const import Platform
+
+import ynca
+
+from .const import ZONE_ATTRIBUTE_NAMES
+from .number import (
+    ENTITY_DESCRIPTIONS as NUMBER_ENTITY_DESCRIPTIONS,
+    InitialVolumeValueEntityDescription,
+)
+from .select import (
+    ENTITY_DESCRIPTIONS as SELECT_ENTITY_DESCRIPTIONS,
+    SYS_ENTITY_DESCRIPTIONS as SELECT_SYS_ENTITY_DESCRIPTIONS,
+)
+from .sensor import ENTITY_DESCRIPTIONS as SENSOR_ENTITY_DESCRIPTIONS
+from .switch import (
+    SYS_ENTITY_DESCRIPTIONS as SWITCH_SYS_ENTITY_DESCRIPTIONS,
+    ZONE_ENTITY_DESCRIPTIONS as SWITCH_ZONE_ENTITY_DESCRIPTIONS,
+    get_subwoofer_descriptions,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import EntityDescription
+
+    from ynca.subunit import SubunitBase
+    from ynca.subunits.zone import ZoneBase
+
+
+@dataclass(frozen=True)
+class PlannedEntity:
+    subunit: SubunitBase
+    description: EntityDescription | None = None
+    associated_zone: ZoneBase | None = None
+    """Zone for entities on the SYS subunit that are tied to a zone."""
+    zoneb: bool = False
+    """Media player for ZoneB, the subunit is the MAIN zone."""
+
+
+type EntityPlan = dict[Platform, list[PlannedEntity]]
+
+
+def _zone_subunits(api: ynca.YncaApi) -> list[ZoneBase]:
+    return [
+        zone_subunit
+        for zone_attr_name in ZONE_ATTRIBUTE_NAMES
+        if (zone_subunit := getattr(api, zone_attr_name))
+    ]
+
+
+def _plan_sys_entities(api: ynca.YncaApi, descriptions: list) -> list[PlannedEntity]:
+    # These are features on the SYS subunit, but they are tied to a zone
+    return [
+        PlannedEntity(api.sys, entity_description, associated_zone=zone_subunit)  # type: ignore[arg-type]
+        for entity_description in descriptions
+        if getattr(api.sys, entity_description.key, None) is not None
+        and entity_description.associated_zone_attr
+        and (
+            zone_subunit := getattr(api, entity_description.associated_zone_attr, None)
+        )
+    ]
+
+
+def build_entity_plan(api: ynca.YncaApi) -> EntityPlan:
+    """Scan the capabilities of the initialized receiver, only platforms with entities are included."""
+    zone_subunits = _zone_subunits(api)
+
+    media_players = [PlannedEntity(zone_subunit) for zone_subunit in zone_subunits]
+    if api.main and api.main.zonebavail is ynca.ZoneBAvail.READY:
+        media_players.append(PlannedEntity(api.main, zoneb=True))
+
+    numbers: list[PlannedEntity] = []
+    for zone_subunit in zone_subunits:
+        numbers.extend(
+            PlannedEntity(zone_subunit, entity_description)
+            for entity_description in NUMBER_ENTITY_DESCRIPTIONS
+            if getattr(zone_subunit, entity_description.key, None) is not None
+        )
+        if zone_subunit.initvollvl is not None:
+            numbers.append(
+                PlannedEntity(zone_subunit, InitialVolumeValueEntityDescription)
+            )
+
+    selects = [
+        PlannedEntity(zone_subunit, entity_description)
+        for zone_subunit in zone_subunits
+        for entity_description in SELECT_ENTITY_DESCRIPTIONS
+        if entity_description.is_supported(zone_subunit)
+    ]
+    selects.extend(_plan_sys_entities(api, SELECT_SYS_ENTITY_DESCRIPTIONS))
+
+    sensors = [
+        PlannedEntity(zone_subunit, entity_description)
+        for zone_subunit in zone_subunits
+        for entity_description in SENSOR_ENTITY_DESCRIPTIONS
+        if entity_description.is_supported(entity_description, zone_subunit)
+    ]
+
+    switches = [
+        PlannedEntity(zone_subunit, entity_description)
+        for zone_subunit in zone_subunits
+        for entity_description in SWITCH_ZONE_ENTITY_DESCRIPTIONS
+        if entity_description.is_supported(zone_subunit)
+    ]
+    if api.sys:
+        switches.extend(
+            _plan_sys_entities(
+                api,
+                SWITCH_SYS_ENTITY_DESCRIPTIONS + get_subwoofer_descriptions(api.sys),
+            )
+        )
+
+    plan: EntityPlan = {
+        Platform.MEDIA_PLAYER: media_players,
+        # The number of scene buttons is an option that can change without reload,
+        # so buttons are planned per zone and the button platform handles the scenes
+        Platform.BUTTON: [
+            PlannedEntity(zone_subunit) for zone_subunit in zone_subunits
+        ],
+        Platform.NUMBER: numbers,
+        Platform.SELECT: selects,
+        Platform.SENSOR: sensors,
+        Platform.SWITCH: switches,
+        Platform.REMOTE: [
+            PlannedEntity(zone_subunit) for zone_subunit in zone_subunits
+        ],
+    }
+    return {platform: entities for platform, entities in plan.items() if entities}
@@ -11,11 +11,30 @@ if TYPE_CHECKING:  # pragma: no cover
     import ynca
     from ynca.subunit import SubunitBase
 
+    from .browse_cache import YncaBrowseCache
+    from .command_worker import YncaCommandWorker
+    from .entity_plan import EntityPlan
+    from .refresh_scheduler import YncaRefreshScheduler
+    from .registry_index import YncaRegistryIndex
+    from .scene_learner import YncaSceneLearner
+    from .update_filter import YncaUpdateFilter
+    from .warmup_gate import YncaWarmupGate
+    from .write_acknowledger import YncaWriteAcknowledger
+
 
 @dataclass
 class DomainEntryData:
     api: ynca.YncaApi
     initialization_events: list[str]
+    command_worker: YncaCommandWorker
+    registry_index: YncaRegistryIndex
+    entity_plan: EntityPlan
+    write_acknowledger: YncaWriteAcknowledger
+    warmup_gate: YncaWarmupGate
+    refresh_scheduler: YncaRefreshScheduler
+    scene_learner: YncaSceneLearner
+    update_filter: YncaUpdateFilter
+    browse_cache: YncaBrowseCache
 
 
 def scale(
@@ -3,7 +3,8 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Callable
 import contextlib
-from functools import wraps
+from dataclasses import dataclass
+from functools import partial, wraps
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components import media_source
@@ -18,10 +19,10 @@ from homeassistant.components.media_player import (
     MediaType,
     RepeatMode,
 )
+from homeassistant.const import Platform
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers import (
-    device_registry as dr,
-)
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt
 
@@ -31,28 +32,61 @@ from . import YamahaYncaConfigEntry, build_zone_devicename, build_zoneb_devicena
 from .const import (
     CONF_SELECTED_INPUTS,
     CONF_SELECTED_SOUND_MODES,
+    CONF_ZONE_GROUP,
     DOMAIN,
     LOGGER,
     NUM_PRESETS,
-    ZONE_ATTRIBUTE_NAMES,
+    SUPPORTED_MEDIA_ID_TYPES,
     ZONE_MAX_VOLUME,
     ZONE_MIN_VOLUME,
 )
+from .entity import (
+    async_listen_options_updated,
+    async_run_command,
+    async_write_acknowledged,
+    get_optimistic_value,
+    update_ha_state,
+)
 from .helpers import extract_protocol_version, scale
 from .input_helpers import InputHelper
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Generator, Mapping
+    from collections.abc import Awaitable, Generator, Mapping
 
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from ynca import Main, ZoneBase
 
+    from .browse_cache import YncaBrowseCache
+    from .warmup_gate import YncaWarmupGate
+
 
 STRAIGHT = "Straight"
 
-SUPPORTED_MEDIA_ID_TYPES = ["dabpreset", "fmpreset", "preset"]
+# Functions that change the state of a zone group
+ZONE_GROUP_FUNCTIONS = {
+    "PWR",
+    "PWRB",
+    "VOL",
+    "ZONEBVOL",
+    "MAXVOL",
+    "MUTE",
+    "ZONEBMUTE",
+    "INP",
+}
+ZONE_GROUP_VOLUME_STEP = 0.5
+
+
+@dataclass(frozen=True)
+class ZoneGroupMemberState:
+    """Snapshot of the state of a zone that is member of a zone group."""
+
+    on: bool
+    volume: float | None
+    volume_range: tuple[float, float]
+    muted: bool | None
+    source: str | None
 
 
 def _trim_whitespace(
@@ -68,35 +102,55 @@ def _trim_whitespace(
     return wrapper
 
 
+def get_selected_sound_modes(config_entry: YamahaYncaConfigEntry) -> list[str]:
+    return config_entry.options.get(
+        CONF_SELECTED_SOUND_MODES,
+        [sp.value for sp in ynca.SoundPrg if sp is not ynca.SoundPrg.UNKNOWN],
+    )
+
+
+def get_selected_inputs(
+    config_entry: YamahaYncaConfigEntry, api: ynca.YncaApi, zone_subunit: ZoneBase
+) -> list[str]:
+    all_inputs = [
+        input_.value for input_ in ynca.Input if input_ is not ynca.Input.UNKNOWN
+    ]
+    selected_inputs: list[str] = list(
+        config_entry.options.get(zone_subunit.id, {}).get(
+            CONF_SELECTED_INPUTS, all_inputs
+        )
+    )
+
+    # Main Zone Sync is part of all_inputs
+    # but main zone can't sync with itself, so remove it
+    if zone_subunit == api.main:
+        with contextlib.suppress(ValueError):
+            selected_inputs.remove(ynca.Input.MAIN_ZONE_SYNC.value)
+
+    return selected_inputs
+
+
 async def async_setup_entry(
-    _hass: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     domain_entry_data = config_entry.runtime_data
     api = domain_entry_data.api
 
-    entities: list[MediaPlayerEntity] = []
+    entities: list[YamahaYncaZone] = []
 
-    selected_sound_modes = config_entry.options.get(
-        CONF_SELECTED_SOUND_MODES,
-        [sp.value for sp in ynca.SoundPrg if sp is not ynca.SoundPrg.UNKNOWN],
-    )
-    all_inputs = [
-        input_.value for input_ in ynca.Input if input_ is not ynca.Input.UNKNOWN
-    ]
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(api, zone_attr_name):
-            selected_inputs: list[str] = config_entry.options.get(
-                zone_subunit.id, {}
-            ).get(CONF_SELECTED_INPUTS, list(all_inputs))
-
-            # Main Zone Sync is part of all_inputs
-            # but main zone can't sync with itself, so remove it
-            if zone_subunit == api.main:
-                with contextlib.suppress(ValueError):
-                    selected_inputs.remove(ynca.Input.MAIN_ZONE_SYNC.value)
+    selected_sound_modes = get_selected_sound_modes(config_entry)
+    for planned in domain_entry_data.entity_plan.get(Platform.MEDIA_PLAYER, []):
+        zone_subunit: ZoneBase = planned.subunit  # type: ignore[assignment]
+        selected_inputs = get_selected_inputs(config_entry, api, zone_subunit)
 
+        if planned.zoneb:
+            # ZoneB is part of the MAIN zone and shares its inputs
+            entities.append(
+                YamahaYncaZoneB(config_entry.entry_id, api, selected_inputs)
+            )
+        else:
             entities.append(
                 YamahaYncaZone(
                     config_entry.entry_id,
@@ -107,15 +161,42 @@ async def async_setup_entry(
                 )
             )
 
-            if (
-                zone_subunit == api.main
-                and api.main.zonebavail is ynca.ZoneBAvail.READY
-            ):
-                entities.append(
-                    YamahaYncaZoneB(config_entry.entry_id, api, selected_inputs)
-                )
+    zone_group: YamahaYncaZoneGroup | None = None
+
+    @callback
+    def async_update_zone_group() -> None:
+        nonlocal zone_group
+        members = [
+            entity
+            for entity in entities
+            if entity.zone_id in config_entry.options.get(CONF_ZONE_GROUP, [])
+        ]
+
+        if len(members) > 1:
+            if zone_group is None:
+                zone_group = YamahaYncaZoneGroup(config_entry.entry_id, members)
+                async_add_entities([zone_group])
+            else:
+                zone_group.async_set_members(members)
+        elif zone_group is not None:
+            # Removing from the entity registry also removes the entity from HA
+            # so no unavailable leftovers remain
+            if zone_group.registry_entry is not None:
+                er.async_get(hass).async_remove(zone_group.entity_id)
+            else:
+                hass.async_create_task(zone_group.async_remove(force_remove=True))
+            zone_group = None
+
+    @callback
+    def async_options_updated() -> None:
+        for entity in entities:
+            entity.async_apply_options(config_entry)
+        async_update_zone_group()
+
+    async_listen_options_updated(hass, config_entry, async_options_updated)
 
     async_add_entities(entities)
+    async_update_zone_group()
 
 
 class YamahaYncaZone(MediaPlayerEntity):
@@ -151,24 +232,49 @@ class YamahaYncaZone(MediaPlayerEntity):
     def _get_zone_id(self) -> str:
         return str(self._zone.id)
 
+    @property
+    def zone_id(self) -> str:
+        return self._get_zone_id()
+
+    @property
+    def zone_subunit(self) -> ZoneBase:
+        return self._zone
+
+    def get_group_member_state(self) -> ZoneGroupMemberState:
+        return ZoneGroupMemberState(
+            on=not self._is_power_state_off(),
+            volume=self._get_volume(),
+            volume_range=self._get_volume_range(),
+            muted=self.is_volume_muted,
+            source=self.source,
+        )
+
+    @callback
+    def async_apply_options(self, config_entry: YamahaYncaConfigEntry) -> None:
+        self._selected_inputs = get_selected_inputs(
+            config_entry, self._ynca, self._zone
+        )
+        self._selected_sound_modes = get_selected_sound_modes(config_entry)
+        self.async_write_ha_state()
+
     def _build_device_name(self) -> str:
         return build_zone_devicename(self._ynca, self._zone)
 
     def update_sys_callback(self, function: str | None, _value: Any) -> None:
         if function and function.startswith("INPNAME"):
-            self.schedule_update_ha_state()
+            update_ha_state(self)
 
     def update_zone_callback(self, function: str | None, _value: Any) -> None:
         if function == self._ZONENAME_FUNCTION:
             # Note that the mediaplayer does not have a name since it uses the devicename
             # So update the device name when the zonename changes to keep names as expected
-            registry = dr.async_get(self.hass)
-            device = registry.async_get_device(identifiers={(DOMAIN, self._device_id)})
-            if device:
+            config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+            registry_index = config_entry.runtime_data.registry_index
+            if device_id := registry_index.device_id((DOMAIN, self._device_id)):
                 devicename = self._build_device_name()
-                registry.async_update_device(device.id, name=devicename)
+                dr.async_get(self.hass).async_update_device(device_id, name=devicename)
         if function is not None:
-            self.schedule_update_ha_state()
+            update_ha_state(self, function)
 
     def update_subunit_callback(
         self,
@@ -182,7 +288,7 @@ class YamahaYncaZone(MediaPlayerEntity):
         if function == "ELAPSEDTIME":
             self._attr_media_position_updated_at = dt.utcnow()
 
-        self.schedule_update_ha_state()
+        update_ha_state(self)
 
     def _get_input_subunits(self) -> Generator[ynca.subunit.SubunitBase]:
         for attribute in sorted(dir(self._ynca)):
@@ -202,15 +308,15 @@ class YamahaYncaZone(MediaPlayerEntity):
 
         for subunit in self._get_input_subunits():
 
-            def callback(
+            def subunit_callback(
                 function: str | None,
                 value: Any,
                 _subunit: ynca.subunit.SubunitBase = subunit,
             ) -> None:
                 self.update_subunit_callback(_subunit, function, value)
 
-            subunit.register_update_callback(callback)
-            self._subunit_callbacks[subunit] = callback
+            subunit.register_update_callback(subunit_callback)
+            self._subunit_callbacks[subunit] = subunit_callback
 
     async def async_will_remove_from_hass(self) -> None:
         self._ynca.sys.unregister_update_callback(  # type: ignore[union-attr]
@@ -218,8 +324,8 @@ class YamahaYncaZone(MediaPlayerEntity):
         )
         self._zone.unregister_update_callback(self.update_zone_callback)
 
-        for subunit, callback in list(self._subunit_callbacks.items()):
-            subunit.unregister_update_callback(callback)
+        for subunit, subunit_callback in list(self._subunit_callbacks.items()):
+            subunit.unregister_update_callback(subunit_callback)
         self._subunit_callbacks.clear()
 
     def _get_input_subunit(self) -> ynca.subunit.SubunitBase | None:
@@ -227,8 +333,11 @@ class YamahaYncaZone(MediaPlayerEntity):
             return InputHelper.get_subunit_for_input(self._ynca, self._zone.inp)
         return None
 
+    def _get_zone_value(self, attribute: str) -> Any:
+        return get_optimistic_value(self, self._zone, attribute)
+
     def _is_power_state_off(self) -> bool:
-        return self._zone.pwr is ynca.Pwr.STANDBY
+        return self._get_zone_value("pwr") is ynca.Pwr.STANDBY
 
     @property
     def state(self) -> MediaPlayerState | None:
@@ -280,38 +389,35 @@ class YamahaYncaZone(MediaPlayerEntity):
 
         return extra or None
 
+    def _get_volume_range(self) -> tuple[float, float]:
+        return (
+            ZONE_MIN_VOLUME,
+            self._zone.maxvol if self._zone.maxvol is not None else ZONE_MAX_VOLUME,
+        )
+
+    def _get_volume(self) -> float | None:
+        """Volume in dB."""
+        return self._get_zone_value("vol")
+
     @property
     def volume_level(self) -> float | None:
         """Volume level of the media player (0..1)."""
-        if self._zone.vol is not None:
-            return scale(
-                self._zone.vol,
-                (
-                    ZONE_MIN_VOLUME,
-                    (
-                        self._zone.maxvol
-                        if self._zone.maxvol is not None
-                        else ZONE_MAX_VOLUME
-                    ),
-                ),
-                (0, 1),
-            )
+        if (volume := self._get_volume()) is not None:
+            return scale(volume, self._get_volume_range(), (0, 1))
         return None
 
     @property
     def is_volume_muted(self) -> bool | None:
         """Boolean if volume is currently muted."""
-        if self._zone.mute is not None:
-            return self._zone.mute is not ynca.Mute.OFF
+        if (mute := self._get_zone_value("mute")) is not None:
+            return mute is not ynca.Mute.OFF
         return None
 
     @property
     def source(self) -> str | None:
         """Return the current input source."""
-        if self._zone.inp is not None:
-            return (
-                InputHelper.get_name_of_input(self._ynca, self._zone.inp) or "Unknown"
-            )
+        if (inp := self._get_zone_value("inp")) is not None:
+            return InputHelper.get_name_of_input(self._ynca, inp) or "Unknown"
         return None
 
     @property
@@ -322,9 +428,9 @@ class YamahaYncaZone(MediaPlayerEntity):
     @property
     def sound_mode(self) -> str | None:
         """Return the current input sound mode."""
-        return (
-            STRAIGHT if self._zone.straight is ynca.Straight.ON else self._zone.soundprg
-        )
+        if self._get_zone_value("straight") is ynca.Straight.ON:
+            return STRAIGHT
+        return self._get_zone_value("soundprg")
 
     @property
     def sound_mode_list(self) -> list[str] | None:
@@ -413,28 +519,58 @@ class YamahaYncaZone(MediaPlayerEntity):
                     return True
         return False
 
+    # Writes of a single function are described as (attribute, value)
+    # so they can be done directly or acknowledged by the receiver
+    def get_power_write(self, *, on: bool) -> tuple[str, Any]:
+        return ("pwr", ynca.Pwr.ON if on else ynca.Pwr.STANDBY)
+
+    def get_volume_write(self, volume: float) -> tuple[str, Any]:
+        """Volume in dB."""
+        return ("vol", volume)
+
+    def _get_volume_level_write(self, volume: float) -> tuple[str, Any]:
+        return self.get_volume_write(scale(volume, (0, 1), self._get_volume_range()))
+
+    def get_mute_write(self, mute: bool) -> tuple[str, Any]:  # noqa: FBT001
+        return ("mute", ynca.Mute.ON if mute else ynca.Mute.OFF)
+
+    def get_source_write(self, source: str) -> tuple[str, Any] | None:
+        if input_ := InputHelper.get_input_by_name(self._ynca, source):
+            return ("inp", input_)
+        return None
+
+    def _get_warmup_gate(self) -> YncaWarmupGate:
+        config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+        return config_entry.runtime_data.warmup_gate
+
+    # Commands go through the warmup gate so they are held while the zone powers on,
+    # held writes of the same function are collapsed
+    async def _async_write_acknowledged(self, write: tuple[str, Any] | None) -> None:
+        if write is not None:
+            await self._get_warmup_gate().async_run(
+                self._get_zone_id(),
+                partial(async_write_acknowledged, self, self._zone, *write),
+                key=write[0],
+            )
+
+    async def _async_run_command(
+        self, func: Callable[..., Any], *args: Any, key: str | None = None
+    ) -> None:
+        await self._get_warmup_gate().async_run(
+            self._get_zone_id(), partial(async_run_command, self, func, *args), key=key
+        )
+
     def turn_on(self) -> None:
         """Turn the media player on."""
-        self._zone.pwr = ynca.Pwr.ON
+        setattr(self._zone, *self.get_power_write(on=True))
 
     def turn_off(self) -> None:
         """Turn off media player."""
-        self._zone.pwr = ynca.Pwr.STANDBY
+        setattr(self._zone, *self.get_power_write(on=False))
 
     def set_volume_level(self, volume: float) -> None:
         """Set volume level, convert range from 0..1."""
-        self._zone.vol = scale(
-            volume,
-            (0, 1),
-            (
-                ZONE_MIN_VOLUME,
-                (
-                    self._zone.maxvol
-                    if self._zone.maxvol is not None
-                    else ZONE_MAX_VOLUME
-                ),
-            ),
-        )
+        setattr(self._zone, *self._get_volume_level_write(volume))
 
     def volume_up(self) -> None:
         """Volume up media player."""
@@ -446,12 +582,12 @@ class YamahaYncaZone(MediaPlayerEntity):
 
     def mute_volume(self, mute: bool) -> None:  # noqa: FBT001
         """Mute (true) or unmute (false) media player."""
-        self._zone.mute = ynca.Mute.ON if mute else ynca.Mute.OFF
+        setattr(self._zone, *self.get_mute_write(mute))
 
     def select_source(self, source: str) -> None:
         """Select input source."""
-        if input_ := InputHelper.get_input_by_name(self._ynca, source):
-            self._zone.inp = input_
+        if write := self.get_source_write(source):
+            setattr(self._zone, *write)
 
     def select_sound_mode(self, sound_mode: str) -> None:
         """Switch the sound mode of the entity."""
@@ -495,9 +631,6 @@ class YamahaYncaZone(MediaPlayerEntity):
         """Enable/disable shuffle mode."""
         if (subunit := self._get_input_subunit()) and (hasattr(subunit, "shuffle")):
             subunit.shuffle = ynca.Shuffle.ON if shuffle else ynca.Shuffle.OFF
-            # On some subunits (TIDAL, probably Deezer) setting shuffle does not result
-            # in an event being sent from the receiver, so do manual update
-            self._ynca.get_raw_connection().get(subunit.id, "SHUFFLE")
 
     @property
     def repeat(self) -> str | None:
@@ -526,9 +659,6 @@ class YamahaYncaZone(MediaPlayerEntity):
                     subunit.repeat = ynca.Repeat.ONE
                 else:
                     subunit.repeat = ynca.Repeat.SINGLE
-            # On some subunits (TIDAL, probably Deezer) setting repeat does not result
-            # in an event being sent from the receiver, so do manual update
-            self._ynca.get_raw_connection().get(subunit.id, "REPEAT")
 
     def _is_radio_subunit(self, subunit: ynca.subunit.SubunitBase) -> bool:
         return (
@@ -658,8 +788,14 @@ class YamahaYncaZone(MediaPlayerEntity):
             media_content_type,
         )
 
+        browse_cache = self._get_browse_cache()
+
         if media_content_id is None or media_content_id == "presets":
-            return self.build_media_root_item()
+            if browse_cache is None:
+                return self.build_media_root_item()
+            return browse_cache.get_root(
+                self._selected_inputs, self.build_media_root_item
+            )
 
         parts = media_content_id.split(":", 1)
 
@@ -667,18 +803,34 @@ class YamahaYncaZone(MediaPlayerEntity):
             subunit_attribute_name = parts[0]
             media_content_id_type = parts[1]
 
-            return self.build_presetlist_media_item(
-                subunit_attribute_name, media_content_id_type
+            build = partial(
+                self.build_presetlist_media_item,
+                subunit_attribute_name,
+                media_content_id_type,
             )
+            if browse_cache is None:
+                return build()
+            return browse_cache.get_presetlist(media_content_id, build)
 
         msg = f"Media content id could not be resolved: {media_content_id}"
         raise HomeAssistantError(msg)
 
+    def _get_browse_cache(self) -> YncaBrowseCache | None:
+        if self.platform is None:
+            return None
+        config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+        return config_entry.runtime_data.browse_cache
+
+    def _get_source_mapping(self) -> dict[ynca.Input, str]:
+        if (browse_cache := self._get_browse_cache()) is not None:
+            return browse_cache.source_mapping
+        return InputHelper.get_source_mapping(self._ynca)
+
     def build_media_root_item(self) -> BrowseMedia:
         children = []
 
         # Generic presets
-        source_mapping = InputHelper.get_source_mapping(self._ynca)
+        source_mapping = self._get_source_mapping()
         for input_, name in source_mapping.items():
             if (
                 input_.value in self._selected_inputs
@@ -722,7 +874,7 @@ class YamahaYncaZone(MediaPlayerEntity):
             name = "TUNER (FM)"
         elif subunit := getattr(self._ynca, subunit_attribute_name, None):
             input_ = InputHelper.get_input_for_subunit(subunit)
-            source_mapping = InputHelper.get_source_mapping(self._ynca)
+            source_mapping = self._get_source_mapping()
             name = source_mapping.get(input_, source_mapping[input_])
 
         stripped_media_content_id_type = media_content_id_type[
@@ -790,26 +942,30 @@ class YamahaYncaZone(MediaPlayerEntity):
 
         # Apply media_id to receiver
 
-        # First turn on if needed
+        # First turn on if needed, following commands are held until the zone is ready
         if self._is_power_state_off():
-            self.turn_on()
+            await self.async_turn_on()
 
         # Switch input if needed
         subunit = getattr(self._ynca, media_id_subunit)
         input_ = InputHelper.get_input_for_subunit(subunit)
         if self._zone.inp is not input_:
-            self._zone.inp = input_
+            await self._async_write_acknowledged(("inp", input_))
 
-            # Tuner input needs some time before it is possible to set the preset
-            # it gets ignored otherwise
+            # Input subunit needs to be ready before it is possible to set the preset
+            # it gets ignored otherwise (e.g. Tuner)
             # see https://github.com/mvdwetering/yamaha_ynca/issues/271
-            if input_ == ynca.Input.TUNER:
-                await asyncio.sleep(1.0)
+            warmup_gate = self._get_warmup_gate()
+            await warmup_gate.async_run(
+                self._get_zone_id(), partial(warmup_gate.async_wait_ready, subunit)
+            )
 
         if hasattr(
             subunit, media_id_command
         ):  # Safety against calling on unsupported subunit
-            setattr(subunit, media_id_command, int(media_id_preset_id))
+            await self._async_run_command(
+                setattr, subunit, media_id_command, int(media_id_preset_id)
+            )
 
     def validate_media_id(
         self,
@@ -850,6 +1006,85 @@ class YamahaYncaZone(MediaPlayerEntity):
             translation_placeholders={"input": str(self._zone.inp)},
         )
 
+    # Commands are executed on the command worker of the receiver
+    # to keep blocking calls out of the shared executor.
+    # Writes of a single function wait for the receiver to acknowledge them,
+    # the others are not reported back (reliably) by the receiver.
+    async def async_turn_on(self) -> None:
+        warmup_gate = self._get_warmup_gate()
+        zone_id = self._get_zone_id()
+        if not self._is_power_state_off() or warmup_gate.is_warming_up(zone_id):
+            await self._async_write_acknowledged(self.get_power_write(on=True))
+            return
+
+        # The zone ignores some commands while powering on,
+        # so hold the commands issued meanwhile until it is ready
+        attribute, value = self.get_power_write(on=True)
+        warmup_gate.async_begin(zone_id, self._zone, attribute.upper())
+        try:
+            await async_write_acknowledged(self, self._zone, attribute, value)
+        except HomeAssistantError:
+            warmup_gate.async_abort(zone_id)
+            raise
+
+    async def async_turn_off(self) -> None:
+        await self._async_write_acknowledged(self.get_power_write(on=False))
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        await self._async_write_acknowledged(self._get_volume_level_write(volume))
+
+    async def async_volume_up(self) -> None:
+        await self._async_run_command(self.volume_up)
+
+    async def async_volume_down(self) -> None:
+        await self._async_run_command(self.volume_down)
+
+    async def async_mute_volume(self, mute: bool) -> None:  # noqa: FBT001
+        await self._async_write_acknowledged(self.get_mute_write(mute))
+
+    async def async_select_source(self, source: str) -> None:
+        await self._async_write_acknowledged(self.get_source_write(source))
+
+    async def async_select_sound_mode(self, sound_mode: str) -> None:
+        await self._async_run_command(
+            self.select_sound_mode, sound_mode, key="soundmode"
+        )
+
+    async def async_media_play(self) -> None:
+        await self._async_run_command(self.media_play)
+
+    async def async_media_pause(self) -> None:
+        await self._async_run_command(self.media_pause)
+
+    async def async_media_stop(self) -> None:
+        await self._async_run_command(self.media_stop)
+
+    async def async_media_next_track(self) -> None:
+        await self._async_run_command(self.media_next_track)
+
+    async def async_media_previous_track(self) -> None:
+        await self._async_run_command(self.media_previous_track)
+
+    async def async_set_shuffle(self, shuffle: bool) -> None:  # noqa: FBT001
+        await self._async_run_command(self.set_shuffle, shuffle, key="shuffle")
+        self._async_written_to_input("SHUFFLE")
+
+    async def async_set_repeat(self, repeat: RepeatMode) -> None:
+        await self._async_run_command(self.set_repeat, repeat, key="repeat")
+        self._async_written_to_input("REPEAT")
+
+    @callback
+    def _async_written_to_input(self, function_name: str) -> None:
+        # Not all input subunits report written functions, the refresh scheduler knows which to request
+        if subunit := self._get_input_subunit():
+            config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+            config_entry.runtime_data.refresh_scheduler.async_written(
+                subunit.id, function_name
+            )
+
+    async def async_store_preset(self, preset_id: int) -> None:
+        await self._async_run_command(self.store_preset, preset_id)
+
 
 class YamahaYncaZoneB(YamahaYncaZone):
     """Handle ZoneB specific behavior.
@@ -884,11 +1119,19 @@ class YamahaYncaZoneB(YamahaYncaZone):
     def _get_zone_id(self) -> str:
         return "ZONEB"
 
+    @callback
+    def async_apply_options(self, config_entry: YamahaYncaConfigEntry) -> None:
+        # Same inputs as MAIN zone, but no soundmodes for ZoneB
+        self._selected_inputs = get_selected_inputs(
+            config_entry, self._ynca, self._zone
+        )
+        self.async_write_ha_state()
+
     def _build_device_name(self) -> str:
         return build_zoneb_devicename(self._ynca)
 
     def _is_power_state_off(self) -> bool:
-        return self._zone.pwrb is ynca.PwrB.STANDBY
+        return self._get_zone_value("pwrb") is ynca.PwrB.STANDBY
 
     def _get_zone_type_specific_supported_features(self) -> MediaPlayerEntityFeature:
         """Return basic supported features for ZoneB."""
@@ -905,39 +1148,27 @@ class YamahaYncaZoneB(YamahaYncaZone):
 
         return supported_commands
 
-    @property
-    def volume_level(self) -> float | None:
-        """Volume level of the media player (0..1)."""
-        if self._zone.zonebvol is not None:
-            return scale(
-                self._zone.zonebvol,
-                (ZONE_MIN_VOLUME, ZONE_MAX_VOLUME),
-                (0, 1),
-            )
-        return None
+    def _get_volume_range(self) -> tuple[float, float]:
+        return (ZONE_MIN_VOLUME, ZONE_MAX_VOLUME)
+
+    def _get_volume(self) -> float | None:
+        return self._get_zone_value("zonebvol")
 
     @property
     def is_volume_muted(self) -> bool | None:
         """Boolean if volume is currently muted."""
-        if self._zone.zonebmute is not None:
-            return self._zone.zonebmute is not ynca.ZoneBMute.OFF
+        if (zonebmute := self._get_zone_value("zonebmute")) is not None:
+            return zonebmute is not ynca.ZoneBMute.OFF
         return None
 
-    def turn_on(self) -> None:
-        """Turn the media player on."""
-        self._zone.pwrb = ynca.PwrB.ON
+    def get_power_write(self, *, on: bool) -> tuple[str, Any]:
+        return ("pwrb", ynca.PwrB.ON if on else ynca.PwrB.STANDBY)
 
-    def turn_off(self) -> None:
-        """Turn off media player."""
-        self._zone.pwrb = ynca.PwrB.STANDBY
+    def get_volume_write(self, volume: float) -> tuple[str, Any]:
+        return ("zonebvol", volume)
 
-    def set_volume_level(self, volume: float) -> None:
-        """Set volume level, convert range from 0..1."""
-        self._zone.zonebvol = scale(
-            volume,
-            (0, 1),
-            (ZONE_MIN_VOLUME, ZONE_MAX_VOLUME),
-        )
+    def get_mute_write(self, mute: bool) -> tuple[str, Any]:  # noqa: FBT001
+        return ("zonebmute", ynca.ZoneBMute.ON if mute else ynca.ZoneBMute.OFF)
 
     def volume_up(self) -> None:
         """Volume up media player."""
@@ -947,6 +1178,283 @@ class YamahaYncaZoneB(YamahaYncaZone):
         """Volume down media player."""
         self._zone.zonebvol_down()
 
-    def mute_volume(self, mute: bool) -> None:  # noqa: FBT001
-        """Mute (true) or unmute (false) media player."""
-        self._zone.zonebmute = ynca.ZoneBMute.ON if mute else ynca.ZoneBMute.OFF
+
+class YamahaYncaZoneGroup(MediaPlayerEntity):
+    """Controls multiple zones of a receiver as one media player.
+
+    Commands are written to all members in one batch and acknowledged per member.
+    Members that are warming up get their commands through the warmup gate instead.
+    Volume changes keep the offsets between the members.
+
+    The group state is derived from a snapshot per member. Updates from the receiver
+    only refresh the snapshots of the members on the reporting subunit.
+    """
+
+    _attr_device_class = MediaPlayerDeviceClass.RECEIVER
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_translation_key = "zone_group"
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.TURN_ON
+        | MediaPlayerEntityFeature.TURN_OFF
+        | MediaPlayerEntityFeature.VOLUME_SET
+        | MediaPlayerEntityFeature.VOLUME_STEP
+        | MediaPlayerEntityFeature.VOLUME_MUTE
+        | MediaPlayerEntityFeature.SELECT_SOURCE
+    )
+
+    def __init__(self, receiver_unique_id: str, members: list[YamahaYncaZone]) -> None:
+        self._members = members
+        self._member_states: dict[str, ZoneGroupMemberState] = {}
+        self._subunit_callbacks: dict[ynca.subunit.SubunitBase, Any] = {}
+
+        self._receiver_unique_id = receiver_unique_id
+        self._attr_unique_id = f"{receiver_unique_id}_zone_group"
+        # Group is shown on the device of the first member
+        self._attr_device_info = DeviceInfo(identifiers={self._get_device_identifier()})
+
+    def _get_device_identifier(self) -> tuple[str, str]:
+        return (DOMAIN, f"{self._receiver_unique_id}_{self._members[0].zone_id}")
+
+    def _refresh_member_states(
+        self, subunit: ynca.subunit.SubunitBase | None = None
+    ) -> None:
+        for member in self._members:
+            if subunit is None or member.zone_subunit is subunit:
+                self._member_states[member.zone_id] = member.get_group_member_state()
+
+    def _get_group_state(self) -> tuple[Any, ...]:
+        return (
+            self.state,
+            self.volume_level,
+            self.is_volume_muted,
+            self.source,
+        )
+
+    def update_member_callback(
+        self,
+        subunit: ynca.subunit.SubunitBase,
+        function: str | None,
+        _value: Any,
+    ) -> None:
+        if function not in ZONE_GROUP_FUNCTIONS:
+            return
+
+        group_state = self._get_group_state()
+        self._refresh_member_states(subunit)
+        if self._get_group_state() != group_state:
+            update_ha_state(self, function)
+
+    def _register_member_callbacks(self) -> None:
+        for member in self._members:
+            subunit = member.zone_subunit
+            if subunit in self._subunit_callbacks:
+                continue
+
+            def member_callback(
+                function: str | None,
+                value: Any,
+                _subunit: ynca.subunit.SubunitBase = subunit,
+            ) -> None:
+                self.update_member_callback(_subunit, function, value)
+
+            subunit.register_update_callback(member_callback)
+            self._subunit_callbacks[subunit] = member_callback
+
+    def _unregister_member_callbacks(self) -> None:
+        for subunit, member_callback in list(self._subunit_callbacks.items()):
+            subunit.unregister_update_callback(member_callback)
+        self._subunit_callbacks.clear()
+
+    async def async_added_to_hass(self) -> None:
+        self._register_member_callbacks()
+        self._refresh_member_states()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._unregister_member_callbacks()
+
+    @callback
+    def async_set_members(self, members: list[YamahaYncaZone]) -> None:
+        self._members = members
+        identifier = self._get_device_identifier()
+        self._attr_device_info = DeviceInfo(identifiers={identifier})
+        if self.hass is None:
+            return
+
+        # Device info is only used when the entity is added, so move it in the registry
+        if self.registry_entry is not None:
+            config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+            device_id = config_entry.runtime_data.registry_index.device_id(identifier)
+            if device_id is not None and device_id != self.registry_entry.device_id:
+                er.async_get(self.hass).async_update_entity(
+                    self.entity_id, device_id=device_id
+                )
+
+        self._unregister_member_callbacks()
+        self._register_member_callbacks()
+        self._member_states.clear()
+        self._refresh_member_states()
+        self.async_write_ha_state()
+
+    def _get_active_member_states(self) -> list[ZoneGroupMemberState]:
+        """Members that are on, or all members when the group is off."""
+        member_states = list(self._member_states.values())
+        return [state for state in member_states if state.on] or member_states
+
+    def _get_loudest_member_state(self) -> ZoneGroupMemberState | None:
+        levels = [
+            (scale(state.volume, state.volume_range, (0, 1)), state)
+            for state in self._get_active_member_states()
+            if state.volume is not None
+        ]
+        if not levels:
+            return None
+        return max(levels, key=lambda level: level[0])[1]
+
+    @property
+    def state(self) -> MediaPlayerState | None:
+        if not self._member_states:
+            return None
+        if any(state.on for state in self._member_states.values()):
+            return MediaPlayerState.ON
+        return MediaPlayerState.OFF
+
+    @property
+    def volume_level(self) -> float | None:
+        """Volume level of the loudest member (0..1)."""
+        if (loudest := self._get_loudest_member_state()) is not None:
+            return scale(loudest.volume, loudest.volume_range, (0, 1))  # type: ignore[arg-type]
+        return None
+
+    @property
+    def is_volume_muted(self) -> bool | None:
+        """Muted when all members are muted."""
+        muted = [
+            state.muted
+            for state in self._get_active_member_states()
+            if state.muted is not None
+        ]
+        return all(muted) if muted else None
+
+    @property
+    def source(self) -> str | None:
+        """Source of the members, only when all members use the same source."""
+        sources = {state.source for state in self._get_active_member_states()}
+        return sources.pop() if len(sources) == 1 else None
+
+    @property
+    def source_list(self) -> list[str]:
+        return self._members[0].source_list
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {
+            "members": [
+                member.entity_id for member in self._members if member.entity_id
+            ]
+        }
+
+    async def _async_write_members(
+        self,
+        get_write: Callable[[YamahaYncaZone], tuple[str, Any] | None],
+        *,
+        power_on: bool = False,
+    ) -> None:
+        config_entry: YamahaYncaConfigEntry = self.platform.config_entry  # type: ignore[assignment]
+        write_acknowledger = config_entry.runtime_data.write_acknowledger
+        warmup_gate = config_entry.runtime_data.warmup_gate
+
+        # Members that share a subunit can share writes, e.g. input of MAIN and ZoneB
+        writes: dict[tuple[str, str], tuple[ynca.subunit.SubunitBase, str, Any]] = {}
+        held: dict[tuple[str, str], Awaitable[Any]] = {}
+        warmups: list[YamahaYncaZone] = []
+        for member in self._members:
+            if (write := get_write(member)) is None:
+                continue
+            subunit = member.zone_subunit
+            key = (subunit.id, write[0])
+            if key in writes or key in held:
+                continue
+
+            if warmup_gate.is_warming_up(member.zone_id):
+                held[key] = warmup_gate.async_run(
+                    member.zone_id,
+                    partial(write_acknowledger.async_write, subunit, *write),
+                    key=write[0],
+                )
+                continue
+
+            writes[key] = (subunit, *write)
+            if power_on and not self._member_states[member.zone_id].on:
+                warmups.append(member)
+
+        # Hold the commands issued while the members power on until they are ready
+        for member in warmups:
+            power_function_name = member.get_power_write(on=True)[0].upper()
+            warmup_gate.async_begin(
+                member.zone_id, member.zone_subunit, power_function_name
+            )
+        try:
+            await asyncio.gather(
+                *held.values(),
+                *(
+                    [write_acknowledger.async_write_batch(list(writes.values()))]
+                    if writes
+                    else []
+                ),
+            )
+        except HomeAssistantError:
+            for member in warmups:
+                warmup_gate.async_abort(member.zone_id)
+            raise
+
+    async def _async_shift_volume(self, delta: float) -> None:
+        """Change the volume of all members by delta dB, keeping their offsets."""
+        volumes = [
+            (state.volume, state.volume_range)
+            for member in self._members
+            if (state := self._member_states.get(member.zone_id)) is not None
+            and state.volume is not None
+        ]
+        if not volumes:
+            return
+
+        # Receivers use 0.5 dB steps. The delta is limited once to what the most
+        # limiting member allows, clamping per member would change the offsets
+        lowest = max(minimum - volume for volume, (minimum, _) in volumes)
+        highest = min(maximum - volume for volume, (_, maximum) in volumes)
+        delta = min(max(round(delta * 2) / 2, lowest), highest)
+
+        def get_write(member: YamahaYncaZone) -> tuple[str, Any] | None:
+            state = self._member_states.get(member.zone_id)
+            if state is None or state.volume is None:
+                return None
+            return member.get_volume_write(state.volume + delta)
+
+        await self._async_write_members(get_write)
+
+    async def async_turn_on(self) -> None:
+        await self._async_write_members(
+            lambda member: member.get_power_write(on=True), power_on=True
+        )
+
+    async def async_turn_off(self) -> None:
+        await self._async_write_members(lambda member: member.get_power_write(on=False))
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        """Set the volume of the loudest member, other members follow."""
+        if (loudest := self._get_loudest_member_state()) is not None:
+            target = scale(volume, (0, 1), loudest.volume_range)
+            await self._async_shift_volume(target - loudest.volume)  # type: ignore[operator]
+
+    async def async_volume_up(self) -> None:
+        await self._async_shift_volume(ZONE_GROUP_VOLUME_STEP)
+
+    async def async_volume_down(self) -> None:
+        await self._async_shift_volume(-ZONE_GROUP_VOLUME_STEP)
+
+    async def async_mute_volume(self, mute: bool) -> None:  # noqa: FBT001
+        await self._async_write_members(lambda member: member.get_mute_write(mute))
+
+    async def async_select_source(self, source: str) -> None:
+        await self._async_write_members(lambda member: member.get_source_write(source))
@@ -3,18 +3,23 @@
 from __future__ import annotations
 
 import contextlib
+from copy import deepcopy
+from dataclasses import dataclass, field
 from enum import StrEnum, unique
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers import device_registry as dr
 
 import ynca
 
 from .config_flow import YamahaYncaConfigFlow
 from .const import DATA_MODELNAME, DOMAIN, LOGGER
 from .helpers import receiver_requires_audio_input_workaround
+from .registry_index import YncaRegistryIndex
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
@@ -108,9 +113,67 @@ class YncaInputCopy(StrEnum):
     USB = "USB"
 
 
-async def async_migrate_entry(  # noqa: C901, PLR0912
-    hass: HomeAssistant, config_entry: ConfigEntry
-) -> bool:
+@dataclass
+class MigrationState:
+    """In-memory copy of a config entry that is being migrated.
+
+    Migration steps only modify this copy and collect registry changes,
+    everything gets written in one go by `async_commit` when all steps are done.
+    """
+
+    entry_id: str
+    title: str
+    data: dict[str, Any]
+    options: dict[str, Any]
+    version: int
+    minor_version: int
+    registry_index: YncaRegistryIndex
+    """Index of the registry entries of the config entry."""
+    device_identifier_updates: dict[tuple[str, str], tuple[str, str]] = field(
+        default_factory=dict
+    )
+    """Device identifiers to replace, old identifier -> new identifier."""
+
+    @classmethod
+    def from_config_entry(
+        cls, hass: HomeAssistant, config_entry: ConfigEntry
+    ) -> MigrationState:
+        registry_index = YncaRegistryIndex(hass, config_entry.entry_id)
+        registry_index.async_build()
+        return cls(
+            entry_id=config_entry.entry_id,
+            title=config_entry.title,
+            # Deepcopy because steps modify nested options like the per zone dicts
+            data=deepcopy(dict(config_entry.data)),
+            options=deepcopy(dict(config_entry.options)),
+            version=config_entry.version,
+            minor_version=config_entry.minor_version,
+            registry_index=registry_index,
+        )
+
+    def async_commit(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Write the migrated config entry and registry changes."""
+        if self.device_identifier_updates:
+            registry = dr.async_get(hass)
+            for (
+                old_identifier,
+                new_identifier,
+            ) in self.device_identifier_updates.items():
+                if device_id := self.registry_index.device_id(old_identifier):
+                    registry.async_update_device(
+                        device_id, new_identifiers={new_identifier}
+                    )
+
+        hass.config_entries.async_update_entry(
+            config_entry,
+            data=self.data,
+            options=self.options,
+            version=self.version,
+            minor_version=self.minor_version,
+        )
+
+
+async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old entry."""
     from_version = config_entry.version
     from_minor_version = config_entry.minor_version
@@ -120,42 +183,21 @@ async def async_migrate_entry(  # noqa: C901, PLR0912
         # This means the user has downgraded from a future version
         return False
 
-    if config_entry.version == 1:
-        migrate_v1_to_v2(hass, config_entry)
-
-    if config_entry.version == 2:  # noqa: PLR2004
-        migrate_v2_to_v3(hass, config_entry)
-
-    if config_entry.version == 3:  # noqa: PLR2004
-        migrate_v3_to_v4(hass, config_entry)
-
-    if config_entry.version == 4:  # noqa: PLR2004
-        migrate_v4_to_v5(hass, config_entry)
-
-    if config_entry.version == 5:  # noqa: PLR2004
-        migrate_v5_to_v6(hass, config_entry)
+    # All steps are applied to an in-memory copy which is written once at the end
+    # instead of writing the config entry (and scanning registries) for every step
+    state = MigrationState.from_config_entry(hass, config_entry)
+    for version, minor_version, migrate in MIGRATION_STEPS:
+        if state.version == version and minor_version in (
+            None,
+            state.minor_version,
+        ):
+            migrate(state)
 
-    if config_entry.version == 6:  # noqa: PLR2004
-        migrate_v6_to_v7(hass, config_entry)
-
-    if config_entry.version == 7:  # noqa: PLR2004
-        if config_entry.minor_version == 1:
-            migrate_v7_1_to_v7_2(hass, config_entry)
-        if config_entry.minor_version == 2:  # noqa: PLR2004
-            migrate_v7_2_to_v7_3(hass, config_entry)
-        if config_entry.minor_version == 3:  # noqa: PLR2004
-            migrate_v7_3_to_v7_4(hass, config_entry)
-        if config_entry.minor_version == 4:  # noqa: PLR2004
-            migrate_v7_4_to_v7_5(hass, config_entry)
-        if config_entry.minor_version == 5:  # noqa: PLR2004
-            migrate_v7_5_to_v7_6(hass, config_entry)
-        if config_entry.minor_version == 6:  # noqa: PLR2004
-            migrate_v7_6_to_v7_7(hass, config_entry)
-        if config_entry.minor_version == 7:  # noqa: PLR2004
-            migrate_v7_7_to_v7_8(hass, config_entry)
+    if (state.version, state.minor_version) != (from_version, from_minor_version):
+        state.async_commit(hass, config_entry)
 
     # When adding new migrations do _not_ forget
-    # to increase the VERSION of the YamahaYncaConfigFlow
+    # to add them to MIGRATION_STEPS, increase the VERSION of the YamahaYncaConfigFlow
     # and update the version in `create_mock_config_entry`
 
     LOGGER.info(
@@ -169,8 +211,8 @@ async def async_migrate_entry(  # noqa: C901, PLR0912
     return True
 
 
-def migrate_v7_7_to_v7_8(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_7_to_v7_8(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Switch from using "hidden_inputs" to "selected_inputs"
     all_inputs = [input_.value for input_ in YncaInputCopy]
@@ -184,20 +226,19 @@ def migrate_v7_7_to_v7_8(hass: HomeAssistant, config_entry: ConfigEntry) -> None
             zone_options["selected_inputs"] = selected_inputs
             zone_options.pop(LEGACY_CONF_HIDDEN_INPUTS, None)
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=8
-    )
+    state.options = options
+    state.minor_version = 8
 
 
-def migrate_v7_6_to_v7_7(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_6_to_v7_7(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Switch from using "hidden_sound_modes" to "selected_sound_modes"
     all_sound_modes = [sound_mode.value for sound_mode in YncaSoundPrgCopy]
     all_sound_modes.sort(key=str.lower)
 
     unsupported_sound_modes = []
-    if modelinfo := ynca.YncaModelInfo.get(config_entry.data[DATA_MODELNAME]):
+    if modelinfo := ynca.YncaModelInfo.get(state.data[DATA_MODELNAME]):
         modelinfo_soundprgs = [soundprg.value for soundprg in modelinfo.soundprg]
         unsupported_sound_modes = list(set(all_sound_modes) - set(modelinfo_soundprgs))
 
@@ -210,143 +251,128 @@ def migrate_v7_6_to_v7_7(hass: HomeAssistant, config_entry: ConfigEntry) -> None
     options["selected_sound_modes"] = selected_sound_modes
     options.pop(LEGACY_CONF_HIDDEN_SOUND_MODES, None)
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=7
-    )
+    state.options = options
+    state.minor_version = 7
 
 
-def migrate_v7_5_to_v7_6(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_5_to_v7_6(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Hide new TV input for existing users
     # Code is robust against unsupported inputs being listed in "hidden_input"s
 
     # Upgrading from _really_ old version might not have zones key
-    if "zones" in config_entry.data:
-        for zone_id in config_entry.data["zones"]:
+    if "zones" in state.data:
+        for zone_id in state.data["zones"]:
             options[zone_id] = options.get(zone_id, {})
             options[zone_id]["hidden_inputs"] = options[zone_id].get(
                 "hidden_inputs", []
             )
             options[zone_id]["hidden_inputs"].extend(["OPTICAL1", "OPTICAL2"])
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=6
-    )
+    state.options = options
+    state.minor_version = 6
 
 
-def migrate_v7_4_to_v7_5(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_4_to_v7_5(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Hide new TV input for existing users
     # Code is robust against unsupported inputs being listed in "hidden_input"s
 
     # Upgrading from _really_ old version might not have zones key
-    if "zones" in config_entry.data:
-        for zone_id in config_entry.data["zones"]:
+    if "zones" in state.data:
+        for zone_id in state.data["zones"]:
             options[zone_id] = options.get(zone_id, {})
             options[zone_id]["hidden_inputs"] = options[zone_id].get(
                 "hidden_inputs", []
             )
             options[zone_id]["hidden_inputs"].append("TV")
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=5
-    )
+    state.options = options
+    state.minor_version = 5
 
 
-def migrate_v7_3_to_v7_4(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_3_to_v7_4(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Hide new AUDIO5 input for existing users
     # Code is robust against unsupported inputs being listed in "hidden_input"s
 
     # Upgrading from _really_ old version might not have zones key
-    if "zones" in config_entry.data:
-        for zone_id in config_entry.data["zones"]:
+    if "zones" in state.data:
+        for zone_id in state.data["zones"]:
             options[zone_id] = options.get(zone_id, {})
             options[zone_id]["hidden_inputs"] = options[zone_id].get(
                 "hidden_inputs", []
             )
             options[zone_id]["hidden_inputs"].append("AUDIO5")
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=4
-    )
+    state.options = options
+    state.minor_version = 4
 
 
-def migrate_v7_2_to_v7_3(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_2_to_v7_3(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Check if twochdecoder entity exists for this entry
     # If so then set options to PLII(X) and NEO surround decoders
     # Otherwise do nothing (not set will result in all options being listed)
 
-    registry = er.async_get(hass)
-    entities = er.async_entries_for_config_entry(registry, config_entry.entry_id)
+    if state.registry_index.entity_id("MAIN_twochdecoder"):
+        options["selected_surround_decoders"] = [
+            "dolby_pl",
+            "dolby_plii_game",
+            "dolby_plii_movie",
+            "dolby_plii_music",
+            "dts_neo_6_cinema",
+            "dts_neo_6_music",
+        ]
 
-    entity_unique_id = f"{config_entry.entry_id}_MAIN_twochdecoder"
+    state.options = options
+    state.minor_version = 3
 
-    for entity in entities:
-        if entity.unique_id == entity_unique_id:
-            options["selected_surround_decoders"] = [
-                "dolby_pl",
-                "dolby_plii_game",
-                "dolby_plii_movie",
-                "dolby_plii_music",
-                "dts_neo_6_cinema",
-                "dts_neo_6_music",
-            ]
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=3
-    )
-
-
-def migrate_v7_1_to_v7_2(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    options = dict(config_entry.options)  # Convert to dict to be able to use .get
+def migrate_v7_1_to_v7_2(state: MigrationState) -> None:
+    options = dict(state.options)  # Convert to dict to be able to use .get
 
     # Hide new AUDIO input for existing users that do not use impacted receivers
     # Code is robust against unsupported inputs being listed in "hidden_input"s
     # Upgrading from _really_ old version might not have zones key
     if (
-        not receiver_requires_audio_input_workaround(config_entry.data["modelname"])
-        and "zones" in config_entry.data
+        not receiver_requires_audio_input_workaround(state.data["modelname"])
+        and "zones" in state.data
     ):
-        for zone_id in config_entry.data["zones"]:
+        for zone_id in state.data["zones"]:
             options[zone_id] = options.get(zone_id, {})
             options[zone_id]["hidden_inputs"] = options[zone_id].get(
                 "hidden_inputs", []
             )
             options[zone_id]["hidden_inputs"].append("AUDIO")
 
-    hass.config_entries.async_update_entry(
-        config_entry, options=options, minor_version=2
-    )
+    state.options = options
+    state.minor_version = 2
 
 
-def migrate_v6_to_v7(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+def migrate_v6_to_v7(state: MigrationState) -> None:
     # Migrate the current single device (is whole receiver)
     # to the device for MAIN zone to keep device automations working
     # Device automations for Zone2, Zone3 or Zone4 parts will break unfortunately
 
-    old_identifiers = {(DOMAIN, f"{config_entry.entry_id}")}
-    new_identifiers = {(DOMAIN, f"{config_entry.entry_id}_MAIN")}
-
-    registry = dr.async_get(hass)
-    if device_entry := registry.async_get_device(identifiers=old_identifiers):
-        registry.async_update_device(device_entry.id, new_identifiers=new_identifiers)
-
-    hass.config_entries.async_update_entry(
-        config_entry, data=config_entry.data, version=7, minor_version=1
+    state.device_identifier_updates[(DOMAIN, f"{state.entry_id}")] = (
+        DOMAIN,
+        f"{state.entry_id}_MAIN",
     )
 
+    state.version = 7
+    state.minor_version = 1
 
-def migrate_v5_to_v6(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+
+def migrate_v5_to_v6(state: MigrationState) -> None:
     # Migrate format of options from `hidden_inputs_<ZONE>` to having a dict per zone
     # Add modelname explictly to data, copy from title
 
-    old_options = dict(config_entry.options)  # Convert to dict to be able to use .get
+    old_options = dict(state.options)  # Convert to dict to be able to use .get
     new_options = {}
 
     if hidden_sound_modes := old_options.get("hidden_sound_modes"):
@@ -358,15 +384,16 @@ def migrate_v5_to_v6(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
             zone_settings["hidden_inputs"] = hidden_inputs
             new_options[zone_id] = zone_settings
 
-    new_data = {**config_entry.data}
-    new_data["modelname"] = config_entry.title
+    new_data = {**state.data}
+    new_data["modelname"] = state.title
 
-    hass.config_entries.async_update_entry(
-        config_entry, data=new_data, options=new_options, version=6, minor_version=1
-    )
+    state.data = new_data
+    state.options = new_options
+    state.version = 6
+    state.minor_version = 1
 
 
-def migrate_v4_to_v5(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+def migrate_v4_to_v5(state: MigrationState) -> None:
     # For "network" type the IP address or host is stored as a socket:// url directly
     # Convert serial urls using the old "network" format
     # Re-uses the old `serial_url_from_user_input` helper function
@@ -386,19 +413,19 @@ def migrate_v4_to_v5(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
 
         return user_input
 
-    new = {**config_entry.data}
-    new["serial_url"] = serial_url_from_user_input(config_entry.data["serial_url"])
+    new = {**state.data}
+    new["serial_url"] = serial_url_from_user_input(state.data["serial_url"])
 
-    hass.config_entries.async_update_entry(
-        config_entry, data=new, version=5, minor_version=1
-    )
+    state.data = new
+    state.version = 5
+    state.minor_version = 1
 
 
-def migrate_v3_to_v4(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+def migrate_v3_to_v4(state: MigrationState) -> None:
     # Changed how hidden soundmodes are stored
     # Used to be the enum name, now it is the value
 
-    options = dict(config_entry.options)
+    options = dict(state.options)
     if old_hidden_soundmodes := options.get(LEGACY_CONF_HIDDEN_SOUND_MODES):
         new_hidden_soundmodes = []
         for old_hidden_soundmode in old_hidden_soundmodes:
@@ -406,33 +433,47 @@ def migrate_v3_to_v4(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
                 new_hidden_soundmodes.append(ynca.SoundPrg[old_hidden_soundmode].value)
         options[LEGACY_CONF_HIDDEN_SOUND_MODES] = new_hidden_soundmodes
 
-    hass.config_entries.async_update_entry(
-        config_entry,
-        data=config_entry.data,
-        options=options,
-        version=4,
-        minor_version=1,
-    )
+    state.options = options
+    state.version = 4
+    state.minor_version = 1
 
 
-def migrate_v2_to_v3(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+def migrate_v2_to_v3(state: MigrationState) -> None:
     # Scene entities are replaced by Button entities
     # (scenes limited to a single devics seem a bit weird)
     # The code to cleanup has been removed as tests started failing and fixing it was too much work
 
-    hass.config_entries.async_update_entry(
-        config_entry, data=config_entry.data, version=3, minor_version=1
-    )
+    state.version = 3
+    state.minor_version = 1
 
 
-def migrate_v1_to_v2(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+def migrate_v1_to_v2(state: MigrationState) -> None:
     # Button entities are replaced by scene entities
     # The code to cleanup has been removed as tests started failing and fixing it was too much work
 
     # Rename to `serial_url` for consistency
-    new = {**config_entry.data}
+    new = {**state.data}
     new["serial_url"] = new.pop("serial_port")
 
-    hass.config_entries.async_update_entry(
-        config_entry, data=new, version=2, minor_version=1
-    )
+    state.data = new
+    state.version = 2
+    state.minor_version = 1
+
+
+# Steps are applied in this order, a step is applied when the version matches
+# A minor version of None matches any minor version
+MIGRATION_STEPS: list[tuple[int, int | None, Callable[[MigrationState], None]]] = [
+    (1, None, migrate_v1_to_v2),
+    (2, None, migrate_v2_to_v3),
+    (3, None, migrate_v3_to_v4),
+    (4, None, migrate_v4_to_v5),
+    (5, None, migrate_v5_to_v6),
+    (6, None, migrate_v6_to_v7),
+    (7, 1, migrate_v7_1_to_v7_2),
+    (7, 2, migrate_v7_2_to_v7_3),
+    (7, 3, migrate_v7_3_to_v7_4),
+    (7, 4, migrate_v7_4_to_v7_5),
+    (7, 5, migrate_v7_5_to_v7_6),
+    (7, 6, migrate_v7_6_to_v7_7),
+    (7, 7, migrate_v7_7_to_v7_8),
+]
@@ -8,13 +8,17 @@ from homeassistant.components.number import (
     NumberEntity,
     NumberEntityDescription,
 )
-from homeassistant.const import SIGNAL_STRENGTH_DECIBELS
+from homeassistant.const import SIGNAL_STRENGTH_DECIBELS, Platform
 from homeassistant.helpers.entity import EntityCategory
 
 import ynca
 
-from .const import ZONE_ATTRIBUTE_NAMES, ZONE_MAX_VOLUME, ZONE_MIN_VOLUME
-from .entity import YamahaYncaSettingEntity
+from .const import ZONE_MAX_VOLUME, ZONE_MIN_VOLUME
+from .entity import (
+    YamahaYncaSettingEntity,
+    async_write_acknowledged,
+    get_optimistic_value,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -128,29 +132,20 @@ async def async_setup_entry(
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    domain_entry_data = config_entry.runtime_data
-
-    entities = []
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(domain_entry_data.api, zone_attr_name):
-            entities.extend(
-                [
-                    YamahaYncaNumber(
-                        config_entry.entry_id, zone_subunit, entity_description
-                    )
-                    for entity_description in ENTITY_DESCRIPTIONS
-                    if getattr(zone_subunit, entity_description.key, None) is not None
-                ]
-            )
-
-            if zone_subunit.initvollvl is not None:
-                entities.append(
-                    YamahaYncaNumberInitialVolume(
-                        config_entry.entry_id,
-                        zone_subunit,
-                        InitialVolumeValueEntityDescription,
-                    )
-                )
+    entity_plan = config_entry.runtime_data.entity_plan
+
+    entities = [
+        (
+            YamahaYncaNumberInitialVolume
+            if planned.description is InitialVolumeValueEntityDescription
+            else YamahaYncaNumber
+        )(
+            config_entry.entry_id,
+            planned.subunit,  # type: ignore[arg-type]
+            planned.description,  # type: ignore[arg-type]
+        )
+        for planned in entity_plan.get(Platform.NUMBER, [])
+    ]
 
     async_add_entities(entities)
 
@@ -163,7 +158,7 @@ class YamahaYncaNumber(YamahaYncaSettingEntity, NumberEntity):  # type: ignore[m
     @property
     def native_value(self) -> float | None:
         """Return the value reported by the number."""
-        return getattr(self._subunit, self.entity_description.key, None)
+        return get_optimistic_value(self, self._subunit, self.entity_description.key)
 
     @property
     def native_max_value(self) -> float:
@@ -175,6 +170,11 @@ class YamahaYncaNumber(YamahaYncaSettingEntity, NumberEntity):  # type: ignore[m
     def set_native_value(self, value: float) -> None:
         setattr(self._subunit, self.entity_description.key, value)
 
+    async def async_set_native_value(self, value: float) -> None:
+        await async_write_acknowledged(
+            self, self._subunit, self.entity_description.key, value
+        )
+
 
 class YamahaYncaNumberInitialVolume(YamahaYncaNumber):
     """Representation Initial Volume level.
@@ -11,24 +11,41 @@ import voluptuous as vol
 
 import ynca
 
+from .capabilities import (
+    CAPABILITY_INPUTS,
+    CAPABILITY_SCENES,
+    CAPABILITY_SOUNDPRG,
+    CAPABILITY_TWOCHDECODER,
+    CAPABILITY_ZONEB,
+)
 from .const import (
     CONF_NUMBER_OF_SCENES,
+    CONF_OPTIMISTIC_STATE,
     CONF_SELECTED_INPUTS,
     CONF_SELECTED_SOUND_MODES,
     CONF_SELECTED_SURROUND_DECODERS,
+    CONF_ZONE_GROUP,
+    DATA_CAPABILITIES,
     DATA_MODELNAME,
     DATA_ZONES,
     MAX_NUMBER_OF_SCENES,
     NUMBER_OF_SCENES_AUTODETECT,
     TWOCHDECODER_STRINGS,
 )
-from .input_helpers import InputHelper
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigFlowResult
 
     from . import YamahaYncaConfigEntry
 
+ZONE_NAMES = {
+    "MAIN": "Main",
+    "ZONE2": "Zone 2",
+    "ZONE3": "Zone 3",
+    "ZONE4": "Zone 4",
+    "ZONEB": "Zone B",
+}
+
 STEP_ID_INIT = "init"
 STEP_ID_NO_CONNECTION = "no_connection"
 STEP_ID_GENERAL = "general"
@@ -81,11 +98,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self, _user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Perform basic sanity checks before configuring options."""
-        # The configentry in the optionsflow is _only_ a YamahaYncaConfigEntry when there is a connection
-        # Otherwise it is a "plain" ConfigEntry, so without runtime_data
-        # A normal isinstance check does not seem to work with type alias, to check for runtime_data attribute
-        if getattr(self.config_entry, "runtime_data", None):
-            self.api = self.config_entry.runtime_data.api
+        # Options are based on the capabilities stored on setup, so no connection is needed
+        # Entries that never connected successfully do not have capabilities yet
+        if capabilities := self.config_entry.data.get(DATA_CAPABILITIES):
+            self.capabilities = capabilities
             return await self.async_step_general()
 
         return await self.async_step_no_connection()
@@ -117,20 +133,17 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SELECTED_SURROUND_DECODERS
                 ]
 
+            self.options[CONF_OPTIMISTIC_STATE] = user_input[CONF_OPTIMISTIC_STATE]
+
+            if CONF_ZONE_GROUP in user_input:
+                self.options[CONF_ZONE_GROUP] = user_input[CONF_ZONE_GROUP]
+
             return await self.do_next_step(STEP_ID_GENERAL)
 
         # List all sound modes for this model
-        modelinfo = ynca.YncaModelInfo.get(self.config_entry.data[DATA_MODELNAME])
-        all_sound_modes = []
-        for sound_mode in ynca.SoundPrg:
-            if sound_mode is ynca.SoundPrg.UNKNOWN:
-                continue
-            if modelinfo and sound_mode not in modelinfo.soundprg:
-                continue  # Skip soundmodes not supported on the model
-            all_sound_modes.append(sound_mode.value)
-        all_sound_modes.sort(key=str.lower)
-
-        schema = {}
+        all_sound_modes = self.capabilities[CAPABILITY_SOUNDPRG]
+
+        schema: dict[vol.Marker, Any] = {}
         schema[
             vol.Required(
                 CONF_SELECTED_SOUND_MODES,
@@ -141,7 +154,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         # Select supported Surround Decoders
         # Technically twochdecoder could have different values per zone, but that seems unlikely
         # It "feels" better to have it as a receiver wide configuration
-        if (zone := self.api.main) and zone.twochdecoder is not None:
+        if self.capabilities[CAPABILITY_TWOCHDECODER]:
             stored_selected_surround_decoders_ids = self.options.get(
                 CONF_SELECTED_SURROUND_DECODERS, []
             )
@@ -164,6 +177,34 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 )
             ] = cv.multi_select(all_surround_decoders)
 
+        schema[
+            vol.Required(
+                CONF_OPTIMISTIC_STATE,
+                default=self.options.get(CONF_OPTIMISTIC_STATE, False),
+            )
+        ] = bool
+
+        # Zones that can be controlled together with a group media player
+        group_zones = [
+            zone_id
+            for zone_id in ZONE_NAMES
+            if zone_id in self.config_entry.data[DATA_ZONES]
+            or (zone_id == "ZONEB" and self.capabilities.get(CAPABILITY_ZONEB, False))
+        ]
+        if len(group_zones) > 1:
+            schema[
+                vol.Required(
+                    CONF_ZONE_GROUP,
+                    default=[
+                        zone_id
+                        for zone_id in self.options.get(CONF_ZONE_GROUP, [])
+                        if zone_id in group_zones
+                    ],
+                )
+            ] = cv.multi_select(
+                {zone_id: ZONE_NAMES[zone_id] for zone_id in group_zones}
+            )
+
         return self.async_show_form(
             step_id=STEP_ID_GENERAL,
             data_schema=vol.Schema(schema),
@@ -217,10 +258,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         # Select inputs for zone
         all_receiver_inputs = {}
-        for input_, name in InputHelper.get_source_mapping(self.api).items():
-            all_receiver_inputs[input_.value] = (
-                f"{input_.value} ({name})"
-                if input_.value.lower() != name.strip().lower()
+        for input_id, name in self.capabilities[CAPABILITY_INPUTS].items():
+            all_receiver_inputs[input_id] = (
+                f"{input_id} ({name})"
+                if input_id.lower() != name.strip().lower()
                 else name
             )
         # Make sure list is sorted by name in UI
@@ -255,7 +296,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         # Number of scenes for zone
         # Use a select so we can have nice distinct values presented with Autodetect and 0-12
-        number_of_scenes_list = {NUMBER_OF_SCENES_AUTODETECT: "Auto detect"}
+        detected_scenes = self.capabilities[CAPABILITY_SCENES].get(zone_id)
+        number_of_scenes_list = {
+            NUMBER_OF_SCENES_AUTODETECT: "Auto detect"
+            if detected_scenes is None
+            else f"Auto detect ({detected_scenes})"
+        }
         for scene_id in range(MAX_NUMBER_OF_SCENES + 1):
             number_of_scenes_list[scene_id] = str(scene_id)
 
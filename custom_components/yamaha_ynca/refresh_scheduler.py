@@ -0,0 +1,163 @@
+"""Request functions that a Yamaha (YNCA) receiver does not report by itself."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+import ynca
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .command_worker import YncaCommandWorker
+
+# Requests of the same function within the window are suppressed.
+# Requesting a function can make the receiver report the trigger again,
+# the window prevents that from turning into a loop of requests.
+REFRESH_WINDOW = 0.5
+# Requests are collected for a short while so they can be sent in one go
+REFRESH_BATCH_DELAY = 0.05
+
+
+class RefreshTrigger(StrEnum):
+    REPORTED = "reported"
+    WRITTEN = "written"
+
+
+# Functions to request from the same subunit when a function is reported or written
+DEPENDENT_REFRESHES: dict[tuple[RefreshTrigger, str], tuple[str, ...]] = {
+    # DIRMODE does not (always?) report changes, but it does report STRAIGHT
+    # when DIRMODE changes, even when STRAIGHT did not change
+    (RefreshTrigger.REPORTED, "STRAIGHT"): ("DIRMODE",),
+    # On some subunits (TIDAL, probably Deezer) writing these
+    # does not result in the receiver reporting them
+    (RefreshTrigger.WRITTEN, "REPEAT"): ("REPEAT",),
+    (RefreshTrigger.WRITTEN, "SHUFFLE"): ("SHUFFLE",),
+}
+
+
+@dataclass
+class RefreshMetrics:
+    refreshes_requested: int = 0
+    refreshes_sent: int = 0
+    refreshes_suppressed: int = 0
+    batches: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class YncaRefreshScheduler:
+    """Requests functions that depend on other functions as declared in DEPENDENT_REFRESHES.
+
+    Requests for the same function are deduplicated within a window, no matter which
+    entity or zone caused them. The remaining requests are sent in one batch.
+    Functions are only requested from subunits that support them.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        command_worker: YncaCommandWorker,
+        api: ynca.YncaApi,
+    ) -> None:
+        self._loop = loop
+        self._command_worker = command_worker
+        self._api = api
+        self._connection = api.get_raw_connection()
+        self._pending: dict[tuple[str, str], None] = {}
+        self._sent: dict[tuple[str, str], float] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.metrics = RefreshMetrics()
+
+    def message_callback(
+        self,
+        status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        _value: str | None,
+    ) -> None:
+        """Handle messages from the connection, can be called from any thread."""
+        if (
+            status is ynca.YncaProtocolStatus.OK
+            and subunit is not None
+            and function_ is not None
+            and (RefreshTrigger.REPORTED, function_) in DEPENDENT_REFRESHES
+        ):
+            self._loop.call_soon_threadsafe(
+                self._schedule, RefreshTrigger.REPORTED, subunit, function_
+            )
+
+    @callback
+    def async_written(self, subunit_id: str, function_name: str) -> None:
+        """Call after writing a function, requests functions that depend on it."""
+        self._schedule(RefreshTrigger.WRITTEN, subunit_id, function_name)
+
+    @callback
+    def _schedule(
+        self, trigger: RefreshTrigger, subunit_id: str, function_name: str
+    ) -> None:
+        now = time.monotonic()
+        for refresh in DEPENDENT_REFRESHES.get((trigger, function_name), ()):
+            if not self._is_supported(subunit_id, refresh):
+                continue
+            self.metrics.refreshes_requested += 1
+            key = (subunit_id, refresh)
+            sent = self._sent.get(key)
+            if key in self._pending or (
+                sent is not None and now - sent < REFRESH_WINDOW
+            ):
+                self.metrics.refreshes_suppressed += 1
+                continue
+            self._pending[key] = None
+
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(REFRESH_BATCH_DELAY, self._flush)
+
+    def _is_supported(self, subunit_id: str, function_name: str) -> bool:
+        # Function attributes are the lowercased function names for all refreshed functions
+        subunit = getattr(self._api, subunit_id.lower(), None)
+        return getattr(subunit, function_name.lower(), None) is not None
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_handle = None
+        keys = list(self._pending)
+        self._pending.clear()
+
+        now = time.monotonic()
+        self._sent = {
+            key: sent for key, sent in self._sent.items() if now - sent < REFRESH_WINDOW
+        }
+        self._sent.update(dict.fromkeys(keys, now))
+        self.metrics.refreshes_sent += len(keys)
+        self.metrics.batches += 1
+
+        self._loop.create_task(self._async_send(keys), name="yamaha_ynca refresh")
+
+    async def _async_send(self, keys: list[tuple[str, str]]) -> None:
+        try:
+            await self._command_worker.async_run(_get_all, self._connection, keys)
+        except HomeAssistantError as e:
+            LOGGER.debug("Refresh of %s failed: %s", keys, e)
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop pending requests, the connection is going away."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+
+
+def _get_all(connection: ynca.YncaConnection, keys: list[tuple[str, str]]) -> None:
+    for subunit_id, function_name in keys:
+        connection.get(subunit_id, function_name)
@@ -0,0 +1,130 @@
+"""Index of the device and entity registry entries of a config entry."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import Event, HomeAssistant
+
+
+class YncaRegistryIndex:
+    """Keeps lookups from device identifiers and unique id suffixes to registry ids.
+
+    Looking up devices by identifier or entities by unique id in the registries
+    requires scanning or hashing sets of identifiers for every lookup. The index
+    is built with a single pass over the registries and kept current by listening
+    to the registry update events, so lookups are simple dictionary lookups.
+
+    Unique ids of the integration are prefixed with the entry_id,
+    the entity lookup uses the part after the prefix, e.g. "MAIN_twochdecoder".
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self._unique_id_prefix = f"{entry_id}_"
+
+        self._device_ids: dict[tuple[str, str], str] = {}
+        self._device_identifiers: dict[str, set[tuple[str, str]]] = {}
+        self._entity_ids: dict[str, str] = {}
+        self._entity_unique_id_suffixes: dict[str, str] = {}
+
+    def device_id(self, identifier: tuple[str, str]) -> str | None:
+        """Return the device registry id of the device with the identifier."""
+        return self._device_ids.get(identifier)
+
+    def entity_id(self, unique_id_suffix: str) -> str | None:
+        """Return the entity_id of the entity with unique id `<entry_id>_<unique_id_suffix>`."""
+        return self._entity_ids.get(unique_id_suffix)
+
+    @callback
+    def async_build(self) -> None:
+        """(Re)build the index from the registries."""
+        self._device_ids.clear()
+        self._device_identifiers.clear()
+        self._entity_ids.clear()
+        self._entity_unique_id_suffixes.clear()
+
+        for device in dr.async_entries_for_config_entry(
+            dr.async_get(self._hass), self._entry_id
+        ):
+            self._add_device(device)
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(self._hass), self._entry_id
+        ):
+            self._add_entity(entity)
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Build the index and keep it current, returns a callable to stop listening."""
+        self.async_build()
+
+        unsub_device = self._hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+        )
+        unsub_entity = self._hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+        )
+
+        @callback
+        def async_stop() -> None:
+            unsub_device()
+            unsub_entity()
+
+        return async_stop
+
+    def _add_device(self, device: dr.DeviceEntry) -> None:
+        self._device_identifiers[device.id] = set(device.identifiers)
+        for identifier in device.identifiers:
+            self._device_ids[identifier] = device.id
+
+    def _remove_device(self, device_id: str) -> None:
+        for identifier in self._device_identifiers.pop(device_id, set()):
+            if self._device_ids.get(identifier) == device_id:
+                del self._device_ids[identifier]
+
+    def _add_entity(self, entity: er.RegistryEntry) -> None:
+        suffix = entity.unique_id.removeprefix(self._unique_id_prefix)
+        self._entity_ids[suffix] = entity.entity_id
+        self._entity_unique_id_suffixes[entity.entity_id] = suffix
+
+    def _remove_entity(self, entity_id: str) -> None:
+        suffix = self._entity_unique_id_suffixes.pop(entity_id, None)
+        if suffix is not None and self._entity_ids.get(suffix) == entity_id:
+            del self._entity_ids[suffix]
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        device_id = event.data["device_id"]
+        self._remove_device(device_id)
+
+        if event.data["action"] != "remove" and (
+            (device := dr.async_get(self._hass).async_get(device_id))
+            and self._entry_id in device.config_entries
+        ):
+            self._add_device(device)
+
+    @callback
+    def _async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        entity_id = event.data["entity_id"]
+        self._remove_entity(entity_id)
+        # Only present for updates that renamed the entity
+        old_entity_id = event.data.get("old_entity_id")
+        if isinstance(old_entity_id, str):
+            self._remove_entity(old_entity_id)
+
+        if event.data["action"] != "remove" and (
+            (entity := er.async_get(self._hass).async_get(entity_id))
+            and entity.config_entry_id == self._entry_id
+        ):
+            self._add_entity(entity)
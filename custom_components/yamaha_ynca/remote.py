@@ -11,11 +11,13 @@ from homeassistant.components.remote import (
     DEFAULT_NUM_REPEATS,
     RemoteEntity,
 )
+from homeassistant.const import Platform
 from homeassistant.helpers.entity import DeviceInfo
 
 import ynca
 
 from .const import ATTR_COMMANDS, DOMAIN, ZONE_ATTRIBUTE_NAMES
+from .entity import async_run_command, update_ha_state
 
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Iterable
@@ -146,11 +148,10 @@ async def async_setup_entry(
         YamahaYncaZoneRemote(
             config_entry.entry_id,
             domain_entry_data.api,
-            zone_subunit,
-            get_zone_codes(zone_subunit.id),
+            planned.subunit,  # type: ignore[arg-type]
+            get_zone_codes(planned.subunit.id),
         )
-        for zone_attr_name in ZONE_ATTRIBUTE_NAMES
-        if (zone_subunit := getattr(domain_entry_data.api, zone_attr_name))
+        for planned in domain_entry_data.entity_plan.get(Platform.REMOTE, [])
     ]
 
     async_add_entities(entities)
@@ -217,7 +218,7 @@ class YamahaYncaZoneRemote(RemoteEntity):
 
     def _update_callback(self, function: str | None, _value: Any) -> None:
         if function == "PWR":
-            self.schedule_update_ha_state()
+            update_ha_state(self, function)
 
     async def async_added_to_hass(self) -> None:
         self._zone.register_update_callback(self._update_callback)
@@ -256,3 +257,12 @@ class YamahaYncaZoneRemote(RemoteEntity):
                 formatted_code = self._format_remotecode(code)
 
                 self._api.sys.remotecode(formatted_code)  # type: ignore[union-attr]
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await async_run_command(self, self.turn_on, **kwargs)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await async_run_command(self, self.turn_off, **kwargs)
+
+    async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
+        await async_run_command(self, self.send_command, command, **kwargs)
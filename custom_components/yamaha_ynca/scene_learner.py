@@ -0,0 +1,306 @@
+"""Learn the outcome of scene recalls on a Yamaha (YNCA) receiver."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from functools import cache
+import threading
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.storage import Store
+
+from ynca.function import FunctionMixinBase
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import Entity
+
+    from ynca.subunit import SubunitBase
+    from ynca.subunits.zone import ZoneBase
+
+STORAGE_VERSION = 1
+# Learned scenes change rarely, no need to write them to disk for every recall
+STORAGE_SAVE_DELAY = 30
+
+# A recall is done when the receiver did not report anything for a while
+SCENE_SETTLE_TIME = 1.0
+SCENE_RECALL_TIMEOUT = 10.0
+
+
+@dataclass
+class SceneMetrics:
+    recalls: int = 0
+    recalls_predicted: int = 0
+    predictions_confirmed: int = 0
+    predictions_corrected: int = 0
+    state_writes_coalesced: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Recall:
+    zone: ZoneBase
+    scene_id: int
+    device_identifier: tuple[str, str]
+    # Functions the scene changed on earlier recalls
+    expected: frozenset[str] = frozenset()
+    update_callback: Any = None
+    observed: dict[str, str] = field(default_factory=dict)
+    predicted: dict[str, Any] = field(default_factory=dict)
+    deferred: set[Entity] = field(default_factory=set)
+    updated: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+
+@cache
+def _get_functions(subunit_class: type) -> dict[str, tuple[str, FunctionMixinBase]]:
+    """Return attribute name and function per function name of the subunit class."""
+    functions = {}
+    for attribute in dir(subunit_class):
+        function = getattr(subunit_class, attribute, None)
+        if isinstance(function, FunctionMixinBase):
+            functions[function.name] = (attribute, function)
+    return functions
+
+
+def _is_learnable(function_name: str) -> bool:
+    # Names are not changed by scenes, AVAIL is only used as readiness probe
+    return function_name != "AVAIL" and not function_name.endswith("NAME")
+
+
+class YncaSceneLearner:
+    """Learns the state that recalling a scene results in and uses it to predict the next recall.
+
+    A recall makes the receiver report many functions which would each trigger a state
+    write for all entities of the zone. While a recall is in progress state writes of
+    the entities of the zone caused by functions the learned scene changes are coalesced
+    and written once when the receiver is done.
+
+    The reported functions are learned per scene and persisted. With optimistic state
+    enabled the learned state is shown immediately on the next recall and reconciled
+    with the reports of the receiver.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.scenes.{entry_id}"
+        )
+        # Learned function values per zone and scene, values are protocol strings
+        self._scenes: dict[str, dict[str, dict[str, str]]] = {}
+        self._recalls: dict[str, _Recall] = {}
+        self._predictions: dict[tuple[str, str], Any] = {}
+        self.metrics = SceneMetrics()
+
+    @property
+    def learned_scenes(self) -> dict[str, dict[str, dict[str, str]]]:
+        return self._scenes
+
+    async def async_load(self) -> None:
+        if (data := await self._store.async_load()) is not None:
+            self._scenes = data.get("scenes", {})
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"scenes": self._scenes}
+
+    def get_predicted_value(
+        self, subunit: SubunitBase, attribute: str, default: Any
+    ) -> Any:
+        """Return the predicted value of the attribute during a recall, default otherwise."""
+        if not self._predictions:
+            return default
+        return self._predictions.get((subunit.id, attribute), default)
+
+    def defer_update(self, entity: Entity, function_name: str) -> bool:
+        """Return True when the state write of the entity is deferred until the recall is done.
+
+        Only writes for functions that the learned scene is expected to change are deferred.
+        Can be called from any thread.
+        """
+        if not self._recalls or (device_info := entity.device_info) is None:
+            return False
+        for recall in list(self._recalls.values()):
+            if function_name in recall.expected and recall.device_identifier in (
+                device_info.get("identifiers", ())
+            ):
+                if self._hass.loop_thread_id == threading.get_ident():
+                    self._defer(recall, entity)
+                else:
+                    self._hass.loop.call_soon_threadsafe(self._defer, recall, entity)
+                return True
+        return False
+
+    @callback
+    def _defer(self, recall: _Recall, entity: Entity) -> None:
+        if self._recalls.get(recall.zone.id) is recall:
+            recall.deferred.add(entity)
+            self.metrics.state_writes_coalesced += 1
+        elif entity.hass is not None:
+            # Recall finished before the write got here
+            entity.async_write_ha_state()
+
+    def _get_zone_entities(self, device_identifier: tuple[str, str]) -> list[Entity]:
+        return [
+            entity
+            for platform in async_get_platforms(self._hass, DOMAIN)
+            if platform.config_entry is not None
+            and platform.config_entry.entry_id == self._entry_id
+            for entity in platform.entities.values()
+            if (device_info := entity.device_info) is not None
+            and device_identifier in device_info.get("identifiers", ())
+        ]
+
+    @callback
+    def async_begin_recall(
+        self, zone: ZoneBase, scene_id: int, *, predict: bool = False
+    ) -> None:
+        """Start observing the zone, call before sending the recall to the receiver.
+
+        With predict the learned state of the scene is shown until the receiver reports it.
+        """
+        # A new recall interrupts the previous one, it did show what it changed so far
+        self.async_end_recall(zone, learn=True)
+        self.metrics.recalls += 1
+
+        learned = self._scenes.get(zone.id, {}).get(str(scene_id))
+        recall = _Recall(
+            zone,
+            scene_id,
+            (DOMAIN, f"{self._entry_id}_{zone.id}"),
+            frozenset(learned or ()),
+        )
+        self._recalls[zone.id] = recall
+
+        def update_callback(function_name: str, value: Any) -> None:
+            self._hass.loop.call_soon_threadsafe(
+                self._update_received, recall, function_name, value
+            )
+
+        recall.update_callback = update_callback
+        zone.register_update_callback(update_callback)
+        recall.task = self._hass.async_create_background_task(
+            self._async_observe(recall), f"yamaha_ynca scene recall {zone.id}"
+        )
+
+        if predict and learned:
+            self.metrics.recalls_predicted += 1
+            functions = _get_functions(zone.__class__)
+            for function_name, value_str in learned.items():
+                if (function := functions.get(function_name)) is None:
+                    continue
+                attribute, ynca_function = function
+                value = ynca_function.converter.to_value(value_str)
+                recall.predicted[function_name] = value
+                self._predictions[(zone.id, attribute)] = value
+
+            # One write per entity shows the whole predicted state
+            for entity in self._get_zone_entities(recall.device_identifier):
+                entity.async_write_ha_state()
+
+    async def async_recall(
+        self,
+        zone: ZoneBase,
+        scene_id: int,
+        send: Callable[[], Awaitable[Any]],
+        *,
+        predict: bool = False,
+    ) -> None:
+        """Observe the recall of the scene while send sends it to the receiver."""
+        self.async_begin_recall(zone, scene_id, predict=predict)
+        try:
+            await send()
+        except BaseException:
+            self.async_end_recall(zone)
+            raise
+
+    @callback
+    def _update_received(self, recall: _Recall, function_name: str, value: Any) -> None:
+        if self._recalls.get(recall.zone.id) is not recall or not _is_learnable(
+            function_name
+        ):
+            return
+
+        recall.updated.set()
+        functions = _get_functions(recall.zone.__class__)
+        if (function := functions.get(function_name)) is None:
+            return
+        attribute, ynca_function = function
+
+        if function_name in recall.predicted:
+            # The real value replaces the prediction
+            if recall.predicted.pop(function_name) == value:
+                self.metrics.predictions_confirmed += 1
+            else:
+                self.metrics.predictions_corrected += 1
+            self._predictions.pop((recall.zone.id, attribute), None)
+
+        if value is not None:
+            recall.observed[function_name] = ynca_function.converter.to_str(value)
+
+    async def _async_observe(self, recall: _Recall) -> None:
+        completed = False
+        try:
+            async with asyncio.timeout(SCENE_RECALL_TIMEOUT):
+                while True:
+                    recall.updated.clear()
+                    try:
+                        async with asyncio.timeout(SCENE_SETTLE_TIME):
+                            await recall.updated.wait()
+                    except TimeoutError:
+                        break
+            completed = True
+        except TimeoutError:
+            LOGGER.debug("Recall of scene %s did not settle in time", recall.scene_id)
+            completed = True
+        finally:
+            self._finish(recall, learn=completed)
+
+    @callback
+    def async_end_recall(self, zone: ZoneBase, *, learn: bool = False) -> None:
+        """Stop observing the zone, e.g. when sending the recall failed."""
+        if (recall := self._recalls.get(zone.id)) is not None:
+            self._finish(recall, learn=learn)
+            if recall.task is not None:
+                recall.task.cancel()
+
+    @callback
+    def _finish(self, recall: _Recall, *, learn: bool) -> None:
+        if self._recalls.get(recall.zone.id) is not recall:
+            return
+        del self._recalls[recall.zone.id]
+        recall.zone.unregister_update_callback(recall.update_callback)
+
+        # Predictions that were not reported are unchanged or wrong,
+        # either way the state of the receiver is shown from now on
+        functions = _get_functions(recall.zone.__class__)
+        for function_name in recall.predicted:
+            self._predictions.pop((recall.zone.id, functions[function_name][0]), None)
+
+        if learn and recall.observed:
+            # Receivers only report changes, so merge with what was learned before
+            zone_scenes = self._scenes.setdefault(recall.zone.id, {})
+            scene = zone_scenes.setdefault(str(recall.scene_id), {})
+            if any(scene.get(key) != value for key, value in recall.observed.items()):
+                scene.update(recall.observed)
+                self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+        entities = set(recall.deferred)
+        if recall.predicted:
+            entities.update(self._get_zone_entities(recall.device_identifier))
+        for entity in entities:
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+
+async def async_remove_learned_scenes(hass: HomeAssistant, entry_id: str) -> None:
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.scenes.{entry_id}").async_remove()
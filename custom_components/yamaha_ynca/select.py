@@ -5,6 +5,8 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.const import Platform
+from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import slugify
 
@@ -13,9 +15,14 @@ import ynca
 from .const import (
     CONF_SELECTED_SURROUND_DECODERS,
     TWOCHDECODER_STRINGS,
-    ZONE_ATTRIBUTE_NAMES,
 )
-from .entity import YamahaYncaSettingEntity
+from .entity import (
+    YamahaYncaSettingEntity,
+    async_listen_options_updated,
+    async_run_command,
+    async_write_acknowledged,
+    get_optimistic_value,
+)
 from .helpers import extract_protocol_version, subunit_supports_entitydescription_key
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -52,6 +59,53 @@ PROLOGIC_II_TO_NEW_PROTOCOL_MAPPING = {
 }
 
 
+@dataclass(frozen=True)
+class SlugTable:
+    """Mapping between enum members and the slugs used as select options."""
+
+    to_slug: dict[Enum, str]
+    from_slug: dict[str, Enum]
+    options: list[str]
+    """Slugs of all members except UNKNOWN, in enum order."""
+
+    @classmethod
+    def build(
+        cls, enum: type[Enum], aliases: dict[Any, Any] | None = None
+    ) -> SlugTable:
+        """Build the table, members in `aliases` get the slug of the member they map to."""
+        aliases = aliases or {}
+        slugs = {member: slugify(member.value) for member in enum}
+
+        from_slug: dict[str, Enum] = {}
+        for member, slug in slugs.items():
+            # First member wins like with a linear search
+            from_slug.setdefault(slug, member)
+
+        return cls(
+            to_slug={member: slugs[aliases.get(member, member)] for member in enum},
+            from_slug=from_slug,
+            options=[
+                slug for member, slug in slugs.items() if member.name != "UNKNOWN"
+            ],
+        )
+
+
+_SLUG_TABLES: dict[type[Enum], SlugTable] = {}
+
+
+def get_slug_table(enum: type[Enum]) -> SlugTable:
+    """Return the slug table of the enum, tables are built once and shared by all entities."""
+    if (slug_table := _SLUG_TABLES.get(enum)) is None:
+        slug_table = _SLUG_TABLES[enum] = SlugTable.build(enum)
+    return slug_table
+
+
+# Any ProLogic II variant is shown as the standard version
+SURROUND_DECODER_SLUG_TABLE = SlugTable.build(
+    ynca.TwoChDecoder, SURROUNDDECODEROPTIONS_PROLOGIC_II_MAPPING
+)
+
+
 class InitialVolumeMode(Enum):
     CONFIGURED_INITIAL_VOLUME = "configured_initial_volume"
     LAST_VALUE = "last_value"
@@ -59,48 +113,42 @@ class InitialVolumeMode(Enum):
 
 
 async def async_setup_entry(
-    _hass: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    domain_entry_data = config_entry.runtime_data
-
-    entities = []
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(domain_entry_data.api, zone_attr_name):
-            entities.extend(
-                [
-                    entity_description.entity_class(
-                        config_entry,
-                        config_entry.entry_id,
-                        zone_subunit,
-                        entity_description,
-                    )
-                    for entity_description in ENTITY_DESCRIPTIONS
-                    if entity_description.is_supported(zone_subunit)
-                ]
+    entity_plan = config_entry.runtime_data.entity_plan
+
+    entities: list[YamahaYncaSelect] = []
+    for planned in entity_plan.get(Platform.SELECT, []):
+        entity_description: YncaSelectEntityDescription = planned.description  # type: ignore[assignment]
+        if planned.associated_zone:
+            # These are features on the SYS subunit, but they are tied to a zone
+            entities.append(
+                YamahaYncaSelect(
+                    config_entry,
+                    config_entry.entry_id,
+                    planned.subunit,
+                    entity_description,
+                    associated_zone=planned.associated_zone,
+                )
             )
-
-    # These are features on the SYS subunit, but they are tied to a zone
-    entities.extend(
-        YamahaYncaSelect(
-            config_entry,
-            config_entry.entry_id,
-            domain_entry_data.api.sys,  # type: ignore[arg-type]
-            entity_description,
-            associated_zone=zone_subunit,
-        )
-        for entity_description in SYS_ENTITY_DESCRIPTIONS
-        if getattr(domain_entry_data.api.sys, entity_description.key, None) is not None
-        and entity_description.associated_zone_attr
-        and (
-            zone_subunit := getattr(
-                domain_entry_data.api,
-                entity_description.associated_zone_attr,
-                None,
+        else:
+            entities.append(
+                entity_description.entity_class(
+                    config_entry,
+                    config_entry.entry_id,
+                    planned.subunit,  # type: ignore[arg-type]
+                    entity_description,
+                )
             )
-        )
-    )
+
+    @callback
+    def async_options_updated() -> None:
+        for entity in entities:
+            entity.async_apply_options(config_entry)
+
+    async_listen_options_updated(hass, config_entry, async_options_updated)
 
     async_add_entities(entities)
 
@@ -124,35 +172,47 @@ class YamahaYncaSelect(YamahaYncaSettingEntity, SelectEntity):
             config_entry.runtime_data.api.sys.version
         )
 
+        self._slug_table = self._get_slug_table()
+
         if description.options_fn is not None:
             self._attr_options = description.options_fn(config_entry)
         elif description.options is None:
-            self._attr_options = [
-                slugify(e.value) for e in description.enum if e.name != "UNKNOWN"
-            ]
+            self._attr_options = list(self._slug_table.options)
+
+    def _get_slug_table(self) -> SlugTable:
+        return get_slug_table(self.entity_description.enum)
+
+    @callback
+    def async_apply_options(self, config_entry: ConfigEntry) -> None:
+        if self.entity_description.options_fn is not None:
+            self._attr_options = self.entity_description.options_fn(config_entry)
+            self.async_write_ha_state()
 
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
-        return slugify(getattr(self._subunit, self.entity_description.key).value)
+        value = get_optimistic_value(self, self._subunit, self.entity_description.key)
+        return self._slug_table.to_slug.get(value) if value is not None else None
 
     def _get_value_for_slug(self, option_slug: str) -> Any:
-        return next(
-            (
-                enum_
-                for enum_ in self.entity_description.enum
-                if slugify(enum_.value) == option_slug
-            ),
-            None,
-        )
+        return self._slug_table.from_slug.get(option_slug)
+
+    def _get_value_for_option(self, option: str) -> Any:
+        if self.entity_description.enum is None:
+            return None
+        return self._get_value_for_slug(option)
 
     def select_option(self, option: str) -> None:
         """Change the selected option."""
-        if self.entity_description.enum is not None and (
-            value := self._get_value_for_slug(option)
-        ):
+        if value := self._get_value_for_option(option):
             setattr(self._subunit, self.entity_description.key, value)
 
+    async def async_select_option(self, option: str) -> None:
+        if value := self._get_value_for_option(option):
+            await async_write_acknowledged(
+                self, self._subunit, self.entity_description.key, value
+            )
+
 
 class YamahaYncaSelectInitialVolumeMode(YamahaYncaSelect):
     """Representation of a select entity on a Yamaha Ynca device specifically for Initial Volume.
@@ -178,6 +238,10 @@ class YamahaYncaSelectInitialVolumeMode(YamahaYncaSelect):
 
         return InitialVolumeMode.CONFIGURED_INITIAL_VOLUME.value
 
+    async def async_select_option(self, option: str) -> None:
+        # Depending on the option multiple functions get written
+        await async_run_command(self, self.select_option, option)
+
     def select_option(self, option: str) -> None:
         """Change the selected option."""
         value = InitialVolumeMode(option)
@@ -216,28 +280,16 @@ class YamahaYncaSelectSurroundDecoder(YamahaYncaSelect):
     Solution is to map PLII and PLIIx to same values in HA (as receiver will translate anyway this should work)
     """
 
-    @property
-    def current_option(self) -> str | None:
-        """Return the selected entity option to represent the entity state."""
-        if self._associated_zone.twochdecoder is None:
-            return None
-
-        current_option = self._associated_zone.twochdecoder
-        # Map any ProLogic II options to a standard version
-        current_option = SURROUNDDECODEROPTIONS_PROLOGIC_II_MAPPING.get(
-            current_option, current_option
-        )
-
-        return slugify(current_option.value)
+    def _get_slug_table(self) -> SlugTable:
+        # Maps any ProLogic II options to a standard version
+        return SURROUND_DECODER_SLUG_TABLE
 
-    def select_option(self, option: str) -> None:
-        """Change the selected option."""
-        if value := self._get_value_for_slug(option):
-            # Newer receivers use different values for ProLogic II
-            if self._protocol_version >= (3, 0):
-                value = PROLOGIC_II_TO_NEW_PROTOCOL_MAPPING.get(value, value)
-
-            setattr(self._subunit, self.entity_description.key, value)
+    def _get_value_for_option(self, option: str) -> Any:
+        value = self._get_value_for_slug(option)
+        # Newer receivers use different values for ProLogic II
+        if value and self._protocol_version >= (3, 0):
+            value = PROLOGIC_II_TO_NEW_PROTOCOL_MAPPING.get(value, value)
+        return value
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -8,15 +8,16 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
 )
+from homeassistant.const import Platform
+from homeassistant.core import callback
 from propcache.api import cached_property
 
 import ynca
 
 from .const import (
     CONF_SELECTED_INPUTS,
-    ZONE_ATTRIBUTE_NAMES,
 )
-from .entity import YamahaYncaSettingEntity
+from .entity import YamahaYncaSettingEntity, async_listen_options_updated
 from .helpers import subunit_supports_entitydescription_key
 from .input_helpers import InputHelper
 
@@ -84,27 +85,28 @@ ENTITY_DESCRIPTIONS = [
 
 
 async def async_setup_entry(
-    _hass: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    domain_entry_data = config_entry.runtime_data
-
-    entities = []
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(domain_entry_data.api, zone_attr_name):
-            entities.extend(
-                [
-                    YamahaYncaSensor(
-                        config_entry,
-                        config_entry.entry_id,
-                        zone_subunit,
-                        entity_description,
-                    )
-                    for entity_description in ENTITY_DESCRIPTIONS
-                    if entity_description.is_supported(entity_description, zone_subunit)
-                ]
-            )
+    entity_plan = config_entry.runtime_data.entity_plan
+
+    entities = [
+        YamahaYncaSensor(
+            config_entry,
+            config_entry.entry_id,
+            planned.subunit,  # type: ignore[arg-type]
+            planned.description,  # type: ignore[arg-type]
+        )
+        for planned in entity_plan.get(Platform.SENSOR, [])
+    ]
+
+    @callback
+    def async_options_updated() -> None:
+        for entity in entities:
+            entity.async_apply_options(config_entry)
+
+    async_listen_options_updated(hass, config_entry, async_options_updated)
 
     async_add_entities(entities)
 
@@ -130,6 +132,17 @@ class YamahaYncaSensor(YamahaYncaSettingEntity, SensorEntity):
             else None
         )
 
+    @callback
+    def async_apply_options(self, config_entry: YamahaYncaConfigEntry) -> None:
+        if self.entity_description.extra_data_fn:
+            self._extra_data = self.entity_description.extra_data_fn(
+                config_entry,
+                self._subunit,  # type: ignore[arg-type]
+            )
+            # Options are based on the extra data, so make sure they get recalculated
+            self.__dict__.pop("options", None)
+            self.async_write_ha_state()
+
     @property
     def available(self) -> bool:
         # In contrast to most other entities, sensors are always available (at least the current ones)
@@ -2,47 +2,183 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+from functools import partial
+import time
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.media_player import DOMAIN as MEDIA_PLAYER_DOMAIN
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import ATTR_CONFIG_ENTRY_ID
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv, service
 import voluptuous as vol
 
-from .const import DOMAIN
+import ynca
+
+from .const import (
+    DOMAIN,
+    MAX_NUMBER_OF_SCENES,
+    ZONE_ATTRIBUTE_NAMES,
+    ZONE_MAX_VOLUME,
+    ZONE_MIN_VOLUME,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from homeassistant.core import ServiceResponse
     from homeassistant.helpers.service import ServiceCall
 
+    from ynca.subunits.zone import ZoneBase
+
+    from . import YamahaYncaConfigEntry
+    from .helpers import DomainEntryData
+
+ATTR_INPUT = "input"
+ATTR_POWER = "power"
 ATTR_PRESET_ID = "preset_id"
 ATTR_RAW_DATA = "raw_data"
+ATTR_SCENE = "scene"
+ATTR_VOLUME = "volume"
+ATTR_ZONES = "zones"
 
+BROADCAST_ACTIONS = [ATTR_POWER, ATTR_VOLUME, ATTR_INPUT, ATTR_SCENE, ATTR_RAW_DATA]
+
+SERVICE_BROADCAST = "broadcast"
 SERVICE_SEND_RAW_YNCA = "send_raw_ynca"
 SERVICE_STORE_PRESET = "store_preset"
 
 
-async def async_handle_send_raw_ynca(hass: HomeAssistant, call: ServiceCall) -> None:
-    config_entry = hass.config_entries.async_get_entry(
-        call.data.get(ATTR_CONFIG_ENTRY_ID)
-    )
+def _get_loaded_config_entry(
+    hass: HomeAssistant, config_entry_id: str
+) -> YamahaYncaConfigEntry:
+    config_entry = hass.config_entries.async_get_entry(config_entry_id)
 
-    if config_entry is None or config_entry.state is not ConfigEntryState.LOADED:
+    if (
+        config_entry is None
+        or config_entry.domain != DOMAIN
+        or config_entry.state is not ConfigEntryState.LOADED
+    ):
         raise ServiceValidationError(
             translation_domain=DOMAIN,
             translation_key="config_entry_not_found",
-            translation_placeholders={
-                "config_entry_id": call.data.get(ATTR_CONFIG_ENTRY_ID)
-            },
+            translation_placeholders={"config_entry_id": config_entry_id},
         )
 
-    # Handle actual call
-    for line in call.data.get(ATTR_RAW_DATA, "").splitlines():
+    return config_entry
+
+
+async def _async_send_raw(domain_entry_data: DomainEntryData, raw_data: str) -> None:
+    for line in raw_data.splitlines():
         line = line.strip()  # noqa: PLW2901
         if line.startswith("@"):
-            config_entry.runtime_data.api.send_raw(line)
+            await domain_entry_data.command_worker.async_run(
+                domain_entry_data.api.send_raw, line
+            )
+
+
+async def async_handle_send_raw_ynca(hass: HomeAssistant, call: ServiceCall) -> None:
+    config_entry = _get_loaded_config_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+    # Handle actual call
+    await _async_send_raw(config_entry.runtime_data, call.data.get(ATTR_RAW_DATA, ""))
+
+
+def _round_volume(volume: float) -> float:
+    # Receivers use 0.5 dB steps
+    return round(volume * 2) / 2
+
+
+def _get_broadcast_zones(
+    domain_entry_data: DomainEntryData, data: dict[str, Any]
+) -> list[ZoneBase]:
+    zones = [
+        zone
+        for zone_attr_name in data.get(ATTR_ZONES, ZONE_ATTRIBUTE_NAMES)
+        if (zone := getattr(domain_entry_data.api, zone_attr_name, None))
+    ]
+    if not zones:
+        msg = "Receiver has none of the zones to broadcast to"
+        raise HomeAssistantError(msg)
+    return zones
+
+
+def _get_broadcast_zone_command(
+    domain_entry_data: DomainEntryData, zone: ZoneBase, data: dict[str, Any]
+) -> Awaitable[None]:
+    write_acknowledger = domain_entry_data.write_acknowledger
+    if ATTR_POWER in data:
+        return write_acknowledger.async_write(zone, "pwr", ynca.Pwr(data[ATTR_POWER]))
+    if ATTR_VOLUME in data:
+        return write_acknowledger.async_write(zone, "vol", data[ATTR_VOLUME])
+    if ATTR_INPUT in data:
+        return write_acknowledger.async_write(zone, "inp", ynca.Input(data[ATTR_INPUT]))
+    # Scenes are not reported back by the receiver, but the changes they make are
+    return domain_entry_data.scene_learner.async_recall(
+        zone,
+        data[ATTR_SCENE],
+        partial(
+            domain_entry_data.command_worker.async_run, zone.scene, data[ATTR_SCENE]
+        ),
+    )
+
+
+async def _async_broadcast_to_receiver(
+    config_entry: YamahaYncaConfigEntry, data: dict[str, Any]
+) -> dict[str, Any]:
+    domain_entry_data = config_entry.runtime_data
+    start = time.monotonic()
+    result: dict[str, Any] = {"title": config_entry.title}
+    try:
+        if ATTR_RAW_DATA in data:
+            await _async_send_raw(domain_entry_data, data[ATTR_RAW_DATA])
+        else:
+            await asyncio.gather(
+                *(
+                    _get_broadcast_zone_command(domain_entry_data, zone, data)
+                    for zone in _get_broadcast_zones(domain_entry_data, data)
+                )
+            )
+    except Exception as e:  # noqa: BLE001
+        # One failing receiver should not affect the others
+        result["success"] = False
+        result["error"] = str(e)
+    else:
+        result["success"] = True
+    result["duration"] = round(time.monotonic() - start, 3)
+    return result
+
+
+async def async_handle_broadcast(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    if config_entry_ids := call.data.get(ATTR_CONFIG_ENTRY_ID):
+        config_entries = [
+            _get_loaded_config_entry(hass, config_entry_id)
+            for config_entry_id in config_entry_ids
+        ]
+    else:
+        config_entries = hass.config_entries.async_loaded_entries(DOMAIN)
+
+    # Each receiver has its own connection and command worker
+    # so the receivers are handled concurrently
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            _async_broadcast_to_receiver(config_entry, call.data)
+            for config_entry in config_entries
+        )
+    )
+
+    return {
+        "duration": round(time.monotonic() - start, 3),
+        "receivers": {
+            config_entry.entry_id: result
+            for config_entry, result in zip(config_entries, results, strict=True)
+        },
+    }
 
 
 @callback
@@ -64,6 +200,49 @@ def async_setup_services(hass: HomeAssistant) -> None:
         ),
     )
 
+    async def async_handle_broadcast_local(call: ServiceCall) -> ServiceResponse:
+        return await async_handle_broadcast(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST,
+        async_handle_broadcast_local,
+        schema=vol.All(
+            vol.Schema(
+                {
+                    vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(
+                        cv.ensure_list, [cv.string]
+                    ),
+                    vol.Optional(ATTR_ZONES): vol.All(
+                        cv.ensure_list, [vol.In(ZONE_ATTRIBUTE_NAMES)]
+                    ),
+                    vol.Optional(ATTR_POWER): vol.In(
+                        [ynca.Pwr.ON.value, ynca.Pwr.STANDBY.value]
+                    ),
+                    vol.Optional(ATTR_VOLUME): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=ZONE_MIN_VOLUME, max=ZONE_MAX_VOLUME),
+                        _round_volume,
+                    ),
+                    vol.Optional(ATTR_INPUT): vol.In(
+                        [
+                            input_.value
+                            for input_ in ynca.Input
+                            if input_ is not ynca.Input.UNKNOWN
+                        ]
+                    ),
+                    vol.Optional(ATTR_SCENE): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_NUMBER_OF_SCENES)
+                    ),
+                    vol.Optional(ATTR_RAW_DATA): cv.string,
+                }
+            ),
+            cv.has_at_least_one_key(*BROADCAST_ACTIONS),
+            cv.has_at_most_one_key(*BROADCAST_ACTIONS),
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     # Store Preset
     service.async_register_platform_entity_service(
         hass,
@@ -71,5 +250,5 @@ def async_setup_services(hass: HomeAssistant) -> None:
         SERVICE_STORE_PRESET,
         entity_domain=MEDIA_PLAYER_DOMAIN,
         schema={vol.Required(ATTR_PRESET_ID): cv.positive_int},
-        func="store_preset",
+        func="async_store_preset",
     )
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from math import inf
-from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.const import Platform
 from homeassistant.helpers.entity import EntityCategory
 
 import ynca
 
-from .const import ZONE_ATTRIBUTE_NAMES
-from .entity import YamahaYncaSettingEntity
+from .entity import (
+    YamahaYncaSettingEntity,
+    async_write_acknowledged,
+    get_optimistic_value,
+)
 from .helpers import subunit_supports_entitydescription_key
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -182,7 +184,7 @@ SYS_ENTITY_DESCRIPTIONS = [
 ]
 
 
-def _get_subwoofer_descriptions(
+def get_subwoofer_descriptions(
     sys_subunit: System,
 ) -> list[YncaSwitchEntityDescription]:
     """Return subwoofer pattern switch descriptions based on the capabilities of the device.
@@ -235,47 +237,30 @@ async def async_setup_entry(
     config_entry: YamahaYncaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    domain_entry_data = config_entry.runtime_data
+    entity_plan = config_entry.runtime_data.entity_plan
 
     entities = []
-    for zone_attr_name in ZONE_ATTRIBUTE_NAMES:
-        if zone_subunit := getattr(domain_entry_data.api, zone_attr_name):
-            entities.extend(
-                [
-                    YamahaYncaSwitch(
-                        config_entry.entry_id, zone_subunit, entity_description
-                    )
-                    for entity_description in ZONE_ENTITY_DESCRIPTIONS
-                    if entity_description.is_supported(zone_subunit)
-                ]
-            )
-
-    if sys_subunit := domain_entry_data.api.sys:
-        # These are features on the SYS subunit, but they are tied to a zone
-        # and therefore need some special handling
-        sys_descriptions = SYS_ENTITY_DESCRIPTIONS + _get_subwoofer_descriptions(
-            sys_subunit
-        )
-        entities.extend(
-            [
+    for planned in entity_plan.get(Platform.SWITCH, []):
+        entity_description: YncaSwitchEntityDescription = planned.description  # type: ignore[assignment]
+        if planned.associated_zone:
+            # These are features on the SYS subunit, but they are tied to a zone
+            # and therefore need some special handling
+            entities.append(
                 YamahaYncaSwitch(
                     config_entry.entry_id,
-                    sys_subunit,
+                    planned.subunit,
                     entity_description,
-                    associated_zone=zone_subunit,
+                    associated_zone=planned.associated_zone,
                 )
-                for entity_description in sys_descriptions
-                if (getattr(sys_subunit, entity_description.key, None) is not None)
-                and entity_description.associated_zone_attr
-                and (
-                    zone_subunit := getattr(
-                        domain_entry_data.api,
-                        entity_description.associated_zone_attr,
-                        None,
-                    )
+            )
+        else:
+            entities.append(
+                YamahaYncaSwitch(
+                    config_entry.entry_id,
+                    planned.subunit,  # type: ignore[arg-type]
+                    entity_description,
                 )
-            ]
-        )
+            )
 
     async_add_entities(entities)
 
@@ -293,13 +278,12 @@ class YamahaYncaSwitch(YamahaYncaSettingEntity, SwitchEntity):  # type: ignore[m
         associated_zone: ZoneBase | None = None,
     ) -> None:
         super().__init__(receiver_unique_id, subunit, description, associated_zone)
-        self._dirmode_get_sent = -inf  # Initialize far in the past
 
     @property
     def is_on(self) -> bool | None:
         """Return True if entity is on."""
         return (
-            getattr(self._subunit, self.entity_description.key, None)
+            get_optimistic_value(self, self._subunit, self.entity_description.key)
             == self.entity_description.on
         )
 
@@ -317,18 +301,15 @@ class YamahaYncaSwitch(YamahaYncaSettingEntity, SwitchEntity):  # type: ignore[m
         """Turn the entity off."""
         setattr(self._subunit, self.entity_description.key, self.entity_description.off)
 
-    def update_callback(self, function: str, value: Any) -> None:
-        super().update_callback(function, value)
-
-        # DIRMODE does not (always?) report changes
-        # but it does report STRAIGHT when DIRMODE changes, even when STRAIGHT did not change
-        # So manually request an update for DIRMODE when STRAIGHT is reported
-        if self.entity_description.key == "dirmode" and function == "STRAIGHT":
-            # But because STRAIGHT also gets reported on GET we need to avoid an infinite loop
-            if monotonic() - self._dirmode_get_sent < 0.5:  # noqa: PLR2004
-                return
+    async def async_turn_on(self, **_kwargs: Any) -> None:
+        await async_write_acknowledged(
+            self, self._subunit, self.entity_description.key, self.entity_description.on
+        )
 
-            self._associated_zone._connection.get(  # noqa: SLF001
-                self._associated_zone.id, "DIRMODE"
-            )
-            self._dirmode_get_sent = monotonic()
+    async def async_turn_off(self, **_kwargs: Any) -> None:
+        await async_write_acknowledged(
+            self,
+            self._subunit,
+            self.entity_description.key,
+            self.entity_description.off,
+        )
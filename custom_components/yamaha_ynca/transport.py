@@ -0,0 +1,305 @@
+"""Asyncio based transport for Yamaha (YNCA) receivers connected through the network.
+
+The ynca package uses pyserial for all connections, which means a reader and
+a sender thread per receiver and every update being handed over to the event
+loop. For socket:// URLs the connection below is used instead. It reads and
+parses the YNCA lines directly on the event loop, so updates are dispatched
+without a thread handoff. Real serial ports keep using the threaded connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from enum import Enum
+import re
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import ynca
+from ynca.protocol import LogBuffer, YncaProtocol
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SOCKET_URL_REGEX = re.compile(r"socket:\/\/(?P<host>.+):(?P<port>\d+)")
+CONNECT_TIMEOUT = 5.0
+
+_LINE_REGEX = re.compile(r"@(?P<subunit>.+?):(?P<function>.+?)=(?P<value>.*)")
+_TERMINATOR = b"\r\n"
+# Use MODELNAME as keep-alive, supported by all
+_KEEP_ALIVE_MESSAGE = "@SYS:MODELNAME=?"
+
+
+class _Sentinel(Enum):
+    # Queued instead of the keep-alive message so it can not be confused
+    # with a MODELNAME request, whose reply must not be dropped
+    KEEP_ALIVE = "keep_alive"
+
+
+_KEEP_ALIVE = _Sentinel.KEEP_ALIVE
+
+
+def is_socket_url(serial_url: str) -> bool:
+    return SOCKET_URL_REGEX.match(serial_url) is not None
+
+
+class _YncaLineProtocol(asyncio.Protocol):
+    """Splits the received data in lines and hands them to the connection."""
+
+    def __init__(self, connection: YncaSocketConnection) -> None:
+        self._connection = connection
+        self._buffer = b""
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._connection._transport_connected(transport)  # type: ignore[arg-type] # noqa: SLF001
+
+    def data_received(self, data: bytes) -> None:
+        *lines, self._buffer = (self._buffer + data).split(_TERMINATOR)
+        for line in lines:
+            self._connection._handle_line(line.decode("utf-8", "replace"))  # noqa: SLF001
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._connection._transport_lost(exc)  # noqa: SLF001
+
+
+class YncaSocketConnection(ynca.YncaConnection):
+    """YncaConnection running on the asyncio event loop.
+
+    Message callbacks are called on the event loop.
+    Sending is threadsafe, connect() must not be called from the event loop.
+    """
+
+    def __init__(self, serial_url: str, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(serial_url)
+        self._loop = loop
+        self._loop_thread_id: int | None = None
+        self._transport: asyncio.Transport | None = None
+        self._send_queue: asyncio.Queue[str | _Sentinel] | None = None
+        self._send_task: asyncio.Task | None = None
+        self._keep_alive_pending = False
+        self._communication_log_buffer = LogBuffer(0)
+        self._num_commands_sent = 0
+
+    def connect(
+        self,
+        disconnect_callback: Callable[[], None] | None = None,
+        communication_log_size: int = 0,
+    ) -> None:
+        """Connect to the receiver, blocks until connected."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            # Would deadlock since connecting is done on the loop
+            msg = "Can not connect from within the event loop"
+            raise RuntimeError(msg)
+
+        self._disconnect_callback = disconnect_callback
+        self._communication_log_buffer = LogBuffer(communication_log_size)
+
+        future = asyncio.run_coroutine_threadsafe(self._async_connect(), self._loop)
+        try:
+            future.result(CONNECT_TIMEOUT)
+        except TimeoutError as e:
+            future.cancel()
+            raise ynca.YncaConnectionError from e
+        except OSError as e:
+            raise ynca.YncaConnectionError from e
+
+    async def _async_connect(self) -> None:
+        matches = SOCKET_URL_REGEX.match(self._port)
+        if matches is None:
+            msg = f"Not a socket:// URL: {self._port}"
+            raise ynca.YncaConnectionError(msg)
+        await self._loop.create_connection(
+            lambda: _YncaLineProtocol(self),
+            matches["host"],
+            int(matches["port"]),
+        )
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._is_closing.set()
+        self._call_in_loop(self._close)
+
+    def _close(self) -> None:
+        if self._transport is not None:
+            # Sender gets stopped in connection_lost
+            self._transport.close()
+        elif self._send_task is not None:
+            self._send_task.cancel()
+
+    def _call_in_loop(self, func: Callable[..., None], *args: object) -> None:
+        if threading.get_ident() == self._loop_thread_id:
+            func(*args)
+            return
+        # Loop can be closed already when shutting down, nothing to do then
+        with contextlib.suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _transport_connected(self, transport: asyncio.Transport) -> None:
+        LOGGER.debug("Connected to %s", self._port)
+        self._loop_thread_id = threading.get_ident()
+        self._transport = transport
+        self._keep_alive_pending = False
+        self._send_queue = asyncio.Queue()
+        self._send_task = self._loop.create_task(
+            self._send_handler(), name=f"yamaha_ynca sender {self._port}"
+        )
+
+        # When the device is in low power mode the first command is to wake up and gets lost
+        # So send a dummy keep-alive on connect and a real one to make sure keep-alive administration is up-to-date
+        self._send_queue.put_nowait(_KEEP_ALIVE)
+        self._send_queue.put_nowait(_KEEP_ALIVE)
+
+    def _transport_lost(self, exc: Exception | None) -> None:
+        LOGGER.debug("Connection to %s closed/lost %s", self._port, exc)
+        self._transport = None
+        self._send_queue = None
+        if self._send_task is not None:
+            self._send_task.cancel()
+            self._send_task = None
+        self._on_disconnect()
+
+    async def _send_handler(self) -> None:
+        while (send_queue := self._send_queue) is not None:
+            item: str | _Sentinel
+            try:
+                async with asyncio.timeout(YncaProtocol.KEEP_ALIVE_INTERVAL):
+                    item = await send_queue.get()
+            except TimeoutError:
+                # To avoid random message being eaten because device goes to sleep, keep it alive
+                item = _KEEP_ALIVE
+
+            if self._transport is None:
+                return
+
+            if item is _KEEP_ALIVE:
+                message = _KEEP_ALIVE_MESSAGE
+                self._keep_alive_pending = True
+            else:
+                message = item
+
+            LOGGER.debug("Send - %s", message)
+            self._communication_log_buffer.add(
+                f"{time.perf_counter():.6f} Send: {message}"
+            )
+            self._transport.write(message.encode("utf-8") + _TERMINATOR)
+
+            # Maintain required command spacing
+            await asyncio.sleep(YncaProtocol.COMMAND_SPACING)
+
+    def _handle_line(self, line: str) -> None:
+        status = ynca.YncaProtocolStatus.OK
+        subunit: str | None = None
+        function: str | None = None
+        value: str | None = None
+
+        LOGGER.debug("Recv - %s", line)
+        self._communication_log_buffer.add(
+            f"{time.perf_counter():.6f} Received: {line}"
+        )
+
+        if line == "@UNDEFINED":
+            status = ynca.YncaProtocolStatus.UNDEFINED
+        elif line == "@RESTRICTED":
+            status = ynca.YncaProtocolStatus.RESTRICTED
+        elif matches := _LINE_REGEX.match(line):
+            subunit, function, value = matches.group("subunit", "function", "value")
+            if (
+                self._keep_alive_pending
+                and subunit == "SYS"
+                and function == "MODELNAME"
+            ):
+                self._keep_alive_pending = False
+                return
+
+        self._keep_alive_pending = False
+        self._call_registered_message_callbacks(status, subunit, function, value)
+
+    def _call_registered_message_callbacks(
+        self,
+        status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        value: str | None,
+    ) -> None:
+        # Callbacks can get (un)registered from other threads while dispatching
+        for callback in list(self._message_callbacks):
+            callback(status, subunit, function_, value)
+
+    def _send(self, message: str) -> None:
+        if self._send_queue is not None:
+            self._num_commands_sent += 1
+            self._call_in_loop(self._enqueue, message)
+
+    def _enqueue(self, message: str) -> None:
+        if self._send_queue is not None:
+            self._send_queue.put_nowait(message)
+
+    def raw(self, raw_data: str) -> None:
+        """Send raw data to the receiver."""
+        self._send(raw_data)
+
+    def put(self, subunit: str, funcname: str, parameter: str) -> None:
+        """Send a PUT request to set a value of a function on a subunit of the receiver."""
+        self._send(f"@{subunit}:{funcname}={parameter}")
+
+    def get(self, subunit: str, funcname: str) -> None:
+        """Send a GET request to get a value of a function on a subunit of the receiver."""
+        self._send(f"@{subunit}:{funcname}=?")
+
+    @property
+    def connected(self) -> bool:
+        return self._transport is not None and not self._is_closing.is_set()
+
+    @property
+    def num_commands_sent(self) -> int:
+        return self._num_commands_sent
+
+    def get_communication_log_items(self) -> list[str]:
+        return self._communication_log_buffer.get_buffer()
+
+
+class YncaSocketApi(ynca.YncaApi):
+    """YncaApi using the asyncio based YncaSocketConnection.
+
+    initialize() blocks while waiting for responses that are handled on
+    the event loop, so it must be called from a worker thread.
+    """
+
+    def __init__(
+        self,
+        serial_url: str,
+        disconnect_callback: Callable[[], None] | None = None,
+        communication_log_size: int = 0,
+        *,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        super().__init__(serial_url, disconnect_callback, communication_log_size)
+        self._loop = loop
+
+    def initialize(self) -> None:
+        """Set up the connection and initialize the API, same as YncaApi.initialize."""
+        if self._connection is not None:
+            msg = "Can only initialize once!"
+            raise ynca.YncaInitializationFailedException(msg)
+
+        is_initialized = False
+
+        connection = YncaSocketConnection(self._serial_url, self._loop)
+        connection.connect(self._disconnect_callback, self._communication_log_size)
+        self._connection = connection
+
+        try:
+            self._detect_available_subunits(connection)
+            self._initialize_available_subunits(connection)
+            is_initialized = True
+        finally:
+            if not is_initialized:
+                self.close()
@@ -0,0 +1,140 @@
+"""Hand off reports of changed values from a Yamaha (YNCA) receiver to the subunits."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+import ynca
+from ynca.constants import Subunit
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from ynca.subunit import SubunitBase
+
+
+@dataclass
+class UpdateMetrics:
+    updates_received: int = 0
+    updates_dispatched: int = 0
+    updates_suppressed: int = 0
+    batches: int = 0
+    max_batch_size: int = 0
+    last_handoff_latency: float = 0.0
+    max_handoff_latency: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class YncaUpdateFilter:
+    """Dispatches messages of the connection to the subunits, unless the value did not change.
+
+    The receiver replies to every GET with the full value, also for refreshes, readiness
+    probes and keep-alives. Subunits call the update callbacks of the entities for every
+    message, so unchanged values are dropped before they reach the subunits.
+
+    Other listeners on the connection, like the write acknowledger, still get all messages.
+
+    Messages from the reader thread of serial connections are handed off to the event
+    loop in batches. The reader thread appends to a queue and only wakes up the loop when
+    no drain is pending yet, so a burst of messages is dispatched by a single loop callback
+    instead of a wakeup per entity. Connections that deliver messages on the event loop,
+    like the socket transport, are dispatched directly.
+
+    Must be created on the event loop.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, connection: ynca.YncaConnection
+    ) -> None:
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._connection = connection
+        self._subunits: dict[str, SubunitBase] = {}
+        # Last dispatched value per subunit and function, values are protocol strings
+        self._values: dict[tuple[str, str], str] = {}
+        # Appended by the reader thread, drained on the loop. Appending and popping
+        # from the ends of a deque is thread safe, so no lock is needed
+        self._queue: deque[
+            tuple[
+                SubunitBase, ynca.YncaProtocolStatus, str, str | None, str | None, float
+            ]
+        ] = deque()
+        self._drain_scheduled = False
+        self.metrics = UpdateMetrics()
+
+    def attach(self, api: ynca.YncaApi) -> None:
+        """Route the messages for the subunits of the API through the filter."""
+        for subunit_id in Subunit:
+            if (subunit := getattr(api, subunit_id.value.lower(), None)) is None:
+                continue
+            # Subunits register themselves on the connection, take over that registration
+            self._connection.unregister_message_callback(
+                subunit._protocol_message_received  # noqa: SLF001
+            )
+            self._subunits[subunit.id] = subunit
+        self._connection.register_message_callback(self.message_callback)
+
+    def message_callback(
+        self,
+        status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        value: str | None,
+    ) -> None:
+        """Handle messages from the connection, can be called from any thread."""
+        if subunit is None or (target := self._subunits.get(subunit)) is None:
+            return
+
+        if (
+            status is ynca.YncaProtocolStatus.OK
+            and function_ is not None
+            and value is not None
+        ):
+            self.metrics.updates_received += 1
+            key = (subunit, function_)
+            if self._values.get(key) == value:
+                self.metrics.updates_suppressed += 1
+                return
+            self._values[key] = value
+            self.metrics.updates_dispatched += 1
+
+        if threading.get_ident() == self._loop_thread_id:
+            # Keep the order in case messages of the reader thread are still queued
+            if self._queue:
+                self._drain()
+            target._protocol_message_received(status, subunit, function_, value)  # noqa: SLF001
+            return
+
+        self._queue.append(
+            (target, status, subunit, function_, value, time.monotonic())
+        )
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self._loop.call_soon_threadsafe(self._drain)
+
+    @callback
+    def _drain(self) -> None:
+        # Clear the flag first, messages queued while draining schedule a new drain
+        self._drain_scheduled = False
+        batch_size = 0
+        while self._queue:
+            target, status, subunit, function_, value, queued = self._queue.popleft()
+            latency = time.monotonic() - queued
+            self.metrics.last_handoff_latency = latency
+            self.metrics.max_handoff_latency = max(
+                self.metrics.max_handoff_latency, latency
+            )
+            batch_size += 1
+            target._protocol_message_received(status, subunit, function_, value)  # noqa: SLF001
+
+        if batch_size:
+            self.metrics.batches += 1
+            self.metrics.max_batch_size = max(self.metrics.max_batch_size, batch_size)
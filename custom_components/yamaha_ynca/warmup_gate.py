@@ -0,0 +1,243 @@
+"""Hold commands for zones of a Yamaha (YNCA) receiver while they are warming up."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from homeassistant.core import callback
+
+import ynca
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+    from ynca.subunit import SubunitBase
+
+    from .command_worker import YncaCommandWorker
+
+_T = TypeVar("_T")
+
+WARMUP_TIMEOUT = 10.0
+READY_PROBE_TIMEOUT = 1.0
+READY_PROBE_INTERVAL = 0.25
+
+
+@dataclass
+class WarmupMetrics:
+    warmups: int = 0
+    warmups_timed_out: int = 0
+    commands_held: int = 0
+    commands_collapsed: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _HeldCommand:
+    func: Callable[[], Awaitable[Any]]
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class YncaWarmupGate:
+    """Holds commands for a zone while it is powering on.
+
+    Receivers ignore some commands for a while after powering on a zone.
+    Commands issued during that time are held and released in order once the
+    receiver reported the zone is on and answers a readiness probe.
+    Held writes to the same function are collapsed into the last one.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        command_worker: YncaCommandWorker,
+        connection: ynca.YncaConnection,
+    ) -> None:
+        self._loop = loop
+        self._command_worker = command_worker
+        self._connection = connection
+        self._held: dict[str, dict[Hashable, _HeldCommand]] = {}
+        self._warmup_tasks: dict[str, asyncio.Task] = {}
+        # Futures waiting for a message, with the value they wait for or None for any value
+        self._waiters: dict[
+            tuple[str, str], dict[asyncio.Future[str | None], str | None]
+        ] = {}
+        self._stopped = False
+        self.metrics = WarmupMetrics()
+
+    def message_callback(
+        self,
+        status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        value: str | None,
+    ) -> None:
+        """Handle messages from the connection, can be called from any thread."""
+        if (
+            status is ynca.YncaProtocolStatus.OK
+            and subunit is not None
+            and function_ is not None
+            and (subunit, function_) in self._waiters
+        ):
+            self._loop.call_soon_threadsafe(
+                self._message_received, (subunit, function_), value
+            )
+
+    @callback
+    def _message_received(self, key: tuple[str, str], value: str | None) -> None:
+        for future, expected in list(self._waiters.get(key, {}).items()):
+            if not future.done() and expected in (None, value):
+                future.set_result(value)
+
+    def _wait_for_message(
+        self, subunit_id: str, function_name: str, value: str | None = None
+    ) -> asyncio.Future[str | None]:
+        future: asyncio.Future[str | None] = self._loop.create_future()
+        key = (subunit_id, function_name)
+        self._waiters.setdefault(key, {})[future] = value
+
+        def stop_waiting(future: asyncio.Future) -> None:
+            if (waiters := self._waiters.get(key)) is not None:
+                waiters.pop(future, None)
+                if not waiters:
+                    del self._waiters[key]
+
+        future.add_done_callback(stop_waiting)
+        return future
+
+    def is_warming_up(self, gate_id: str) -> bool:
+        return gate_id in self._held
+
+    @callback
+    def async_begin(
+        self, gate_id: str, subunit: SubunitBase, power_function_name: str
+    ) -> None:
+        """Start holding commands for gate_id, call before writing the power on command."""
+        if self.is_warming_up(gate_id):
+            return
+
+        self.metrics.warmups += 1
+        self._held[gate_id] = {}
+        # Start listening before the power on command is sent to not miss the report.
+        # Only On counts, the receiver can still report Standby for an earlier command
+        powered_on = self._wait_for_message(
+            subunit.id, power_function_name, ynca.Pwr.ON.value
+        )
+        self._warmup_tasks[gate_id] = self._loop.create_task(
+            self._async_warm_up(gate_id, subunit, powered_on),
+            name=f"yamaha_ynca warmup {gate_id}",
+        )
+
+    @callback
+    def async_abort(self, gate_id: str) -> None:
+        """Stop waiting for the warmup, e.g. when powering on failed. Held commands are released."""
+        if task := self._warmup_tasks.get(gate_id):
+            task.cancel()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop all warmups, the connection is going away. Held commands are cancelled."""
+        self._stopped = True
+        for task in self._warmup_tasks.values():
+            task.cancel()
+
+    async def _async_warm_up(
+        self,
+        gate_id: str,
+        subunit: SubunitBase,
+        powered_on: asyncio.Future[str | None],
+    ) -> None:
+        try:
+            async with asyncio.timeout(WARMUP_TIMEOUT):
+                await powered_on
+                await self._async_probe_ready(subunit)
+        except TimeoutError:
+            self.metrics.warmups_timed_out += 1
+            LOGGER.debug("Warmup of %s did not finish in time", gate_id)
+        except asyncio.CancelledError:
+            LOGGER.debug("Warmup of %s aborted", gate_id)
+        finally:
+            powered_on.cancel()
+            await self._async_release(gate_id)
+
+    async def _async_release(self, gate_id: str) -> None:
+        held = self._held[gate_id]
+        # Commands issued while releasing are added to the end, so order is kept
+        while held:
+            command = held.pop(next(iter(held)))
+            if self._stopped:
+                for future in command.futures:
+                    future.cancel()
+                continue
+            try:
+                result = await command.func()
+            except Exception as e:  # noqa: BLE001
+                for future in command.futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in command.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+        del self._held[gate_id]
+        del self._warmup_tasks[gate_id]
+
+    async def _async_probe_ready(self, subunit: SubunitBase) -> None:
+        # All subunits support AVAIL, it reports whether the subunit is ready
+        while True:
+            reply = self._wait_for_message(subunit.id, "AVAIL")
+            await self._command_worker.async_run(
+                self._connection.get, subunit.id, "AVAIL"
+            )
+            try:
+                async with asyncio.timeout(READY_PROBE_TIMEOUT):
+                    if await reply == ynca.Avail.READY.value:
+                        return
+            except TimeoutError:
+                continue
+            finally:
+                reply.cancel()
+            await asyncio.sleep(READY_PROBE_INTERVAL)
+
+    async def async_wait_ready(self, subunit: SubunitBase) -> None:
+        """Wait until the subunit answers the readiness probe, gives up silently after the warmup timeout."""
+        try:
+            async with asyncio.timeout(WARMUP_TIMEOUT):
+                await self._async_probe_ready(subunit)
+        except TimeoutError:
+            self.metrics.warmups_timed_out += 1
+            LOGGER.debug("Subunit %s did not become ready in time", subunit.id)
+
+    async def async_run(
+        self,
+        gate_id: str,
+        func: Callable[[], Awaitable[_T]],
+        key: Hashable | None = None,
+    ) -> _T:
+        """Run func, or hold it until the warmup of gate_id is done.
+
+        Held commands with the same key are collapsed, only the last one is run.
+        Commands without a key are never collapsed.
+        """
+        if (held := self._held.get(gate_id)) is None:
+            return await func()
+
+        self.metrics.commands_held += 1
+        if key is None:
+            key = object()
+
+        command = _HeldCommand(func)
+        if (collapsed := held.pop(key, None)) is not None:
+            self.metrics.commands_collapsed += 1
+            command.futures.extend(collapsed.futures)
+        future: asyncio.Future[_T] = self._loop.create_future()
+        command.futures.append(future)
+        held[key] = command
+
+        return await future
@@ -0,0 +1,294 @@
+"""Acknowledged writes to a Yamaha (YNCA) receiver."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import asdict, dataclass, field
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+import ynca
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ynca.subunit import SubunitBase
+
+    from .command_worker import YncaCommandWorker
+
+WRITE_ACK_TIMEOUT = 2.0
+# Receivers take a while to respond when powering on or switching inputs
+WRITE_ACK_TIMEOUTS = {
+    "INP": 5.0,
+    "PWR": 5.0,
+    "PWRB": 5.0,
+}
+WRITE_RETRIES = 2
+WRITE_RETRY_BACKOFF = 0.25
+
+
+@dataclass
+class WriteMetrics:
+    writes: int = 0
+    writes_acknowledged: int = 0
+    writes_failed: int = 0
+    write_retries: int = 0
+    writes_rolled_back: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PendingWrite:
+    subunit_id: str
+    function_name: str
+    value: Any
+    optimistic: bool
+    started: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "subunit": self.subunit_id,
+            "function": self.function_name,
+            "value": str(self.value),
+            "optimistic": self.optimistic,
+            "age": round(time.monotonic() - self.started, 3),
+        }
+
+
+class YncaWriteAcknowledger:
+    """Writes values to the receiver and waits for the receiver to report the function back.
+
+    The receiver drops commands now and then, e.g. while it is busy switching inputs.
+    Writes that are not acknowledged within the deadline of the function are retried
+    a limited number of times with backoff before giving up.
+
+    Optimistic writes show the written value until the receiver acknowledged it.
+    When the write fails the value is rolled back and requested from the receiver again.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        command_worker: YncaCommandWorker,
+        connection: ynca.YncaConnection,
+    ) -> None:
+        self._loop = loop
+        self._command_worker = command_worker
+        self._connection = connection
+        self._pending: dict[tuple[str, str], set[asyncio.Event]] = {}
+        self._pending_writes: dict[tuple[str, str], PendingWrite] = {}
+        self.metrics = WriteMetrics()
+
+    @property
+    def pending_writes(self) -> list[PendingWrite]:
+        return list(self._pending_writes.values())
+
+    def get_optimistic_value(
+        self, subunit: SubunitBase, attribute: str, default: Any
+    ) -> Any:
+        """Return the value of a pending optimistic write to the attribute, default otherwise."""
+        if (
+            pending_write := self._pending_writes.get((subunit.id, attribute))
+        ) is not None and pending_write.optimistic:
+            return pending_write.value
+        return default
+
+    def message_callback(
+        self,
+        status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        _value: str | None,
+    ) -> None:
+        """Handle messages from the connection, can be called from any thread."""
+        if (
+            status is ynca.YncaProtocolStatus.OK
+            and subunit is not None
+            and function_ is not None
+            and (subunit, function_) in self._pending
+        ):
+            self._loop.call_soon_threadsafe(self._acknowledge, (subunit, function_))
+
+    @callback
+    def _acknowledge(self, key: tuple[str, str]) -> None:
+        for event in self._pending.get(key, ()):
+            event.set()
+
+    async def async_write(
+        self,
+        subunit: SubunitBase,
+        attribute: str,
+        value: Any,
+        on_optimistic_update: Callable[[], None] | None = None,
+    ) -> None:
+        """Write value to the attribute of the subunit and wait until the receiver acknowledges it.
+
+        With on_optimistic_update the write is optimistic, it is called when the
+        optimistic value is applied and when it is reconciled or rolled back.
+
+        Raises HomeAssistantError when the write was not acknowledged after all retries.
+        """
+        function_name = _get_function_name(subunit, attribute)
+        pending_key = (subunit.id, attribute)
+        pending_write = PendingWrite(
+            subunit.id, function_name, value, on_optimistic_update is not None
+        )
+        self._pending_writes[pending_key] = pending_write
+        if on_optimistic_update:
+            on_optimistic_update()
+
+        key = (subunit.id, function_name)
+        acknowledged = self._register(key)
+        try:
+            await self._async_write(subunit, attribute, value, acknowledged)
+        except HomeAssistantError:
+            if on_optimistic_update:
+                self.metrics.writes_rolled_back += 1
+                # Value was not changed, but make sure it is in sync with the receiver
+                with contextlib.suppress(HomeAssistantError):
+                    await self._command_worker.async_run(
+                        self._connection.get, subunit.id, function_name
+                    )
+            raise
+        finally:
+            self._unregister(key, acknowledged)
+            # A newer write to the same attribute replaces the pending write
+            if self._pending_writes.get(pending_key) is pending_write:
+                del self._pending_writes[pending_key]
+            if on_optimistic_update:
+                on_optimistic_update()
+
+    async def async_write_batch(
+        self, writes: list[tuple[SubunitBase, str, Any]]
+    ) -> None:
+        """Write multiple values and wait until the receiver acknowledges all of them.
+
+        The values are written in one command so they are sent in one burst,
+        retries are done per write.
+
+        Raises HomeAssistantError when a write was not acknowledged after all retries.
+        """
+        registered = []
+        for subunit, attribute, value in writes:
+            function_name = _get_function_name(subunit, attribute)
+            self._pending_writes[(subunit.id, attribute)] = PendingWrite(
+                subunit.id, function_name, value, optimistic=False
+            )
+            # Register before sending to not miss fast acknowledgements
+            key = (subunit.id, function_name)
+            registered.append((key, self._register(key)))
+
+        try:
+            sent = asyncio.ensure_future(
+                self._command_worker.async_run(_write_all, writes)
+            )
+            results = await asyncio.gather(
+                *(
+                    self._async_write(*write, acknowledged, sent)
+                    for write, (_, acknowledged) in zip(writes, registered, strict=True)
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            for (subunit, attribute, _), (key, acknowledged) in zip(
+                writes, registered, strict=True
+            ):
+                self._unregister(key, acknowledged)
+                self._pending_writes.pop((subunit.id, attribute), None)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _register(self, key: tuple[str, str]) -> asyncio.Event:
+        acknowledged = asyncio.Event()
+        self._pending.setdefault(key, set()).add(acknowledged)
+        return acknowledged
+
+    def _unregister(self, key: tuple[str, str], acknowledged: asyncio.Event) -> None:
+        self._pending[key].discard(acknowledged)
+        if not self._pending[key]:
+            del self._pending[key]
+
+    async def _async_write(
+        self,
+        subunit: SubunitBase,
+        attribute: str,
+        value: Any,
+        acknowledged: asyncio.Event,
+        sent: asyncio.Future | None = None,
+    ) -> None:
+        function_name = _get_function_name(subunit, attribute)
+        timeout = WRITE_ACK_TIMEOUTS.get(function_name, WRITE_ACK_TIMEOUT)
+
+        self.metrics.writes += 1
+        for attempt in range(WRITE_RETRIES + 1):
+            if attempt > 0:
+                self.metrics.write_retries += 1
+                LOGGER.debug(
+                    "No acknowledge for %s:%s, retry %d",
+                    subunit.id,
+                    function_name,
+                    attempt,
+                )
+                await asyncio.sleep(WRITE_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+            if attempt == 0 and sent is not None:
+                # First attempt was sent as part of a batch
+                await sent
+            else:
+                acknowledged.clear()
+                await self._command_worker.async_run(setattr, subunit, attribute, value)
+
+            # Receivers do not report values that did not change
+            # so a value that is already current counts as acknowledged
+            if _is_current(subunit, attribute, value):
+                acknowledged.set()
+
+            try:
+                async with asyncio.timeout(timeout):
+                    await acknowledged.wait()
+            except TimeoutError:
+                continue
+
+            self.metrics.writes_acknowledged += 1
+            return
+
+        self.metrics.writes_failed += 1
+        msg = f"Receiver did not acknowledge {function_name} for {subunit.id} after {WRITE_RETRIES + 1} attempts"
+        raise HomeAssistantError(msg)
+
+
+def _write_all(writes: list[tuple[SubunitBase, str, Any]]) -> None:
+    for subunit, attribute, value in writes:
+        setattr(subunit, attribute, value)
+
+
+def _is_current(subunit: SubunitBase, attribute: str, value: Any) -> bool:
+    current = getattr(subunit, attribute, None)
+    if current == value:
+        return True
+    if current is None:
+        return False
+    # Compare as sent to the receiver, e.g. volumes are rounded to 0.5 dB steps
+    function = getattr(type(subunit), attribute, None)
+    if (converter := getattr(function, "converter", None)) is None:
+        return False
+    try:
+        return converter.to_str(current) == converter.to_str(value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _get_function_name(subunit: SubunitBase, attribute: str) -> str:
+    # Function names are mostly the uppercased attribute, but not always e.g. 2CHDECODER
+    function = getattr(type(subunit), attribute, None)
+    return getattr(function, "name", None) or attribute.upper()
@@ -0,0 +1 @@
+"""Benchmarks for the Yamaha (YNCA) integration."""
@@ -0,0 +1,54 @@
+"""Compare two benchmark result files.
+
+Usage: python -m tests.benchmarks.compare old.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Flatten nested results to a dict of dotted names and numeric values."""
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    old_values = flatten(old["results"])
+    new_values = flatten(new["results"])
+
+    lines = [f"{'benchmark':<60} {old['commit']!s:>12} {new['commit']!s:>12} change"]
+    for name in sorted(old_values.keys() | new_values.keys()):
+        old_value = old_values.get(name)
+        new_value = new_values.get(name)
+        if old_value is None or new_value is None:
+            lines.append(f"{name:<60} {old_value!s:>12} {new_value!s:>12}")
+            continue
+        change = f"{(new_value - old_value) / old_value:+.1%}" if old_value else ""
+        lines.append(f"{name:<60} {old_value:>12.6g} {new_value:>12.6g} {change}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    args = parser.parse_args()
+
+    old = json.loads(args.old.read_text())
+    new = json.loads(args.new.read_text())
+    print("\n".join(compare(old, new)))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Fixtures for benchmarking.
+
+Results are collected per test and written as JSON when the
+YNCA_BENCHMARK_OUTPUT environment variable contains a filename.
+Use `python -m tests.benchmarks.compare old.json new.json` to compare runs.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import typing
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock, patch
+
+from homeassistant.helpers.entity import Entity
+import pytest
+
+import ynca
+from ynca.function import FunctionMixinBase
+
+from ..conftest import INPUT_SUBUNITS, create_mock_zone
+from ..mock_yncaconnection import YncaConnectionMock
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+BENCHMARK_OUTPUT_ENV = "YNCA_BENCHMARK_OUTPUT"
+BENCHMARK_ITERATIONS_ENV = "YNCA_BENCHMARK_ITERATIONS"
+
+_results: dict[str, dict[str, Any]] = {}
+
+
+def benchmark_iterations(default: int = 100) -> int:
+    return int(os.environ.get(BENCHMARK_ITERATIONS_ENV, default))
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:  # noqa: ARG001
+    if not (output := os.environ.get(BENCHMARK_OUTPUT_ENV)) or not _results:
+        return
+
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "commit": _git_commit(),
+                "created": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "results": _results,
+            },
+            indent=2,
+            sort_keys=True,
+        )
+    )
+
+
+@pytest.fixture
+def benchmark_record(request: pytest.FixtureRequest) -> Callable[..., None]:
+    """Record named measurements for the current benchmark."""
+
+    def record(**values: Any) -> None:
+        _results.setdefault(request.node.name, {}).update(values)
+
+    return record
+
+
+@pytest.fixture
+def state_write_counter() -> Generator[Mock]:
+    """Count all entity state writes, regardless of how they were triggered."""
+    with patch.object(
+        Entity,
+        "_async_write_ha_state",
+        autospec=True,
+        side_effect=Entity._async_write_ha_state,  # noqa: SLF001
+    ) as write_mock:
+        yield write_mock
+
+
+def _disable_all_functions(subunit: Mock, subunit_class: type) -> None:
+    for attribute_name in dir(subunit_class):
+        if isinstance(getattr(subunit_class, attribute_name), FunctionMixinBase):
+            setattr(subunit, attribute_name, None)
+
+
+def create_full_zone(spec: type[ynca.subunits.zone.ZoneBase]) -> Mock:
+    """Create a zone with (nearly) all features available."""
+    zone = create_mock_zone(spec)
+    zone._connection = Mock()  # noqa: SLF001
+
+    zone.adaptivedrc = ynca.AdaptiveDrc.OFF
+    zone.enhancer = ynca.Enhancer.OFF
+    zone.exbass = ynca.ExBass.OFF
+    zone.hdmiout = ynca.HdmiOut.OUT1
+    zone.hpbass = 0.0
+    zone.hptreble = 0.0
+    zone.initvollvl = -30.0
+    zone.initvolmode = ynca.InitVolMode.ON
+    zone.inp = ynca.Input.HDMI1
+    zone.lipsynchdmiout1offset = 0
+    zone.lipsynchdmiout2offset = 0
+    zone.maxvol = 16.5
+    zone.mute = ynca.Mute.OFF
+    zone.puredirmode = ynca.PureDirMode.OFF
+    zone.pwr = ynca.Pwr.ON
+    zone.sleep = ynca.Sleep.OFF
+    zone.soundprg = ynca.SoundPrg.STANDARD
+    zone.spbass = 0.0
+    zone.sptreble = 0.0
+    zone.straight = ynca.Straight.OFF
+    zone.surroundai = ynca.SurroundAI.OFF
+    zone.threedcinema = ynca.ThreeDeeCinema.OFF
+    zone.twochdecoder = ynca.TwoChDecoder.DolbyPl2Movie
+    zone.vol = -40.0
+    zone.zonename = spec.id.value.capitalize()
+    for scene_id in range(1, 5):
+        setattr(zone, f"scene{scene_id}name", f"Scene {scene_id}")
+
+    if spec is ynca.subunits.zone.Main:
+        zone.dirmode = ynca.DirMode.OFF
+        zone.pwrb = ynca.PwrB.ON
+        zone.speakera = ynca.SpeakerA.ON
+        zone.speakerb = ynca.SpeakerB.OFF
+        zone.zonebavail = ynca.ZoneBAvail.READY
+        zone.zonebmute = ynca.ZoneBMute.OFF
+        zone.zonebname = "ZoneB"
+        zone.zonebvol = -40.0
+
+    return zone
+
+
+def create_full_input_subunit(attribute_name: str) -> Mock:
+    """Create an input subunit that is playing something."""
+    subunit_class = typing.get_args(
+        typing.get_type_hints(getattr(ynca.YncaApi, attribute_name).fget)["return"]
+    )[0]
+    subunit = Mock(spec=subunit_class)
+    subunit.id = subunit_class.id
+    _disable_all_functions(subunit, subunit_class)
+
+    values = {
+        "playbackinfo": ynca.PlaybackInfo.PLAY,
+        "artist": "Artist",
+        "album": "Album",
+        "song": "Song",
+        "station": "Station",
+        "elapsedtime": timedelta(minutes=1, seconds=23),
+        "totaltime": timedelta(minutes=4, seconds=56),
+        "repeat": ynca.Repeat.OFF,
+        "shuffle": ynca.Shuffle.OFF,
+        "band": ynca.BandTun.FM if attribute_name == "tun" else ynca.BandDab.DAB,
+        "fmfreq": 101.6,
+        "amfreq": 1080,
+        "dabservicelabel": "Service",
+        "dabdlslabel": "Label",
+    }
+    for name, value in values.items():
+        if hasattr(subunit_class, name):
+            setattr(subunit, name, value)
+
+    return subunit
+
+
+@pytest.fixture
+def full_ynca(mock_ynca: Mock) -> Mock:
+    """Create a mocked YNCA instance for a fully featured 4 zone receiver."""
+    mock_ynca.main = create_full_zone(ynca.subunits.zone.Main)
+    mock_ynca.zone2 = create_full_zone(ynca.subunits.zone.Zone2)
+    mock_ynca.zone3 = create_full_zone(ynca.subunits.zone.Zone3)
+    mock_ynca.zone4 = create_full_zone(ynca.subunits.zone.Zone4)
+
+    for input_subunit in INPUT_SUBUNITS:
+        setattr(mock_ynca, input_subunit, create_full_input_subunit(input_subunit))
+
+    for attribute in dir(mock_ynca.sys):
+        if attribute.startswith("inpname"):
+            setattr(mock_ynca.sys, attribute, attribute[7:].upper())
+
+    # Answer the AVAIL requests of the preset detection immediately
+    connection = YncaConnectionMock()
+    connection.get.side_effect = lambda subunit, function: (
+        connection.send_protocol_message(subunit, function, "Ready")
+        if function == "AVAIL"
+        else None
+    )
+    mock_ynca.get_raw_connection.return_value = connection
+
+    return mock_ynca
+
+
+def fire_update(subunit: Mock, function: str, value: Any) -> int:
+    """Invoke all update callbacks registered on a mocked subunit like ynca would.
+
+    Returns the number of callbacks invoked.
+    """
+    callbacks = [
+        call.args[0]
+        for call in subunit.register_update_callback.call_args_list
+        if call not in subunit.unregister_update_callback.call_args_list
+    ]
+    for callback in callbacks:
+        callback(function, value)
+    return len(callbacks)
@@ -0,0 +1,213 @@
+"""Benchmarks for setup time, update dispatching and state writes."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from homeassistant.const import Platform
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity_platform,
+    entity_registry as er,
+)
+import pytest
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
+    MockConfigEntry,
+)
+
+from custom_components import yamaha_ynca
+from custom_components.yamaha_ynca.media_player import YamahaYncaZone
+import ynca
+
+from ..conftest import setup_integration
+from .conftest import benchmark_iterations, fire_update
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from unittest.mock import Mock
+
+    from homeassistant.core import HomeAssistant
+
+# (subunit attribute, function, new value) as the ynca package would report them
+MESSAGES: list[tuple[str, str, Any]] = [
+    ("main", "PWR", ynca.Pwr.STANDBY),
+    ("main", "VOL", -39.5),
+    ("main", "MUTE", ynca.Mute.ON),
+    ("main", "INP", ynca.Input.NETRADIO),
+    ("main", "SOUNDPRG", ynca.SoundPrg.ENHANCED),
+    ("main", "STRAIGHT", ynca.Straight.ON),
+    ("zone2", "VOL", -39.5),
+    ("netradio", "PLAYBACKINFO", ynca.PlaybackInfo.PAUSE),
+    ("netradio", "SONG", "Other song"),
+    ("netradio", "ARTIST", "Other artist"),
+    ("netradio", "ELAPSEDTIME", timedelta(minutes=1, seconds=24)),
+    ("sys", "INPNAMEHDMI1", "Renamed"),
+]
+
+MIGRATION_RECEIVERS = 20
+MIGRATION_ENTITIES_PER_RECEIVER = 250
+
+pytestmark = pytest.mark.usefixtures("entity_registry_enabled_by_default")
+
+
+def _entities_of_type(hass: HomeAssistant, entity_type: type) -> list:
+    return [
+        entity
+        for platform in entity_platform.async_get_platforms(hass, yamaha_ynca.DOMAIN)
+        for entity in platform.entities.values()
+        if isinstance(entity, entity_type)
+    ]
+
+
+async def test_setup_entry(
+    hass: HomeAssistant,
+    full_ynca: Mock,
+    benchmark_record: Callable[..., None],
+) -> None:
+    start = time.perf_counter()
+    integration = await setup_integration(hass, full_ynca)
+    duration = time.perf_counter() - start
+
+    entities = er.async_entries_for_config_entry(
+        er.async_get(hass), integration.entry.entry_id
+    )
+    benchmark_record(setup_seconds=duration, entities=len(entities))
+
+
+async def test_update_fanout(
+    hass: HomeAssistant,
+    full_ynca: Mock,
+    state_write_counter: Mock,
+    benchmark_record: Callable[..., None],
+) -> None:
+    await setup_integration(hass, full_ynca)
+
+    for attribute_name, function, value in MESSAGES:
+        subunit = getattr(full_ynca, attribute_name)
+        setattr(subunit, function.lower(), value)
+
+        state_write_counter.reset_mock()
+        # Updates arrive on the ynca reader thread
+        callbacks = await hass.async_add_executor_job(
+            fire_update, subunit, function, value
+        )
+        await hass.async_block_till_done()
+
+        benchmark_record(
+            **{
+                f"{attribute_name}_{function}": {
+                    "callbacks": callbacks,
+                    "state_writes": state_write_counter.call_count,
+                }
+            }
+        )
+
+
+async def test_zone_state_write_cpu(
+    hass: HomeAssistant,
+    full_ynca: Mock,
+    benchmark_record: Callable[..., None],
+) -> None:
+    await setup_integration(hass, full_ynca)
+    zones = _entities_of_type(hass, YamahaYncaZone)
+
+    iterations = benchmark_iterations()
+    start = time.process_time()
+    for _ in range(iterations):
+        for zone in zones:
+            zone.async_write_ha_state()
+    duration = time.process_time() - start
+
+    benchmark_record(
+        cpu_microseconds_per_write=duration / (iterations * len(zones)) * 1e6
+    )
+
+
+async def test_memory_per_entity(
+    hass: HomeAssistant,
+    full_ynca: Mock,
+    benchmark_record: Callable[..., None],
+) -> None:
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        integration = await setup_integration(hass, full_ynca)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    entities = er.async_entries_for_config_entry(
+        er.async_get(hass), integration.entry.entry_id
+    )
+    benchmark_record(
+        bytes_per_entity=(current - baseline) / len(entities),
+        peak_bytes=peak - baseline,
+    )
+
+
+async def test_migrate_entries(
+    hass: HomeAssistant,
+    benchmark_record: Callable[..., None],
+) -> None:
+    """Migrate many receivers from the oldest version with well filled registries."""
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+
+    entries = []
+    for receiver in range(MIGRATION_RECEIVERS):
+        entry = MockConfigEntry(
+            domain=yamaha_ynca.DOMAIN,
+            entry_id=f"entry_id_{receiver}",
+            title="RX-A810",
+            data={"serial_port": f"192.168.1.{receiver}:50000"},
+            options={"hidden_inputs_MAIN": ["HDMI1"]},
+            version=1,
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(yamaha_ynca.DOMAIN, entry.entry_id)},
+        )
+        for entity in range(MIGRATION_ENTITIES_PER_RECEIVER):
+            entity_registry.async_get_or_create(
+                Platform.SENSOR,
+                yamaha_ynca.DOMAIN,
+                f"{entry.entry_id}_{entity}",
+                config_entry=entry,
+            )
+        entity_registry.async_get_or_create(
+            Platform.SELECT,
+            yamaha_ynca.DOMAIN,
+            f"{entry.entry_id}_MAIN_twochdecoder",
+            config_entry=entry,
+        )
+
+    with (
+        patch.object(
+            hass.config_entries,
+            "async_update_entry",
+            wraps=hass.config_entries.async_update_entry,
+        ) as update_entry_mock,
+        patch(
+            "custom_components.yamaha_ynca.registry_index.er.async_entries_for_config_entry",
+            wraps=er.async_entries_for_config_entry,
+        ) as registry_scan_mock,
+    ):
+        start = time.perf_counter()
+        for entry in entries:
+            assert await yamaha_ynca.async_migrate_entry(hass, entry)
+        duration = time.perf_counter() - start
+
+    assert all(entry.version == 7 and entry.minor_version == 8 for entry in entries)
+    benchmark_record(
+        seconds_per_entry=duration / len(entries),
+        config_entry_writes_per_entry=update_entry_mock.call_count / len(entries),
+        registry_scans_per_entry=registry_scan_mock.call_count / len(entries),
+        entities=len(entity_registry.entities),
+    )
@@ -0,0 +1,145 @@
+"""Soak test that floods all zones with playback metadata updates.
+
+By default it only runs briefly as part of the normal test run. Use the
+YNCA_SOAK_SECONDS and YNCA_SOAK_RATE (messages per second) environment
+variables to run it for minutes at a time, e.g.
+
+    YNCA_SOAK_SECONDS=300 YNCA_SOAK_RATE=500 pytest tests/benchmarks/test_soak.py --no-cov
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import itertools
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import ynca
+
+from ..conftest import setup_integration
+from .conftest import fire_update
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from unittest.mock import Mock
+
+    from homeassistant.core import HomeAssistant
+
+SOAK_SECONDS_ENV = "YNCA_SOAK_SECONDS"
+SOAK_RATE_ENV = "YNCA_SOAK_RATE"
+
+LAG_PROBE_INTERVAL = 0.01
+
+# Each zone streams from a different network source
+ZONE_INPUTS = {
+    "main": ("netradio", ynca.Input.NETRADIO),
+    "zone2": ("spotify", ynca.Input.SPOTIFY),
+    "zone3": ("server", ynca.Input.SERVER),
+    "zone4": ("usb", ynca.Input.USB),
+}
+
+
+def _updates(full_ynca: Mock) -> Iterator[tuple[Mock, str, Any]]:
+    """Generate updates like receivers streaming network audio would send them."""
+    subunits = [getattr(full_ynca, name) for name, _ in ZONE_INPUTS.values()]
+    for count in itertools.count():
+        for subunit in subunits:
+            if count % 10 == 0:
+                yield subunit, "PLAYBACKINFO", ynca.PlaybackInfo.PLAY
+            elif count % 5 == 0:
+                yield subunit, "ARTIST", f"Artist {count}"
+            elif count % 5 == 1:
+                yield subunit, "SONG", f"Song {count}"
+            else:
+                yield subunit, "ELAPSEDTIME", timedelta(seconds=count)
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    # quantiles needs at least 2 samples
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percentile - 1]
+
+
+async def _measure_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+def _flood(full_ynca: Mock, rate: float, duration: float, sent: list[int]) -> None:
+    """Send updates from a separate thread, like the ynca reader thread does."""
+    interval = 1 / rate
+    start = time.monotonic()
+    for count, (subunit, function, value) in enumerate(_updates(full_ynca)):
+        next_send = start + count * interval
+        if next_send - start >= duration:
+            break
+        if (delay := next_send - time.monotonic()) > 0:
+            time.sleep(delay)
+        setattr(subunit, function.lower(), value)
+        fire_update(subunit, function, value)
+        sent[0] = count + 1
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_metadata_flood(
+    hass: HomeAssistant,
+    full_ynca: Mock,
+    state_write_counter: Mock,
+    benchmark_record: Callable[..., None],
+) -> None:
+    duration = float(os.environ.get(SOAK_SECONDS_ENV, "2"))
+    rate = float(os.environ.get(SOAK_RATE_ENV, "200"))
+
+    for zone_name, (_, ynca_input) in ZONE_INPUTS.items():
+        zone = getattr(full_ynca, zone_name)
+        zone.inp = ynca_input
+    await setup_integration(hass, full_ynca)
+    state_write_counter.reset_mock()
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    lag_task = hass.async_create_background_task(
+        _measure_loop_lag(lags, stop), "loop lag probe"
+    )
+
+    sent = [0]
+    blocks_before = sys.getallocatedblocks()
+    maxrss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.monotonic()
+    await hass.async_add_executor_job(_flood, full_ynca, rate, duration, sent)
+    await hass.async_block_till_done()
+    elapsed = time.monotonic() - start
+
+    stop.set()
+    await lag_task
+
+    benchmark_record(
+        seconds=elapsed,
+        messages=sent[0],
+        messages_per_second=sent[0] / elapsed,
+        state_writes_per_second=state_write_counter.call_count / elapsed,
+        loop_lag_ms={
+            "p50": _percentile(lags, 50) * 1000,
+            "p95": _percentile(lags, 95) * 1000,
+            "p99": _percentile(lags, 99) * 1000,
+            "max": max(lags, default=0.0) * 1000,
+        },
+        allocated_blocks_growth=sys.getallocatedblocks() - blocks_before,
+        maxrss_growth_kib=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        - maxrss_before,
+    )
+
+    assert sent[0] > 0
+    assert state_write_counter.call_count > 0
@@ -13,11 +13,22 @@ from pytest_homeassistant_custom_component.common import (  # type: ignore[impor
 )
 
 from custom_components import yamaha_ynca
+from custom_components.yamaha_ynca.browse_cache import YncaBrowseCache
+from custom_components.yamaha_ynca.command_worker import YncaCommandWorker
 from custom_components.yamaha_ynca.helpers import DomainEntryData
+from custom_components.yamaha_ynca.refresh_scheduler import YncaRefreshScheduler
+from custom_components.yamaha_ynca.registry_index import YncaRegistryIndex
+from custom_components.yamaha_ynca.scene_learner import YncaSceneLearner
+from custom_components.yamaha_ynca.update_filter import YncaUpdateFilter
+from custom_components.yamaha_ynca.warmup_gate import YncaWarmupGate
+from custom_components.yamaha_ynca.write_acknowledger import YncaWriteAcknowledger
 import ynca
+from ynca.protocol import YncaProtocol
+
+from .ynca_simulator import YncaSimulator
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator
+    from collections.abc import AsyncGenerator, Callable, Generator
 
     from homeassistant.const import Platform
     from homeassistant.core import HomeAssistant
@@ -50,6 +61,22 @@ INPUT_SUBUNITS = [
 ]
 
 
+@pytest.fixture
+def no_command_spacing() -> Generator[None]:
+    # Speeds up initialize a lot. Not usable for connection_check since keep-alive
+    # replies can then get mixed up with the MODELNAME response.
+    with patch.object(YncaProtocol, "COMMAND_SPACING", 0):
+        yield
+
+
+@pytest.fixture
+async def simulator(
+    socket_enabled: None,  # noqa: ARG001
+) -> AsyncGenerator[YncaSimulator]:
+    async with YncaSimulator() as simulator:
+        yield simulator
+
+
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(
     enable_custom_integrations: pytest.Fixture,  # noqa: ARG001
@@ -272,9 +299,23 @@ async def setup_integration(
     entry = create_mock_config_entry(
         modelname=mock_ynca.sys.modelname, zones=zones, serial_url=serial_url
     )
+    command_worker = YncaCommandWorker(MODELNAME)
     entry.runtime_data = DomainEntryData(
         api=mock_ynca,
         initialization_events=[],
+        command_worker=command_worker,
+        registry_index=YncaRegistryIndex(hass, entry.entry_id),
+        entity_plan={},
+        write_acknowledger=YncaWriteAcknowledger(
+            hass.loop, command_worker, mock_ynca.get_raw_connection()
+        ),
+        warmup_gate=YncaWarmupGate(
+            hass.loop, command_worker, mock_ynca.get_raw_connection()
+        ),
+        refresh_scheduler=YncaRefreshScheduler(hass.loop, command_worker, mock_ynca),
+        scene_learner=YncaSceneLearner(hass, entry.entry_id),
+        update_filter=YncaUpdateFilter(hass.loop, mock_ynca.get_raw_connection()),
+        browse_cache=YncaBrowseCache(mock_ynca),
     )
     entry.add_to_hass(hass)
 
@@ -287,7 +328,14 @@ async def setup_integration(
             on_disconnect = args[1]
             return DEFAULT
 
-        with patch("ynca.YncaApi", return_value=mock_ynca, side_effect=side_effect):
+        with (
+            patch("ynca.YncaApi", return_value=mock_ynca, side_effect=side_effect),
+            patch(
+                "custom_components.yamaha_ynca.YncaSocketApi",
+                return_value=mock_ynca,
+                side_effect=side_effect,
+            ),
+        ):
             await hass.config_entries.async_setup(entry.entry_id)
             await hass.async_block_till_done()
 
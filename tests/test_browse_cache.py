@@ -0,0 +1,103 @@
+"""Test the Yamaha (YNCA) browse cache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, create_autospec, patch
+
+from custom_components.yamaha_ynca.browse_cache import YncaBrowseCache
+from custom_components.yamaha_ynca.input_helpers import InputHelper
+from custom_components.yamaha_ynca.media_player import YamahaYncaZone
+import ynca
+
+from .conftest import create_mock_zone, setup_integration
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+async def test_browse_trees_shared_by_zones(
+    hass: HomeAssistant, mock_ynca: Mock
+) -> None:
+    mock_ynca.tun = create_autospec(ynca.subunits.tun.Tun)
+    mock_ynca.tun.id = ynca.subunit.Subunit.TUN
+    integration = await setup_integration(hass, mock_ynca, skip_setup=True)
+    browse_cache = integration.entry.runtime_data.browse_cache
+
+    zones = []
+    for zone_class in (ynca.subunits.zone.Main, ynca.subunits.zone.Zone2):
+        zone = YamahaYncaZone(
+            "ReceiverUniqueId", mock_ynca, create_mock_zone(zone_class), ["TUNER"], []
+        )
+        zone.platform = Mock(config_entry=integration.entry)
+        zones.append(zone)
+
+    with patch.object(
+        InputHelper, "get_source_mapping", wraps=InputHelper.get_source_mapping
+    ) as get_source_mapping:
+        root = await zones[0].async_browse_media(None, None)
+        assert await zones[1].async_browse_media(None, "presets") is root
+        presets = await zones[0].async_browse_media(None, "tun:presets")
+        assert await zones[1].async_browse_media(None, "tun:presets") is presets
+
+    # Source mapping is only determined once for all zones and trees
+    assert get_source_mapping.call_count == 1
+    assert [child.title for child in root.children] == ["TUNER"]
+    assert presets.title == "TUNER"
+    assert browse_cache.metrics.as_dict() == {
+        "hits": 2,
+        "misses": 2,
+        "invalidations": 0,
+    }
+
+    # Zones with another selection of inputs get their own root
+    zones[1]._selected_inputs = ["HDMI1"]  # noqa: SLF001
+    other_root = await zones[1].async_browse_media(None, None)
+    assert other_root is not root
+    assert other_root.children == []
+
+
+async def test_browse_trees_invalidated_on_input_name_change(
+    mock_ynca: Mock,
+) -> None:
+    mock_ynca.dab = create_autospec(ynca.subunits.dab.Dab)
+    mock_ynca.dab.id = ynca.subunit.Subunit.DAB
+    mock_ynca.sys.inpnamehdmi1 = "Old name"
+    browse_cache = YncaBrowseCache(mock_ynca)
+
+    root = browse_cache.get_root(["HDMI1"], Mock())
+    dab_presets = browse_cache.get_presetlist("dab:dabpresets", Mock())
+    assert browse_cache.source_mapping[ynca.Input.HDMI1] == "Old name"
+
+    # Reports that do not change names keep the trees
+    browse_cache.update_sys_callback("INPNAMEHDMI1", "Old name")
+    browse_cache.update_sys_callback("PWR", ynca.Pwr.ON)
+    assert browse_cache.get_root(["HDMI1"], Mock()) is root
+
+    mock_ynca.sys.inpnamehdmi1 = "New name"
+    browse_cache.update_sys_callback("INPNAMEHDMI1", "New name")
+    assert browse_cache.source_mapping[ynca.Input.HDMI1] == "New name"
+    assert browse_cache.get_root(["HDMI1"], Mock()) is not root
+    # DAB preset lists have fixed names
+    assert browse_cache.get_presetlist("dab:dabpresets", Mock()) is dab_presets
+    assert browse_cache.metrics.invalidations == 1
+
+
+def test_unknown_presetlists_not_cached(mock_ynca: Mock) -> None:
+    mock_ynca.tun = create_autospec(ynca.subunits.tun.Tun)
+    mock_ynca.usb = None
+    browse_cache = YncaBrowseCache(mock_ynca)
+
+    for media_content_id in ["usb:presets", "tun:dabpresets", "tun:mem", "whatever"]:
+        build = Mock()
+        browse_cache.get_presetlist(media_content_id, build)
+        browse_cache.get_presetlist(media_content_id, build)
+        assert build.call_count == 2
+
+    presets = browse_cache.get_presetlist("tun:presets", Mock())
+    assert browse_cache.get_presetlist("tun:presets", Mock()) is presets
+    assert browse_cache.metrics.as_dict() == {
+        "hits": 1,
+        "misses": 1,
+        "invalidations": 0,
+    }
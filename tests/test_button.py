@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from unittest.mock import Mock, call, patch
 
+from homeassistant.helpers import entity_registry as er
+
 from custom_components import yamaha_ynca
 from custom_components.yamaha_ynca.button import (
     YamahaYncaSceneButton,
@@ -136,3 +138,51 @@ async def test_button_entity_behavior(mock_zone: Mock) -> None:
     # Cleanup on exit
     await entity.async_will_remove_from_hass()
     mock_zone.unregister_update_callback.assert_called_once_with(callback)
+
+
+async def test_button_entities_follow_number_of_scenes_option(
+    hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main
+    mock_ynca.main.scene1name = "SCENE_1"
+    mock_ynca.main.scene2name = "SCENE_2"
+
+    integration = await setup_integration(hass, mock_ynca)
+    entity_registry = er.async_get(hass)
+
+    def scene_button_entity_ids() -> list[str]:
+        return sorted(
+            entity.entity_id
+            for entity in er.async_entries_for_config_entry(
+                entity_registry, integration.entry.entry_id
+            )
+            if entity.domain == "button"
+        )
+
+    assert scene_button_entity_ids() == [
+        "button.modelname_main_scene_1",
+        "button.modelname_main_scene_2",
+    ]
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={"MAIN": {yamaha_ynca.const.CONF_NUMBER_OF_SCENES: 3}},
+    )
+    await hass.async_block_till_done()
+
+    assert scene_button_entity_ids() == [
+        "button.modelname_main_scene_1",
+        "button.modelname_main_scene_2",
+        "button.modelname_main_scene_3",
+    ]
+    assert hass.states.get("button.modelname_main_scene_3") is not None
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={"MAIN": {yamaha_ynca.const.CONF_NUMBER_OF_SCENES: 1}},
+    )
+    await hass.async_block_till_done()
+
+    assert scene_button_entity_ids() == ["button.modelname_main_scene_1"]
+    assert hass.states.get("button.modelname_main_scene_2") is None
+    assert hass.states.get("button.modelname_main_scene_3") is None
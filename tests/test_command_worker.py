@@ -0,0 +1,87 @@
+"""Test the Yamaha (YNCA) command worker."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.yamaha_ynca.command_worker import YncaCommandWorker
+
+
+async def test_command_worker_runs_commands_on_own_thread() -> None:
+    worker = YncaCommandWorker("Receiver")
+    worker.start()
+
+    result = await worker.async_run(lambda: threading.current_thread().name)
+    assert result == "yamaha_ynca Receiver"
+
+    await worker.async_stop()
+    assert not worker.is_running
+    assert worker.metrics.commands_executed == 1
+
+
+async def test_command_worker_runs_commands_in_order() -> None:
+    worker = YncaCommandWorker("Receiver")
+    worker.start()
+
+    executed = []
+    await asyncio.gather(*(worker.async_run(executed.append, i) for i in range(10)))
+    assert executed == list(range(10))
+    assert worker.metrics.max_queue_depth >= 1
+
+    await worker.async_stop()
+
+
+async def test_command_worker_exception() -> None:
+    worker = YncaCommandWorker("Receiver")
+    worker.start()
+
+    def fail() -> None:
+        msg = "Failed"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="Failed"):
+        await worker.async_run(fail)
+    assert worker.metrics.commands_failed == 1
+
+    # Worker keeps running after a failure
+    assert await worker.async_run(lambda: 42) == 42
+
+    await worker.async_stop()
+
+
+async def test_command_worker_timeout_and_full_queue() -> None:
+    worker = YncaCommandWorker("Receiver", max_queue_size=1)
+    worker.start()
+
+    release = threading.Event()
+
+    # Hanging receiver
+    with pytest.raises(HomeAssistantError):
+        await worker.async_run(release.wait, timeout=0.01)
+    assert worker.metrics.commands_timed_out == 1
+
+    # Only 1 command may be pending
+    pending = asyncio.ensure_future(worker.async_run(lambda: "pending"))
+    await asyncio.sleep(0)
+    with pytest.raises(HomeAssistantError):
+        await worker.async_run(lambda: "rejected")
+    assert worker.metrics.commands_rejected == 1
+
+    release.set()
+    assert await pending == "pending"
+
+    await worker.async_stop()
+
+
+async def test_command_worker_not_running() -> None:
+    worker = YncaCommandWorker("Receiver")
+
+    with pytest.raises(HomeAssistantError):
+        await worker.async_run(lambda: None)
+
+    # Stopping a worker that is not running is fine
+    await worker.async_stop()
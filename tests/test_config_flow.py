@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import ipaddress
 from typing import TYPE_CHECKING
 from unittest.mock import Mock, patch
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
 
 from custom_components import yamaha_ynca
+from custom_components.yamaha_ynca.discovery import (
+    YncaProbeResult,
+    YncaSerialProbeResult,
+)
 from tests.conftest import setup_integration
 import ynca
 
@@ -296,3 +302,263 @@ async def test_reconfigure_network(hass: HomeAssistant, mock_ynca: Mock) -> None
     )
     assert result2["type"] == FlowResultType.ABORT
     assert result2["reason"] == "reconfigure_successful"
+
+
+async def test_scan_network(hass: HomeAssistant, mock_ynca: Mock) -> None:
+    await setup_integration(hass, mock_ynca, serial_url="socket://192.168.1.2:50000")
+
+    result = await hass.config_entries.flow.async_init(
+        yamaha_ynca.DOMAIN, context={"source": "scan"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "scan"
+
+    # Invalid network
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            yamaha_ynca.const.CONF_SCAN_NETWORK: "10.0.0.0/8",
+            yamaha_ynca.const.CONF_PORT: 50000,
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_scan_network"}
+
+    # Nothing found
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_scan_network",
+        return_value=[],
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                yamaha_ynca.const.CONF_SCAN_NETWORK: "192.168.1.0/24",
+                yamaha_ynca.const.CONF_PORT: 50000,
+            },
+        )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "no_receivers_found"}
+
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_scan_network",
+        return_value=[
+            YncaProbeResult("192.168.1.3", 50000, "RX-V671"),
+            YncaProbeResult("192.168.1.4", 50000, "RX-V473"),
+        ],
+    ) as mock_scan:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                yamaha_ynca.const.CONF_SCAN_NETWORK: "192.168.1.0/24",
+                yamaha_ynca.const.CONF_PORT: 50000,
+            },
+        )
+    # Already configured receivers are not probed
+    mock_scan.assert_called_once_with(
+        ipaddress.ip_network("192.168.1.0/24"), 50000, {"192.168.1.2"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "scan_results"
+    assert result["data_schema"].schema[
+        yamaha_ynca.const.CONF_SERIAL_URL
+    ].container == {
+        "socket://192.168.1.3:50000": "RX-V671 (192.168.1.3)",
+        "socket://192.168.1.4:50000": "RX-V473 (192.168.1.4)",
+    }
+
+    with (
+        patch(
+            "ynca.YncaApi.connection_check",
+            return_value=ynca.YncaConnectionCheckResult("RX-V671", ["MAIN"]),
+        ),
+        patch(
+            "custom_components.yamaha_ynca.async_setup_entry",
+            return_value=True,
+        ) as mock_setup_entry,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {yamaha_ynca.const.CONF_SERIAL_URL: "socket://192.168.1.3:50000"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "RX-V671"
+    assert result["data"] == {
+        yamaha_ynca.const.CONF_SERIAL_URL: "socket://192.168.1.3:50000",
+        yamaha_ynca.const.DATA_ZONES: ["MAIN"],
+        yamaha_ynca.const.DATA_MODELNAME: "RX-V671",
+    }
+    assert len(mock_setup_entry.mock_calls) == 1
+
+
+def create_ssdp_discovery_info(host: str = "192.168.1.3") -> SsdpServiceInfo:
+    return SsdpServiceInfo(
+        ssdp_usn="uuid:9ab0c000-f668-11de-9976-00a0de000000::upnp:rootdevice",
+        ssdp_st="upnp:rootdevice",
+        ssdp_location=f"http://{host}:8080/MediaRenderer/desc.xml",
+        ssdp_udn="uuid:9ab0c000-f668-11de-9976-00a0de000000",
+        upnp={
+            "manufacturer": "Yamaha Corporation",
+            "modelName": "RX-V671",
+            "deviceType": "urn:schemas-upnp-org:device:MediaRenderer:1",
+        },
+    )
+
+
+async def test_ssdp_discovery(hass: HomeAssistant) -> None:
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_probe_receiver_cached",
+        return_value=YncaProbeResult("192.168.1.3", 50000, "RX-V671", ("MAIN",)),
+    ) as mock_probe:
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=create_ssdp_discovery_info(),
+        )
+    mock_probe.assert_called_once_with(hass, "192.168.1.3")
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "ssdp_confirm"
+    assert result["description_placeholders"] == {
+        "modelname": "RX-V671",
+        "host": "192.168.1.3",
+    }
+
+    # Same receiver announced again while flow is in progress
+    result2 = await hass.config_entries.flow.async_init(
+        yamaha_ynca.DOMAIN,
+        context={"source": config_entries.SOURCE_SSDP},
+        data=create_ssdp_discovery_info(),
+    )
+    assert result2["type"] == FlowResultType.ABORT
+    assert result2["reason"] == "already_in_progress"
+
+    with patch(
+        "custom_components.yamaha_ynca.async_setup_entry",
+        return_value=True,
+    ) as mock_setup_entry:
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+        await hass.async_block_till_done()
+
+    # No connection check needed, probe provided all data
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "RX-V671"
+    assert result["data"] == {
+        yamaha_ynca.const.CONF_SERIAL_URL: "socket://192.168.1.3:50000",
+        yamaha_ynca.const.DATA_ZONES: ["MAIN"],
+        yamaha_ynca.const.DATA_MODELNAME: "RX-V671",
+    }
+    assert len(mock_setup_entry.mock_calls) == 1
+
+    # Announcements of the added receiver are ignored without probing
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_probe_receiver_cached",
+    ) as mock_probe:
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=create_ssdp_discovery_info(),
+        )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    mock_probe.assert_not_called()
+
+
+async def test_ssdp_discovery_already_configured_manually(
+    hass: HomeAssistant, mock_ynca: Mock
+) -> None:
+    await setup_integration(hass, mock_ynca, serial_url="socket://192.168.1.3:50000")
+
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_probe_receiver_cached",
+    ) as mock_probe:
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=create_ssdp_discovery_info(),
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    mock_probe.assert_not_called()
+
+
+async def test_ssdp_discovery_not_ynca(hass: HomeAssistant) -> None:
+    with patch(
+        "custom_components.yamaha_ynca.config_flow.async_probe_receiver_cached",
+        return_value=None,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=create_ssdp_discovery_info(),
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "not_ynca_device"
+
+
+async def test_serial_detect(hass: HomeAssistant, mock_ynca: Mock) -> None:
+    await setup_integration(hass, mock_ynca, serial_url="/dev/ttyUSB0")
+
+    with (
+        patch(
+            "custom_components.yamaha_ynca.config_flow.list_serial_ports",
+            return_value=["/dev/ttyUSB0", "/dev/ttyUSB1", "/dev/ttyUSB2"],
+        ),
+        patch(
+            "custom_components.yamaha_ynca.config_flow.async_probe_serial_ports",
+            return_value=[YncaSerialProbeResult("/dev/ttyUSB2", "RX-V671", ("MAIN",))],
+        ) as mock_probe,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN, context={"source": "serial_detect"}
+        )
+
+    # Port in use by the integration is not probed
+    mock_probe.assert_called_once_with(hass, ["/dev/ttyUSB1", "/dev/ttyUSB2"])
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "serial_detect_results"
+    assert result["data_schema"].schema[
+        yamaha_ynca.const.CONF_SERIAL_URL
+    ].container == {"/dev/ttyUSB2": "RX-V671 (/dev/ttyUSB2)"}
+
+    with (
+        patch(
+            "ynca.YncaApi.connection_check",
+            return_value=ynca.YncaConnectionCheckResult("RX-V671", ["MAIN"]),
+        ),
+        patch(
+            "custom_components.yamaha_ynca.async_setup_entry",
+            return_value=True,
+        ),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {yamaha_ynca.const.CONF_SERIAL_URL: "/dev/ttyUSB2"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][yamaha_ynca.const.CONF_SERIAL_URL] == "/dev/ttyUSB2"
+
+
+async def test_serial_detect_nothing_found(hass: HomeAssistant) -> None:
+    with (
+        patch(
+            "custom_components.yamaha_ynca.config_flow.list_serial_ports",
+            return_value=["/dev/ttyUSB0"],
+        ),
+        patch(
+            "custom_components.yamaha_ynca.config_flow.async_probe_serial_ports",
+            return_value=[],
+        ),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            yamaha_ynca.DOMAIN, context={"source": "serial_detect"}
+        )
+
+    # Falls back to manual input
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "serial"
+    assert result["errors"] == {"base": "no_serial_receivers_found"}
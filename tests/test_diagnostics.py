@@ -27,3 +27,27 @@ async def test_diagnostics(hass: HomeAssistant, mock_ynca: Mock) -> None:
     assert "initialization" in diagnostics["communication"]
     assert "history" in diagnostics["communication"]
     assert diagnostics["communication"]["history"] == ["testdata"]
+
+    assert "command_worker" in diagnostics
+    assert diagnostics["command_worker"]["commands_executed"] >= 1
+    assert diagnostics["command_worker"]["queue_depth"] == 0
+
+    assert "writes" in diagnostics
+    assert diagnostics["writes"]["writes_failed"] == 0
+    assert diagnostics["writes"]["pending"] == []
+
+    assert "warmup" in diagnostics
+    assert diagnostics["warmup"]["warmups"] == 0
+
+    assert "refreshes" in diagnostics
+    assert diagnostics["refreshes"]["refreshes_sent"] == 0
+
+    assert "scenes" in diagnostics
+    assert diagnostics["scenes"]["recalls"] == 0
+    assert diagnostics["scenes"]["learned"] == {}
+
+    assert "updates" in diagnostics
+    assert diagnostics["updates"]["updates_suppressed"] == 0
+
+    assert "browse" in diagnostics
+    assert diagnostics["browse"]["misses"] == 0
@@ -0,0 +1,254 @@
+"""Test discovery of Yamaha (YNCA) receivers."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import select
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.yamaha_ynca.discovery import (
+    PROBE_CACHE_TIME,
+    YncaProbeResult,
+    YncaSerialProbeResult,
+    async_probe_receiver,
+    async_probe_receiver_cached,
+    async_probe_serial_ports,
+    async_scan_network,
+    parse_scan_network,
+    probe_serial_port,
+)
+
+from .ynca_simulator import YncaSimulator, YncaSimulatorConfig
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture
+async def stand_in_server(
+    socket_enabled: None,  # noqa: ARG001
+) -> AsyncGenerator[Callable[[bytes | None], Awaitable[int]]]:
+    """Start local TCP servers that answer anything with a fixed response or nothing at all."""
+    servers: list[asyncio.Server] = []
+
+    async def start(response: bytes | None) -> int:
+        async def handle_client(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await reader.readline()
+            if response is not None:
+                writer.write(response)
+                await writer.drain()
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(handle_client, "127.0.0.1", 0)
+        servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    yield start
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+YNCA_RESPONSE = (
+    b"@SYS:MODELNAME=RX-V671\r\n@MAIN:AVAIL=Ready\r\n@SYS:VERSION=1.0/2.0\r\n"
+)
+
+
+@pytest.fixture
+def pty_port() -> Generator[Callable[[bytes | None], str]]:
+    """Create pty pairs standing in for serial ports that answer anything with a fixed response or nothing at all."""
+    stop = threading.Event()
+    threads: list[threading.Thread] = []
+    fds: list[int] = []
+
+    def respond(master_fd: int, response: bytes | None) -> None:
+        while not stop.is_set():
+            readable, _, _ = select.select([master_fd], [], [], 0.01)
+            if readable and os.read(master_fd, 1024) and response is not None:
+                os.write(master_fd, response)
+                response = None
+
+    def create(response: bytes | None) -> str:
+        master_fd, slave_fd = os.openpty()
+        fds.extend([master_fd, slave_fd])
+        thread = threading.Thread(target=respond, args=(master_fd, response))
+        thread.start()
+        threads.append(thread)
+        return os.ttyname(slave_fd)
+
+    yield create
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    for fd in fds:
+        os.close(fd)
+
+
+def test_probe_serial_port(pty_port: Callable[[bytes | None], str]) -> None:
+    serial_url = pty_port(YNCA_RESPONSE)
+    assert probe_serial_port(serial_url) == YncaSerialProbeResult(
+        serial_url, "RX-V671", ("MAIN",)
+    )
+
+    assert probe_serial_port(pty_port(None), probe_timeout=0.1) is None
+    assert probe_serial_port(pty_port(b"garbage\r\n"), probe_timeout=0.1) is None
+    assert probe_serial_port("/dev/does_not_exist") is None
+
+
+async def test_probe_serial_ports_concurrently(
+    hass: HomeAssistant, pty_port: Callable[[bytes | None], str]
+) -> None:
+    serial_url = pty_port(YNCA_RESPONSE)
+    serial_urls = [pty_port(None) for _ in range(4)]
+    serial_urls.insert(2, serial_url)
+
+    start = time.monotonic()
+    results = await async_probe_serial_ports(hass, serial_urls, probe_timeout=0.25)
+
+    assert results == [YncaSerialProbeResult(serial_url, "RX-V671", ("MAIN",))]
+    # Probing one by one would take at least 4 timeouts
+    assert time.monotonic() - start < 0.9
+
+
+async def test_probe_receiver(simulator: YncaSimulator) -> None:
+    result = await async_probe_receiver("127.0.0.1", simulator.port)
+
+    assert result == YncaProbeResult(
+        "127.0.0.1", simulator.port, "RX-A810", ("MAIN", "ZONE2", "ZONE3", "ZONE4")
+    )
+    assert result.serial_url == f"socket://127.0.0.1:{simulator.port}"
+
+
+async def test_probe_receiver_zones(
+    socket_enabled: None,  # noqa: ARG001
+) -> None:
+    simulator = YncaSimulator(YncaSimulatorConfig(zones=["MAIN", "ZONE2"]))
+    await simulator.start()
+    try:
+        result = await async_probe_receiver("127.0.0.1", simulator.port)
+    finally:
+        await simulator.stop()
+
+    assert result is not None
+    assert result.zones == ("MAIN", "ZONE2")
+
+
+async def test_probe_receiver_cached(hass: HomeAssistant) -> None:
+    probe_result = YncaProbeResult("1.2.3.4", 50000, "RX-A810", ("MAIN",))
+
+    with patch(
+        "custom_components.yamaha_ynca.discovery.async_probe_receiver",
+        return_value=probe_result,
+    ) as mock_probe:
+        assert await async_probe_receiver_cached(hass, "1.2.3.4") == probe_result
+        assert await async_probe_receiver_cached(hass, "1.2.3.4") == probe_result
+        assert mock_probe.call_count == 1
+
+        # Failed probes are cached as well
+        mock_probe.return_value = None
+        assert await async_probe_receiver_cached(hass, "1.2.3.5") is None
+        assert await async_probe_receiver_cached(hass, "1.2.3.5") is None
+        assert mock_probe.call_count == 2
+
+        # Probe again after cache expires
+        with patch(
+            "custom_components.yamaha_ynca.discovery.time.monotonic",
+            return_value=time.monotonic() + PROBE_CACHE_TIME + 1,
+        ):
+            assert await async_probe_receiver_cached(hass, "1.2.3.4") is None
+        assert mock_probe.call_count == 3
+
+
+async def test_probe_receiver_no_ynca(
+    stand_in_server: Callable[[bytes | None], Awaitable[int]],
+) -> None:
+    port = await stand_in_server(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+    assert await async_probe_receiver("127.0.0.1", port, probe_timeout=0.1) is None
+
+
+async def test_probe_receiver_no_response(
+    stand_in_server: Callable[[bytes | None], Awaitable[int]],
+) -> None:
+    port = await stand_in_server(None)
+    assert await async_probe_receiver("127.0.0.1", port, probe_timeout=0.1) is None
+
+
+async def test_probe_receiver_connection_refused(
+    socket_enabled: None,  # noqa: ARG001
+) -> None:
+    simulator = YncaSimulator()
+    await simulator.start()
+    port = simulator.port
+    await simulator.stop()
+
+    assert await async_probe_receiver("127.0.0.1", port) is None
+
+
+def test_parse_scan_network() -> None:
+    assert parse_scan_network("192.168.1.0/24") == ipaddress.ip_network(
+        "192.168.1.0/24"
+    )
+    # Host bits are allowed, makes it easy to input own IP address
+    assert parse_scan_network(" 192.168.1.12/24") == ipaddress.ip_network(
+        "192.168.1.0/24"
+    )
+    assert parse_scan_network("192.168.1.12") == ipaddress.ip_network("192.168.1.12/32")
+
+    with pytest.raises(ValueError, match="too large"):
+        parse_scan_network("10.0.0.0/8")
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_scan_network("not a network")
+
+
+async def test_scan_network(simulator: YncaSimulator) -> None:
+    results = await async_scan_network(
+        ipaddress.ip_network("127.0.0.1/32"), simulator.port
+    )
+    assert [result.serial_url for result in results] == [simulator.serial_url]
+
+
+async def test_scan_network_bounded_concurrency() -> None:
+    active = 0
+    max_active = 0
+    probed = []
+
+    async def probe(
+        host: str, port: int, _probe_timeout: float
+    ) -> YncaProbeResult | None:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        probed.append(host)
+        return YncaProbeResult(host, port, "RX-V671") if host.endswith(".5") else None
+
+    with patch(
+        "custom_components.yamaha_ynca.discovery.async_probe_receiver",
+        side_effect=probe,
+    ):
+        results = await async_scan_network(
+            ipaddress.ip_network("10.0.0.0/28"),
+            50000,
+            exclude_hosts={"10.0.0.2"},
+            max_concurrency=3,
+        )
+
+    assert results == [YncaProbeResult("10.0.0.5", 50000, "RX-V671")]
+    assert len(probed) == 13
+    assert "10.0.0.2" not in probed
+    assert max_active == 3
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from homeassistant.helpers.entity import EntityDescription
 
@@ -50,31 +50,33 @@ async def test_yamaha_ynca_settings_entity_update(
     assert mock_zone.register_update_callback.call_count == 2
     callback2 = mock_zone.register_update_callback.call_args.args[0]
 
-    entity.schedule_update_ha_state = Mock()
-    entity2.schedule_update_ha_state = Mock()
-
-    # Ignore unrelated updates
-    callback("UNRELATED", None)
-    callback2("UNRELATED", None)
-    entity.schedule_update_ha_state.assert_not_called()
-    entity2.schedule_update_ha_state.assert_not_called()
-
-    # HA state is updated when related YNCA messages are handled
-    callback("KEY", None)
-    callback2("KEY", None)
-    assert entity.schedule_update_ha_state.call_count == 1
-    assert entity2.schedule_update_ha_state.call_count == 0
-
-    callback("FUNCTION_NAME", None)
-    callback2("FUNCTION_NAME", None)
-    assert entity.schedule_update_ha_state.call_count == 1
-    assert entity2.schedule_update_ha_state.call_count == 1
-
-    # All react on PWR
-    callback("PWR", None)
-    callback2("PWR", None)
-    assert entity.schedule_update_ha_state.call_count == 2
-    assert entity2.schedule_update_ha_state.call_count == 2
+    def update_count(entity: YamahaYncaSettingEntity) -> int:
+        return [call.args[0] for call in update_ha_state.call_args_list].count(entity)
+
+    with patch(
+        "custom_components.yamaha_ynca.entity.update_ha_state"
+    ) as update_ha_state:
+        # Ignore unrelated updates
+        callback("UNRELATED", None)
+        callback2("UNRELATED", None)
+        update_ha_state.assert_not_called()
+
+        # HA state is updated when related YNCA messages are handled
+        callback("KEY", None)
+        callback2("KEY", None)
+        assert update_count(entity) == 1
+        assert update_count(entity2) == 0
+
+        callback("FUNCTION_NAME", None)
+        callback2("FUNCTION_NAME", None)
+        assert update_count(entity) == 1
+        assert update_count(entity2) == 1
+
+        # All react on PWR
+        callback("PWR", None)
+        callback2("PWR", None)
+        assert update_count(entity) == 2
+        assert update_count(entity2) == 2
 
     # Entity is unavailable when zone is powered off
     mock_zone.pwr = ynca.Pwr.ON
@@ -0,0 +1,92 @@
+"""Test the Yamaha (YNCA) entity plan."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import Platform
+
+from custom_components.yamaha_ynca.entity_plan import PlannedEntity, build_entity_plan
+from custom_components.yamaha_ynca.number import InitialVolumeValueEntityDescription
+import ynca
+
+from .conftest import setup_integration
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from homeassistant.core import HomeAssistant
+
+
+def test_build_entity_plan_minimal(mock_ynca: Mock, mock_zone_main: Mock) -> None:
+    mock_ynca.main = mock_zone_main
+
+    entity_plan = build_entity_plan(mock_ynca)
+
+    # Platforms without entities are not in the plan
+    assert set(entity_plan) == {
+        Platform.MEDIA_PLAYER,
+        Platform.BUTTON,
+        Platform.SWITCH,
+        Platform.REMOTE,
+    }
+    assert entity_plan[Platform.MEDIA_PLAYER] == [PlannedEntity(mock_zone_main)]
+    assert [
+        (planned.subunit, planned.description.key, planned.associated_zone)
+        for planned in entity_plan[Platform.SWITCH]
+    ] == [(mock_ynca.sys, "pwr", mock_zone_main)]
+
+
+def test_build_entity_plan(
+    mock_ynca: Mock, mock_zone_main_with_zoneb: Mock, mock_zone_zone2: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    mock_ynca.zone2 = mock_zone_zone2
+    mock_ynca.main.inp = ynca.Input.HDMI1
+    mock_ynca.main.vol = -10
+    mock_ynca.zone2.initvollvl = ynca.InitVolLvl.MUTE
+    mock_ynca.sys.hdmiout1 = ynca.HdmiOutOnOff.ON
+
+    entity_plan = build_entity_plan(mock_ynca)
+
+    assert entity_plan[Platform.MEDIA_PLAYER] == [
+        PlannedEntity(mock_ynca.main),
+        PlannedEntity(mock_ynca.zone2),
+        PlannedEntity(mock_ynca.main, zoneb=True),
+    ]
+    assert entity_plan[Platform.REMOTE] == [
+        PlannedEntity(mock_ynca.main),
+        PlannedEntity(mock_ynca.zone2),
+    ]
+    assert [
+        (planned.subunit, planned.description.key)
+        for planned in entity_plan[Platform.NUMBER]
+    ] == [(mock_ynca.main, "vol"), (mock_ynca.zone2, "initvollvl")]
+    assert (
+        entity_plan[Platform.NUMBER][1].description
+        is InitialVolumeValueEntityDescription
+    )
+    assert [
+        (planned.subunit, planned.description.key)
+        for planned in entity_plan[Platform.SENSOR]
+    ] == [(mock_ynca.main, "inp")]
+    assert [
+        (planned.subunit, planned.description.key, planned.associated_zone)
+        for planned in entity_plan[Platform.SWITCH]
+    ] == [
+        (mock_ynca.sys, "hdmiout1", mock_ynca.main),
+        (mock_ynca.sys, "pwr", mock_ynca.main),
+    ]
+
+
+async def test_only_planned_platforms_are_set_up(
+    hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main
+
+    await setup_integration(hass, mock_ynca)
+
+    entity_domains = {state.domain for state in hass.states.async_all()}
+    assert entity_domains == {"media_player", "switch", "remote"}
+    assert "yamaha_ynca.sensor" not in hass.config.components
+    assert "yamaha_ynca.media_player" in hass.config.components
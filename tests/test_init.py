@@ -6,8 +6,10 @@ from typing import TYPE_CHECKING
 from unittest.mock import Mock, create_autospec, patch
 
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers import device_registry as dr
 from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
     MockConfigEntry,
+    async_capture_events,
 )
 
 from custom_components import yamaha_ynca
@@ -18,7 +20,6 @@ from .conftest import setup_integration
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
-    from homeassistant.helpers import device_registry as dr
 
 
 async def test_async_setup_entry(  # noqa: PLR0913
@@ -251,6 +252,26 @@ async def test_async_setup_entry_fails_unknown_reason(
     assert integration.entry.state is ConfigEntryState.SETUP_ERROR
 
 
+async def test_async_setup_entry_fails_after_initialization(
+    hass: HomeAssistant, mock_ynca: Mock
+) -> None:
+    """Test the connection is closed when setup fails after initialization."""
+    integration = await setup_integration(hass, mock_ynca, skip_setup=True)
+
+    with (
+        patch("ynca.YncaApi", return_value=mock_ynca),
+        patch(
+            "custom_components.yamaha_ynca.async_setup_receiver",
+            side_effect=Exception("Unexpected exception"),
+        ),
+    ):
+        await hass.config_entries.async_setup(integration.entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert integration.entry.state is ConfigEntryState.SETUP_ERROR
+    mock_ynca.close.assert_called_once()
+
+
 async def test_async_unload_entry(
     hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
 ) -> None:
@@ -309,3 +330,103 @@ async def test_update_configentry(
     assert "ZONE2" not in entry.data["zones"]
     assert "ZONE3" in entry.data["zones"]
     assert "ZONE4" not in entry.data["zones"]
+
+
+async def test_update_configentry_capabilities(
+    hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
+) -> None:
+    mock_zone_main.twochdecoder = ynca.TwoChDecoder.Auto
+    mock_zone_main.scene3name = "Scene 3"
+    mock_ynca.main = mock_zone_main
+    mock_ynca.sys.modelname = "RX-A810"
+    mock_ynca.sys.inpnamehdmi1 = " HDMI One "
+    mock_ynca.netradio = create_autospec(ynca.subunits.netradio.NetRadio)
+
+    integration = await setup_integration(hass, mock_ynca)
+
+    capabilities = integration.entry.data[yamaha_ynca.const.DATA_CAPABILITIES]
+    assert capabilities["inputs"] == {
+        "HDMI1": "HDMI One",
+        "Main Zone Sync": "Main Zone Sync",
+        "NET RADIO": "NET RADIO",
+    }
+    assert capabilities["scenes"] == {"MAIN": 1}
+    assert capabilities["twochdecoder"] is True
+    assert "Hall in Vienna" in capabilities["soundprg"]
+    assert len(capabilities["soundprg"]) < len(ynca.SoundPrg) - 1
+
+    # Entry is only updated when capabilities changed
+    with patch.object(hass.config_entries, "async_update_entry") as update_entry:
+        await yamaha_ynca.update_configentry(hass, integration.entry, mock_ynca)
+        update_entry.assert_not_called()
+
+        mock_ynca.sys.inpnamehdmi1 = "Renamed"
+        await yamaha_ynca.update_configentry(hass, integration.entry, mock_ynca)
+        assert (
+            update_entry.call_args.kwargs["data"]["capabilities"]["inputs"]["HDMI1"]
+            == "Renamed"
+        )
+
+
+@patch("homeassistant.config_entries.ConfigEntries.async_reload")
+async def test_options_update_applied_without_reload(
+    async_reload_mock: Mock, hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main
+    integration = await setup_integration(hass, mock_ynca)
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ["Hall in Vienna"]},
+    )
+    await hass.async_block_till_done()
+
+    async_reload_mock.assert_not_called()
+    assert integration.entry.state is ConfigEntryState.LOADED
+    mock_ynca.initialize.assert_called_once()
+
+
+async def test_update_device_registry_only_changes(
+    hass: HomeAssistant,
+    device_reg: dr.DeviceRegistry,
+    mock_ynca: Mock,
+    mock_zone_main_with_zoneb: Mock,
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    integration = await setup_integration(hass, mock_ynca)
+    registry_index = integration.entry.runtime_data.registry_index
+
+    events = async_capture_events(hass, dr.EVENT_DEVICE_REGISTRY_UPDATED)
+
+    # Nothing changed, e.g. on reconnect
+    await yamaha_ynca.update_device_registry(
+        hass, integration.entry, mock_ynca, registry_index
+    )
+    await hass.async_block_till_done()
+    assert events == []
+
+    # Only changed devices get updated
+    mock_ynca.main.zonebname = "New ZoneB"
+    await yamaha_ynca.update_device_registry(
+        hass, integration.entry, mock_ynca, registry_index
+    )
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data["action"] == "update"
+    assert events[0].data["changes"] == {"name": "ModelName ZoneB"}
+
+    device = device_reg.async_get_device(
+        identifiers={(yamaha_ynca.DOMAIN, f"{integration.entry.entry_id}_ZONEB")}
+    )
+    assert device is not None
+    assert device.name == "New ZoneB"
+
+    # Removed devices get created again
+    device_reg.async_remove_device(device.id)
+    await hass.async_block_till_done()
+    events.clear()
+    await yamaha_ynca.update_device_registry(
+        hass, integration.entry, mock_ynca, registry_index
+    )
+    await hass.async_block_till_done()
+    assert [event.data["action"] for event in events] == ["create"]
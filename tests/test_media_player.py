@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 from typing import TYPE_CHECKING
 from unittest.mock import Mock, create_autospec, patch
@@ -18,14 +19,17 @@ import pytest
 from pytest_unordered import unordered
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
     from homeassistant.core import HomeAssistant
 
 from custom_components import yamaha_ynca
 from custom_components.yamaha_ynca.media_player import (
     YamahaYncaZone,
     YamahaYncaZoneB,
+    YamahaYncaZoneGroup,
 )
-from tests.conftest import setup_integration
+from tests.conftest import Integration, setup_integration
 import ynca
 
 ALL_SOUNDMODES = [sp.value for sp in ynca.SoundPrg if sp is not ynca.SoundPrg.UNKNOWN]
@@ -50,6 +54,43 @@ def mp_entity_zoneb(
     return YamahaYncaZoneB("ReceiverUniqueId", mock_ynca, [])
 
 
+@pytest.fixture
+async def integration_with_worker(
+    hass: HomeAssistant, mock_ynca: Mock
+) -> AsyncGenerator[Integration]:
+    """Integration with running command worker, receiver reports all subunits are ready."""
+    integration = await setup_integration(hass, mock_ynca, skip_setup=True)
+    runtime_data = integration.entry.runtime_data
+
+    def get(subunit: str, function_: str) -> None:
+        runtime_data.warmup_gate.message_callback(
+            ynca.YncaProtocolStatus.OK, subunit, function_, "Ready"
+        )
+
+    mock_ynca.get_raw_connection().get.side_effect = get
+    runtime_data.command_worker.start()
+    yield integration
+    await runtime_data.command_worker.async_stop()
+
+
+async def play_media_while_powering_on(
+    integration: Integration,
+    entity: YamahaYncaZone,
+    power_function: str,
+    media_id: str,
+) -> None:
+    entity.platform = Mock(config_entry=integration.entry)
+    play_media = asyncio.ensure_future(entity.async_play_media("channel", media_id))
+    await asyncio.sleep(0.01)
+
+    # Input is not switched before the receiver reported the zone is on
+    assert not play_media.done()
+    integration.entry.runtime_data.warmup_gate.message_callback(
+        ynca.YncaProtocolStatus.OK, "MAIN", power_function, "On"
+    )
+    await play_media
+
+
 async def test_mediaplayer_entity(
     mp_entity: YamahaYncaZone, mock_zone: Mock, mock_ynca: Mock
 ) -> None:
@@ -123,6 +164,8 @@ async def test_mediaplayer_entity_update_callback_zonename(
         identifiers={(yamaha_ynca.DOMAIN, "ReceiverUniqueId_ZoneId")},
         name="Old Zonename",
     )
+    # Setup of the integration fails for this mock, so index the registry here
+    integration.entry.runtime_data.registry_index.async_build()
 
     zone_entity = YamahaYncaZone("ReceiverUniqueId", mock_ynca, mock_zone, [], [])
     assert zone_entity.device_info["identifiers"] == {
@@ -130,15 +173,17 @@ async def test_mediaplayer_entity_update_callback_zonename(
     }
 
     zone_entity.hass = hass  # In a real system this is done by HA
+    zone_entity.platform = Mock(config_entry=integration.entry)
     await zone_entity.async_added_to_hass()
 
     zone_callback = mock_zone.register_update_callback.call_args.args[0]
-    zone_entity.schedule_update_ha_state = Mock()
+    # Callbacks arrive on the event loop, so state is written directly
+    zone_entity.async_write_ha_state = Mock()
 
     # Zonename update
     mock_zone.zonename = "New Zonename"
     zone_callback("ZONENAME", "VALUE")  # Note VALUE is not used it is read from API
-    assert zone_entity.schedule_update_ha_state.call_count == 1
+    assert zone_entity.async_write_ha_state.call_count == 1
 
     # Check for name change
     device_entry = device_reg.async_get_or_create(
@@ -170,15 +215,17 @@ async def test_mediaplayer_entity_update_callback_zonebname(
     }
 
     zoneb_entity.hass = hass  # In a real system this is done by HA
+    zoneb_entity.platform = Mock(config_entry=integration.entry)
     await zoneb_entity.async_added_to_hass()
 
     zone_callback = mock_zone_main_with_zoneb.register_update_callback.call_args.args[0]
-    zoneb_entity.schedule_update_ha_state = Mock()
+    # Callbacks arrive on the event loop, so state is written directly
+    zoneb_entity.async_write_ha_state = Mock()
 
     # Zonename update
     mock_zone_main_with_zoneb.zonebname = "New ZoneBname"
     zone_callback("ZONEBNAME", "VALUE")  # Note VALUE is not used it is read from API
-    assert zoneb_entity.schedule_update_ha_state.call_count == 1
+    assert zoneb_entity.async_write_ha_state.call_count == 1
 
     # Check for name change
     device_entry = device_reg.async_get_or_create(
@@ -962,6 +1009,27 @@ async def test_mediaplayer_entity_repeat(
     assert mp_entity.repeat is None
 
 
+async def test_mediaplayer_entity_repeat_shuffle_refreshed(
+    mp_entity: YamahaYncaZone,
+    mock_zone: Mock,
+    mock_ynca: Mock,
+    integration_with_worker: Integration,
+) -> None:
+    mock_zone.inp = ynca.Input.USB
+    mock_ynca.usb = create_autospec(ynca.subunits.usb.Usb)
+    mock_ynca.usb.id = "USB"
+    mp_entity.platform = Mock(config_entry=integration_with_worker.entry)
+    refresh_scheduler = integration_with_worker.entry.runtime_data.refresh_scheduler
+
+    # Some subunits do not report repeat and shuffle, so they are requested after writing
+    with patch.object(refresh_scheduler, "async_written") as async_written:
+        await mp_entity.async_set_repeat(RepeatMode.ALL)
+        async_written.assert_called_once_with("USB", "REPEAT")
+
+        await mp_entity.async_set_shuffle(True)  # noqa: FBT003
+        async_written.assert_called_with("USB", "SHUFFLE")
+
+
 async def test_mediaplayer_repeat_single_and_one(
     hass: HomeAssistant, mock_zone_main: Mock, mock_ynca: Mock
 ) -> None:
@@ -1055,8 +1123,12 @@ async def test_mediaplayer_entity_play_media_unsupported_media(
 
 
 async def test_mediaplayer_entity_play_media(
-    mp_entity: YamahaYncaZone, mock_zone: Mock, mock_ynca: Mock
+    mock_zone_main: Mock, mock_ynca: Mock, integration_with_worker: Integration
 ) -> None:
+    mock_zone = mock_zone_main
+    mp_entity = YamahaYncaZone(
+        "ReceiverUniqueId", mock_ynca, mock_zone, ALL_INPUTS, ALL_SOUNDMODES
+    )
     mock_zone.inp = ynca.Input.USB
     mock_ynca.tun = create_autospec(ynca.subunits.tun.Tun)
     mock_ynca.tun.id = ynca.subunit.Subunit.TUN
@@ -1066,11 +1138,19 @@ async def test_mediaplayer_entity_play_media(
     mock_zone.inp = ynca.Input.USB
     mock_ynca.tun.preset = None
 
-    await mp_entity.async_play_media("channel", "tun:preset:15")
+    await play_media_while_powering_on(
+        integration_with_worker, mp_entity, "PWR", "tun:preset:15"
+    )
     assert mock_zone.pwr is ynca.Pwr.ON
     assert mock_zone.inp is ynca.Input.TUNER
     assert mock_ynca.tun.preset == 15
 
+    # Input and preset were held during warmup, tuner was probed before setting the preset
+    warmup_gate = integration_with_worker.entry.runtime_data.warmup_gate
+    assert warmup_gate.metrics.warmups == 1
+    assert warmup_gate.metrics.commands_held == 1
+    mock_ynca.get_raw_connection().get.assert_called_with("TUN", "AVAIL")
+
     # DAB and TUN have the same input, so delete the TUN subunit
     mock_ynca.tun = None
     mock_ynca.dab = create_autospec(ynca.subunits.dab.Dab)
@@ -1090,7 +1170,10 @@ async def test_mediaplayer_entity_play_media(
 
 
 async def test_mediaplayer_entity_zoneb_play_media(
-    mp_entity_zoneb: YamahaYncaZoneB, mock_zone_main_with_zoneb: Mock, mock_ynca: Mock
+    mp_entity_zoneb: YamahaYncaZoneB,
+    mock_zone_main_with_zoneb: Mock,
+    mock_ynca: Mock,
+    integration_with_worker: Integration,
 ) -> None:
     mock_zone = mock_zone_main_with_zoneb
 
@@ -1103,7 +1186,9 @@ async def test_mediaplayer_entity_zoneb_play_media(
     mock_zone.inp = ynca.Input.TUNER
     mock_ynca.usb.preset = None
 
-    await mp_entity_zoneb.async_play_media("channel", "usb:preset:23")
+    await play_media_while_powering_on(
+        integration_with_worker, mp_entity_zoneb, "PWRB", "usb:preset:23"
+    )
     assert mock_zone.pwrb is ynca.PwrB.ON
     assert mock_zone.inp is ynca.Input.USB
     assert mock_ynca.usb.preset == 23
@@ -1231,3 +1316,272 @@ async def test_mediaplayer_entity_store_preset_warning(
 
     with pytest.raises(ServiceValidationError):
         mp_entity.store_preset(12)
+
+
+async def test_mediaplayer_options_applied_without_reload(
+    hass: HomeAssistant, mock_ynca: Mock, mock_zone_main_with_zoneb: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    mock_ynca.main.pwr = ynca.Pwr.ON
+    mock_ynca.main.soundprg = ynca.SoundPrg.HALL_IN_MUNICH
+    mock_ynca.main.inp = ynca.Input.HDMI1
+    mock_ynca.sys.inpnamehdmi1 = "HDMI One"
+    mock_ynca.sys.inpnamehdmi2 = "HDMI Two"
+
+    integration = await setup_integration(hass, mock_ynca)
+    state = hass.states.get("media_player.modelname_main")
+    assert state.attributes["source_list"] == ["HDMI One", "HDMI Two"]
+    assert len(state.attributes["sound_mode_list"]) > 1
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={
+            yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ["Hall in Munich"],
+            "MAIN": {yamaha_ynca.const.CONF_SELECTED_INPUTS: ["HDMI2"]},
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("media_player.modelname_main")
+    assert state.attributes["source_list"] == ["HDMI Two"]
+    assert state.attributes["sound_mode_list"] == ["Hall in Munich"]
+
+    # ZoneB uses the inputs of MAIN zone
+    state = hass.states.get("media_player.modelname_zoneb")
+    assert state.attributes["source_list"] == ["HDMI Two"]
+    mock_ynca.initialize.assert_called_once()
+
+
+async def test_zone_group_added_and_removed_with_options(
+    hass: HomeAssistant,
+    mock_ynca: Mock,
+    mock_zone_main_with_zoneb: Mock,
+    mock_zone_zone2: Mock,
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    mock_ynca.zone2 = mock_zone_zone2
+    mock_ynca.main.pwr = ynca.Pwr.ON
+    mock_ynca.main.pwrb = ynca.PwrB.STANDBY
+    mock_ynca.zone2.pwr = ynca.Pwr.STANDBY
+
+    integration = await setup_integration(hass, mock_ynca)
+    assert hass.states.get("media_player.modelname_main_zone_group") is None
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={yamaha_ynca.const.CONF_ZONE_GROUP: ["MAIN", "ZONEB"]},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("media_player.modelname_main_zone_group")
+    assert state.state == MediaPlayerState.ON
+    assert state.attributes["members"] == [
+        "media_player.modelname_main",
+        "media_player.modelname_zoneb",
+    ]
+
+    # Members can change without recreating the group
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={yamaha_ynca.const.CONF_ZONE_GROUP: ["ZONE2", "ZONEB"]},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("media_player.modelname_main_zone_group")
+    assert state.state == MediaPlayerState.OFF
+    assert state.attributes["members"] == [
+        "media_player.modelname_zone2",
+        "media_player.modelname_zoneb",
+    ]
+
+    # Group moves to the device of the new first member
+    entity_registry = er.async_get(hass)
+    zone2_device = dr.async_get(hass).async_get_device(
+        identifiers={(yamaha_ynca.DOMAIN, f"{integration.entry.entry_id}_ZONE2")}
+    )
+    assert (
+        entity_registry.async_get("media_player.modelname_main_zone_group").device_id
+        == zone2_device.id
+    )
+
+    # A group needs at least 2 members
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={yamaha_ynca.const.CONF_ZONE_GROUP: ["ZONE2"]},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("media_player.modelname_main_zone_group") is None
+    assert (
+        entity_registry.async_get_entity_id(
+            "media_player",
+            yamaha_ynca.DOMAIN,
+            f"{integration.entry.entry_id}_zone_group",
+        )
+        is None
+    )
+
+
+async def test_zone_group_state(  # noqa: PLR0915
+    mock_ynca: Mock,
+    mock_zone_main_with_zoneb: Mock,
+    mock_zone_zone2: Mock,
+    integration_with_worker: Integration,
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    mock_ynca.zone2 = mock_zone_zone2
+    mock_ynca.sys.inpnamehdmi1 = "HDMI One"
+    mock_ynca.sys.inpnamehdmi2 = "HDMI Two"
+    mock_ynca.main.pwr = ynca.Pwr.ON
+    mock_ynca.main.vol = -20.0
+    mock_ynca.main.mute = ynca.Mute.ON
+    mock_ynca.main.inp = ynca.Input.HDMI1
+    mock_ynca.main.pwrb = ynca.PwrB.STANDBY
+    mock_ynca.main.zonebvol = -10.0
+    mock_ynca.zone2.pwr = ynca.Pwr.ON
+    mock_ynca.zone2.vol = -30.0
+    mock_ynca.zone2.mute = ynca.Mute.OFF
+    mock_ynca.zone2.inp = ynca.Input.HDMI1
+
+    members = [
+        YamahaYncaZone("ReceiverUniqueId", mock_ynca, mock_ynca.main, ALL_INPUTS, []),
+        YamahaYncaZone("ReceiverUniqueId", mock_ynca, mock_ynca.zone2, ALL_INPUTS, []),
+        YamahaYncaZoneB("ReceiverUniqueId", mock_ynca, ALL_INPUTS),
+    ]
+    zone_group = YamahaYncaZoneGroup("ReceiverUniqueId", members)
+    for entity in [*members, zone_group]:
+        entity.platform = Mock(config_entry=integration_with_worker.entry)
+
+    assert zone_group.unique_id == "ReceiverUniqueId_zone_group"
+    assert zone_group.device_info["identifiers"] == {
+        (yamaha_ynca.DOMAIN, "ReceiverUniqueId_MAIN")
+    }
+
+    await zone_group.async_added_to_hass()
+    # MAIN and ZoneB share a subunit
+    mock_ynca.main.register_update_callback.assert_called_once()
+    mock_ynca.zone2.register_update_callback.assert_called_once()
+    main_callback = mock_ynca.main.register_update_callback.call_args.args[0]
+    zone2_callback = mock_ynca.zone2.register_update_callback.call_args.args[0]
+    zone_group.schedule_update_ha_state = Mock()
+
+    # State is based on members that are on, loudest member determines volume
+    assert zone_group.state is MediaPlayerState.ON
+    assert zone_group.volume_level == pytest.approx(
+        members[0].volume_level  # type: ignore[arg-type]
+    )
+    assert zone_group.is_volume_muted is False
+    assert zone_group.source == "HDMI One"
+    assert zone_group.source_list == members[0].source_list
+
+    # Unrelated functions and unchanged group state do not update
+    mock_ynca.zone2.vol = -35.0
+    zone2_callback("SCENE1NAME", "Scene")
+    zone2_callback("VOL", -35.0)
+    zone_group.schedule_update_ha_state.assert_not_called()
+
+    mock_ynca.zone2.inp = ynca.Input.HDMI2
+    zone2_callback("INP", "HDMI2")
+    assert zone_group.schedule_update_ha_state.call_count == 1
+    assert zone_group.source is None
+
+    # Only the members of the reporting subunit are refreshed
+    mock_ynca.zone2.mute = ynca.Mute.ON
+    main_callback("MUTE", "On")
+    assert zone_group.schedule_update_ha_state.call_count == 1
+    assert zone_group.is_volume_muted is False
+
+    zone2_callback("MUTE", "On")
+    assert zone_group.schedule_update_ha_state.call_count == 2
+    assert zone_group.is_volume_muted is True
+
+    mock_ynca.main.pwr = ynca.Pwr.STANDBY
+    mock_ynca.zone2.pwr = ynca.Pwr.STANDBY
+    main_callback("PWR", "Standby")
+    zone2_callback("PWR", "Standby")
+    assert zone_group.state is MediaPlayerState.OFF
+
+    await zone_group.async_will_remove_from_hass()
+    mock_ynca.main.unregister_update_callback.assert_called_once_with(main_callback)
+    mock_ynca.zone2.unregister_update_callback.assert_called_once_with(zone2_callback)
+
+
+async def test_zone_group_commands(
+    mock_ynca: Mock,
+    mock_zone_main_with_zoneb: Mock,
+    mock_zone_zone2: Mock,
+    integration_with_worker: Integration,
+) -> None:
+    mock_ynca.main = mock_zone_main_with_zoneb
+    mock_ynca.zone2 = mock_zone_zone2
+    mock_ynca.sys.inpnamehdmi2 = "HDMI Two"
+    mock_ynca.main.vol = -20.0
+    mock_ynca.main.zonebvol = -30.0
+    mock_ynca.zone2.vol = -79.5
+    mock_ynca.main.pwr = ynca.Pwr.STANDBY
+    mock_ynca.main.pwrb = ynca.PwrB.STANDBY
+    mock_ynca.zone2.pwr = ynca.Pwr.ON
+
+    members = [
+        YamahaYncaZone("ReceiverUniqueId", mock_ynca, mock_ynca.main, ALL_INPUTS, []),
+        YamahaYncaZone("ReceiverUniqueId", mock_ynca, mock_ynca.zone2, ALL_INPUTS, []),
+        YamahaYncaZoneB("ReceiverUniqueId", mock_ynca, ALL_INPUTS),
+    ]
+    zone_group = YamahaYncaZoneGroup("ReceiverUniqueId", members)
+    for entity in [*members, zone_group]:
+        entity.platform = Mock(config_entry=integration_with_worker.entry)
+    await zone_group.async_added_to_hass()
+    write_acknowledger = integration_with_worker.entry.runtime_data.write_acknowledger
+    warmup_gate = integration_with_worker.entry.runtime_data.warmup_gate
+
+    with patch.object(
+        write_acknowledger,
+        "async_write_batch",
+        wraps=write_acknowledger.async_write_batch,
+    ) as async_write_batch:
+        await zone_group.async_turn_on()
+        assert mock_ynca.main.pwr is ynca.Pwr.ON
+        assert mock_ynca.main.pwrb is ynca.PwrB.ON
+        assert mock_ynca.zone2.pwr is ynca.Pwr.ON
+
+        # Commands for members that are powering on are held until they are ready
+        mute = asyncio.ensure_future(zone_group.async_mute_volume(mute=True))
+        await asyncio.sleep(0.01)
+        assert mock_ynca.zone2.mute is ynca.Mute.ON
+        assert mock_ynca.main.mute is not ynca.Mute.ON
+        for power_function in ["PWR", "PWRB"]:
+            warmup_gate.message_callback(
+                ynca.YncaProtocolStatus.OK, "MAIN", power_function, "On"
+            )
+        await mute
+        assert warmup_gate.metrics.warmups == 2
+        assert warmup_gate.metrics.commands_held == 2
+        assert mock_ynca.main.mute is ynca.Mute.ON
+        assert mock_ynca.main.zonebmute is ynca.ZoneBMute.ON
+        assert mock_ynca.zone2.mute is ynca.Mute.ON
+
+        # ZoneB uses the input of MAIN, so it is only written once
+        await zone_group.async_select_source("HDMI Two")
+        assert async_write_batch.call_args.args[0] == [
+            (mock_ynca.main, "inp", ynca.Input.HDMI2),
+            (mock_ynca.zone2, "inp", ynca.Input.HDMI2),
+        ]
+
+        # Offsets between members are kept
+        await zone_group.async_volume_up()
+        assert async_write_batch.call_args.args[0] == [
+            (mock_ynca.main, "vol", -19.5),
+            (mock_ynca.zone2, "vol", -79.0),
+            (mock_ynca.main, "zonebvol", -29.5),
+        ]
+
+        # Volumes stay within range, the most limiting member limits the change
+        await zone_group.async_set_volume_level(0)
+        assert async_write_batch.call_args.args[0] == [
+            (mock_ynca.main, "vol", -21.0),
+            (mock_ynca.zone2, "vol", -80.5),
+            (mock_ynca.main, "zonebvol", -31.0),
+        ]
+
+    # All writes of a command are done in one batch
+    assert async_write_batch.call_count == 5
@@ -15,13 +15,32 @@ from pytest_homeassistant_custom_component.common import (  # type: ignore[impor
 
 from custom_components import yamaha_ynca
 from custom_components.yamaha_ynca.const import DOMAIN
-from custom_components.yamaha_ynca.migrations import LEGACY_CONF_HIDDEN_SOUND_MODES
+from custom_components.yamaha_ynca.migrations import (
+    LEGACY_CONF_HIDDEN_SOUND_MODES,
+    MigrationState,
+)
+
+from .conftest import create_mock_config_entry
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers import device_registry as dr
 
 
+def migrate_step(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    step: Callable[[MigrationState], None],
+) -> None:
+    """Apply a single migration step to the config entry."""
+    state = MigrationState.from_config_entry(hass, config_entry)
+    step(state)
+    state.async_commit(hass, config_entry)
+
+
 @pytest.fixture
 def device_reg(hass: HomeAssistant) -> dr.DeviceRegistry:
     """Return an empty, loaded, registry."""
@@ -50,6 +69,71 @@ async def test_async_migration_entry(hass: HomeAssistant) -> None:
     assert new_entry.minor_version == 8
 
 
+async def test_async_migration_entry_single_write(
+    hass: HomeAssistant, device_reg: dr.DeviceRegistry
+) -> None:
+    """Full chain of migrations should write config entry and registries only once."""
+    old_entry = MockConfigEntry(
+        domain=yamaha_ynca.DOMAIN,
+        entry_id="entry_id",
+        title="RX-A810",
+        data={"serial_port": "1.2.3.4:50000"},
+        options={"hidden_inputs_MAIN": ["HDMI1"]},
+        version=1,
+    )
+    old_entry.add_to_hass(hass)
+    device_reg.async_get_or_create(
+        config_entry_id=old_entry.entry_id, identifiers={(DOMAIN, "entry_id")}
+    )
+    mock_entity_registry = mock_registry(hass)
+    mock_entity_registry.async_get_or_create(
+        Platform.SELECT,
+        yamaha_ynca.DOMAIN,
+        f"{old_entry.entry_id}_MAIN_twochdecoder",
+        config_entry=old_entry,
+    )
+
+    with (
+        patch.object(
+            hass.config_entries,
+            "async_update_entry",
+            wraps=hass.config_entries.async_update_entry,
+        ) as update_entry_mock,
+        patch(
+            "homeassistant.helpers.device_registry.async_get",
+            return_value=device_reg,
+        ),
+        patch(
+            "homeassistant.helpers.entity_registry.async_get",
+            return_value=mock_entity_registry,
+        ),
+    ):
+        assert await yamaha_ynca.async_migrate_entry(hass, old_entry)
+        await hass.async_block_till_done()
+
+    update_entry_mock.assert_called_once()
+
+    new_entry = hass.config_entries.async_get_entry(old_entry.entry_id)
+    assert new_entry.version == 7
+    assert new_entry.minor_version == 8
+    assert new_entry.data["serial_url"] == "socket://1.2.3.4:50000"
+    assert new_entry.data["modelname"] == "RX-A810"
+    assert "HDMI1" not in new_entry.options["MAIN"]["selected_inputs"]
+    assert "dolby_pl" in new_entry.options["selected_surround_decoders"]
+    assert device_reg.async_get_device({(DOMAIN, "entry_id_MAIN")}) is not None
+
+
+async def test_async_migration_entry_up_to_date(hass: HomeAssistant) -> None:
+    """Nothing gets written when already on the latest version."""
+    entry = create_mock_config_entry()
+    entry.add_to_hass(hass)
+
+    with patch.object(hass.config_entries, "async_update_entry") as update_entry_mock:
+        assert await yamaha_ynca.async_migrate_entry(hass, entry)
+
+    update_entry_mock.assert_not_called()
+
+
 async def test_async_migration_entry_downgrade(hass: HomeAssistant) -> None:
     """Downgrade not supported."""
     old_entry = MockConfigEntry(
@@ -78,7 +162,7 @@ async def test_async_migration_entry_version_v1_to_v2(hass: HomeAssistant) -> No
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v1_to_v2(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v1_to_v2)
     await hass.async_block_till_done()
 
     # Note that previously there was also deletion of entities here, but that is removed
@@ -101,7 +185,7 @@ async def test_async_migration_entry_version_v2_to_v3(hass: HomeAssistant) -> No
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v2_to_v3(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v2_to_v3)
     await hass.async_block_till_done()
 
     # Migration is empty now, so just check if version got updated
@@ -126,7 +210,7 @@ async def test_async_migration_entry_version_v3_to_v4_hidden_soundmodes(
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v3_to_v4(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v3_to_v4)
     await hass.async_block_till_done()
 
     # Hidden soundmodes are translated from enum name to value
@@ -149,7 +233,7 @@ async def test_async_migration_entry_version_v3_to_v4_no_hidden_soundmodes(
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v3_to_v4(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v3_to_v4)
     await hass.async_block_till_done()
 
     # Hidden soundmodes are translated from enum name to value
@@ -171,7 +255,7 @@ async def test_async_migration_entry_version_v4_to_v5_is_ipaddress(
     )
     old_entry.add_to_hass(hass)
 
-    yamaha_ynca.migrations.migrate_v4_to_v5(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v4_to_v5)
     await hass.async_block_till_done()
 
     # IP address converted to socket:// url
@@ -193,7 +277,7 @@ async def test_async_migration_entry_version_v4_to_v5_is_ipaddress_and_port(
     )
     old_entry.add_to_hass(hass)
 
-    yamaha_ynca.migrations.migrate_v4_to_v5(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v4_to_v5)
     await hass.async_block_till_done()
 
     # IP address converted to socket:// url
@@ -215,7 +299,7 @@ async def test_async_migration_entry_version_v4_to_v5_is_not_ipaddress(
     )
     old_entry.add_to_hass(hass)
 
-    yamaha_ynca.migrations.migrate_v4_to_v5(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v4_to_v5)
     await hass.async_block_till_done()
 
     # IP address converted to socket:// url
@@ -241,7 +325,7 @@ async def test_async_migration_entry_version_v5_to_v6(hass: HomeAssistant) -> No
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v5_to_v6(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v5_to_v6)
     await hass.async_block_till_done()
 
     # Entry is migrated to new structure
@@ -277,7 +361,7 @@ async def test_async_migration_entry_version_v5_to_v6_no_data(
     old_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v5_to_v6(hass, old_entry)
+    migrate_step(hass, old_entry, yamaha_ynca.migrations.migrate_v5_to_v6)
     await hass.async_block_till_done()
 
     # Entry is migrated to new structure
@@ -316,7 +400,7 @@ async def test_async_migration_entry_version_v6_to_v7(
         "homeassistant.helpers.device_registry.async_get",
         return_value=device_reg,
     ):
-        yamaha_ynca.migrations.migrate_v6_to_v7(hass, config_entry)
+        migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v6_to_v7)
         await hass.async_block_till_done()
 
     assert len(device_reg.devices) == 1  # Still only 1 device
@@ -343,7 +427,7 @@ async def test_async_migration_entry_version_v7_1_to_v7_2_no_audio_workaround(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_1_to_v7_2(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_1_to_v7_2)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -370,7 +454,7 @@ async def test_async_migration_entry_version_v7_1_to_v7_2_with_audio_workaround(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_1_to_v7_2(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_1_to_v7_2)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -395,7 +479,7 @@ async def test_async_migration_entry_version_v7_1_to_v7_2_no_zones_data(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_1_to_v7_2(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_1_to_v7_2)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -434,7 +518,7 @@ async def test_async_migration_entry_version_v7_2_to_v7_3_has_twochdecoder(
         "homeassistant.helpers.entity_registry.async_get",
         return_value=mock_entity_registry,
     ):
-        yamaha_ynca.migrations.migrate_v7_2_to_v7_3(hass, config_entry)
+        migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_2_to_v7_3)
         await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -466,7 +550,7 @@ async def test_async_migration_entry_version_v7_2_to_v7_3_no_twochdecoder(
     )
     config_entry.add_to_hass(hass)
 
-    yamaha_ynca.migrations.migrate_v7_2_to_v7_3(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_2_to_v7_3)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -491,7 +575,7 @@ async def test_async_migration_entry_version_v7_3_to_v7_4(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_3_to_v7_4(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_3_to_v7_4)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -518,7 +602,7 @@ async def test_async_migration_entry_version_v7_4_to_v7_5(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_4_to_v7_5(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_4_to_v7_5)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -545,7 +629,7 @@ async def test_async_migration_entry_version_v7_5_to_v7_6(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_5_to_v7_6(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_5_to_v7_6)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -576,7 +660,7 @@ async def test_async_migration_entry_version_v7_6_to_v7_7(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_6_to_v7_7(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_6_to_v7_7)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -606,7 +690,7 @@ async def test_async_migration_entry_version_v7_6_to_v7_7_nothing_hidden(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_6_to_v7_7(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_6_to_v7_7)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -639,7 +723,7 @@ async def test_async_migration_entry_version_v7_7_to_v7_8(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_7_to_v7_8(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_7_to_v7_8)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -670,7 +754,7 @@ async def test_async_migration_entry_version_v7_7_to_v7_8_nothing_hidden(
     config_entry.add_to_hass(hass)
 
     # Migrate
-    yamaha_ynca.migrations.migrate_v7_7_to_v7_8(hass, config_entry)
+    migrate_step(hass, config_entry, yamaha_ynca.migrations.migrate_v7_7_to_v7_8)
     await hass.async_block_till_done()
 
     new_entry = hass.config_entries.async_get_entry(config_entry.entry_id)
@@ -78,7 +78,10 @@ async def test_options_flow_navigate_all_screens(  # noqa: PLR0913
 
     result = await hass.config_entries.options.async_configure(
         result["flow_id"],
-        user_input={yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES},
+        user_input={
+            yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES,
+            yamaha_ynca.const.CONF_ZONE_GROUP: ["MAIN", "ZONE2"],
+        },
     )
 
     assert result["type"] == FlowResultType.FORM
@@ -132,6 +135,8 @@ async def test_options_flow_navigate_all_screens(  # noqa: PLR0913
     assert result["type"] == FlowResultType.CREATE_ENTRY
     assert result["data"] == {
         yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES,
+        yamaha_ynca.const.CONF_OPTIMISTIC_STATE: False,
+        yamaha_ynca.const.CONF_ZONE_GROUP: ["MAIN", "ZONE2"],
         "MAIN": {
             yamaha_ynca.const.CONF_SELECTED_INPUTS: ALL_PHYSICAL_INPUTS,
             yamaha_ynca.const.CONF_NUMBER_OF_SCENES: yamaha_ynca.const.NUMBER_OF_SCENES_AUTODETECT,
@@ -152,9 +157,12 @@ async def test_options_flow_navigate_all_screens(  # noqa: PLR0913
 
 
 async def test_options_flow_no_connection(hass: HomeAssistant, mock_ynca: Mock) -> None:
-    """Test optionsflow when there is no connection."""
+    """Test optionsflow when the receiver never connected, so no capabilities are known."""
     integration = await setup_integration(hass, mock_ynca)
     integration.entry.runtime_data = None  # Pretend connection failed
+    data = dict(integration.entry.data)
+    del data[yamaha_ynca.const.DATA_CAPABILITIES]
+    hass.config_entries.async_update_entry(integration.entry, data=data)
 
     result = await hass.config_entries.options.async_init(integration.entry.entry_id)
 
@@ -170,6 +178,75 @@ async def test_options_flow_no_connection(hass: HomeAssistant, mock_ynca: Mock)
     assert result["type"] == FlowResultType.CREATE_ENTRY
 
 
+async def test_options_flow_offline_uses_capabilities(
+    hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
+) -> None:
+    """Test optionsflow uses the stored capabilities when the receiver is offline."""
+    mock_zone_main.twochdecoder = ynca.TwoChDecoder.Auro3d
+    mock_zone_main.scene1name = "Scene 1"
+    mock_zone_main.scene2name = "Scene 2"
+    mock_ynca.main = mock_zone_main
+    mock_ynca.sys.inpnamehdmi4 = "_INPNAMEHDMI4_"
+
+    integration = await setup_integration(hass, mock_ynca)
+    integration.entry.runtime_data = None  # Pretend connection failed
+
+    result = await hass.config_entries.options.async_init(integration.entry.entry_id)
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "general"
+    assert (
+        yamaha_ynca.const.CONF_SELECTED_SURROUND_DECODERS
+        in result["data_schema"].schema
+    )
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES,
+            yamaha_ynca.const.CONF_SELECTED_SURROUND_DECODERS: ["auto"],
+        },
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "main"
+    schema = result["data_schema"].schema
+    inputs = next(
+        value
+        for key, value in schema.items()
+        if key == yamaha_ynca.const.CONF_SELECTED_INPUTS
+    )
+    assert inputs.options == {
+        "HDMI4": "HDMI4 (_INPNAMEHDMI4_)",
+    }
+    scenes = next(
+        value
+        for key, value in schema.items()
+        if key == yamaha_ynca.const.CONF_NUMBER_OF_SCENES
+    )
+    assert scenes.container[yamaha_ynca.const.NUMBER_OF_SCENES_AUTODETECT] == (
+        "Auto detect (2)"
+    )
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            yamaha_ynca.const.CONF_SELECTED_INPUTS: ["HDMI4"],
+            yamaha_ynca.const.CONF_NUMBER_OF_SCENES: yamaha_ynca.const.NUMBER_OF_SCENES_AUTODETECT,
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"]["MAIN"] == {
+        yamaha_ynca.const.CONF_SELECTED_INPUTS: ["HDMI4"],
+        yamaha_ynca.const.CONF_NUMBER_OF_SCENES: yamaha_ynca.const.NUMBER_OF_SCENES_AUTODETECT,
+    }
+
+    # Make sure HA finishes creating entry completely
+    # or it will result in errors when tearing down the test
+    await hass.async_block_till_done()
+
+
 async def test_options_flow_soundmodes(hass: HomeAssistant, mock_ynca: Mock) -> None:
     # Set a modelname that is in the modelinfo that does not support all SoundPrg values
     mock_ynca.sys.modelname = "RX-A810"
@@ -198,7 +275,8 @@ async def test_options_flow_soundmodes(hass: HomeAssistant, mock_ynca: Mock) ->
 
     assert result["type"] == "create_entry"
     assert result["data"] == {
-        yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ["Hall in Vienna"]
+        yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ["Hall in Vienna"],
+        yamaha_ynca.const.CONF_OPTIMISTIC_STATE: False,
     }
 
     # Make sure HA finishes creating entry completely
@@ -292,12 +370,17 @@ async def test_options_flow_zone_inputs(
     assert result["type"] == "create_entry"
     assert result["data"] == {
         yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES,
+        yamaha_ynca.const.CONF_OPTIMISTIC_STATE: False,
         "MAIN": {
             yamaha_ynca.const.CONF_SELECTED_INPUTS: ["NET RADIO"],
             yamaha_ynca.const.CONF_NUMBER_OF_SCENES: yamaha_ynca.const.NUMBER_OF_SCENES_AUTODETECT,
         },
     }
 
+    # Make sure HA finishes creating entry completely
+    # or it will result in errors when tearing down the test
+    await hass.async_block_till_done()
+
 
 async def test_options_flow_configure_nof_scenes(
     hass: HomeAssistant, mock_ynca: Mock, mock_zone_main: Mock
@@ -332,8 +415,13 @@ async def test_options_flow_configure_nof_scenes(
     assert result["type"] == "create_entry"
     assert result["data"] == {
         yamaha_ynca.const.CONF_SELECTED_SOUND_MODES: ALL_SOUND_MODES,
+        yamaha_ynca.const.CONF_OPTIMISTIC_STATE: False,
         "MAIN": {
             yamaha_ynca.const.CONF_SELECTED_INPUTS: ALL_PHYSICAL_INPUTS,
             yamaha_ynca.const.CONF_NUMBER_OF_SCENES: 8,
         },
     }
+
+    # Make sure HA finishes creating entry completely
+    # or it will result in errors when tearing down the test
+    await hass.async_block_till_done()
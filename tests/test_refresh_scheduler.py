@@ -0,0 +1,135 @@
+"""Test the Yamaha (YNCA) refresh scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from custom_components.yamaha_ynca.command_worker import YncaCommandWorker
+from custom_components.yamaha_ynca.refresh_scheduler import YncaRefreshScheduler
+import ynca
+from ynca.constants import Subunit
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+@pytest.fixture
+async def command_worker() -> AsyncGenerator[YncaCommandWorker]:
+    command_worker = YncaCommandWorker("Test")
+    command_worker.start()
+    yield command_worker
+    await command_worker.async_stop()
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts() -> None:
+    with (
+        patch("custom_components.yamaha_ynca.refresh_scheduler.REFRESH_WINDOW", 0.2),
+        patch(
+            "custom_components.yamaha_ynca.refresh_scheduler.REFRESH_BATCH_DELAY", 0.01
+        ),
+    ):
+        yield
+
+
+def report(scheduler: YncaRefreshScheduler, subunit: str, function: str) -> None:
+    scheduler.message_callback(ynca.YncaProtocolStatus.OK, subunit, function, "Off")
+
+
+def create_api(connection: Mock) -> Mock:
+    api = Mock(spec=ynca.YncaApi)
+    api.get_raw_connection.return_value = connection
+    for subunit_id in Subunit:
+        setattr(api, subunit_id.value.lower(), None)
+    api.main = Mock(spec=ynca.subunits.zone.Main, dirmode=ynca.DirMode.OFF)
+    api.zone2 = Mock(spec=ynca.subunits.zone.Zone2, dirmode=ynca.DirMode.OFF)
+    # Zone3 does not support DIRMODE
+    api.zone3 = Mock(spec=ynca.subunits.zone.Zone3, dirmode=None)
+    api.usb = Mock(
+        spec=ynca.subunits.usb.Usb, repeat=ynca.Repeat.OFF, shuffle=ynca.Shuffle.OFF
+    )
+    return api
+
+
+async def wait_for_batch() -> None:
+    await asyncio.sleep(0.05)
+
+
+async def test_refresh_on_report(command_worker: YncaCommandWorker) -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    scheduler = YncaRefreshScheduler(
+        asyncio.get_running_loop(), command_worker, create_api(connection)
+    )
+
+    # Functions without dependent functions are ignored
+    report(scheduler, "MAIN", "VOL")
+    scheduler.message_callback(
+        ynca.YncaProtocolStatus.UNDEFINED, "MAIN", "STRAIGHT", ""
+    )
+
+    # Requests of multiple zones are sent in one batch, duplicates are suppressed
+    report(scheduler, "MAIN", "STRAIGHT")
+    report(scheduler, "ZONE2", "STRAIGHT")
+    report(scheduler, "MAIN", "STRAIGHT")
+    # Only subunits that support the dependent function are requested
+    report(scheduler, "ZONE3", "STRAIGHT")
+    report(scheduler, "ZONE4", "STRAIGHT")
+    await wait_for_batch()
+
+    assert connection.get.call_args_list == [
+        call("MAIN", "DIRMODE"),
+        call("ZONE2", "DIRMODE"),
+    ]
+    assert scheduler.metrics.as_dict() == {
+        "refreshes_requested": 3,
+        "refreshes_sent": 2,
+        "refreshes_suppressed": 1,
+        "batches": 1,
+    }
+
+    # Receiver reports STRAIGHT again when DIRMODE is requested,
+    # that does not result in another request within the window
+    report(scheduler, "MAIN", "STRAIGHT")
+    await wait_for_batch()
+    assert connection.get.call_count == 2
+
+    await asyncio.sleep(0.2)
+    report(scheduler, "MAIN", "STRAIGHT")
+    await wait_for_batch()
+    assert connection.get.call_count == 3
+    assert scheduler.metrics.batches == 2
+
+
+async def test_refresh_on_write(command_worker: YncaCommandWorker) -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    scheduler = YncaRefreshScheduler(
+        asyncio.get_running_loop(), command_worker, create_api(connection)
+    )
+
+    scheduler.async_written("USB", "REPEAT")
+    scheduler.async_written("USB", "SHUFFLE")
+    # Writing functions that are reported normally does not request anything
+    scheduler.async_written("USB", "PLAYBACK")
+    await wait_for_batch()
+
+    assert connection.get.call_args_list == [
+        call("USB", "REPEAT"),
+        call("USB", "SHUFFLE"),
+    ]
+
+
+async def test_stop_drops_pending_refreshes(command_worker: YncaCommandWorker) -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    scheduler = YncaRefreshScheduler(
+        asyncio.get_running_loop(), command_worker, create_api(connection)
+    )
+
+    scheduler.async_written("USB", "REPEAT")
+    scheduler.async_stop()
+    await wait_for_batch()
+
+    connection.get.assert_not_called()
@@ -0,0 +1,107 @@
+"""Test the Yamaha (YNCA) registry index."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
+    MockConfigEntry,
+)
+
+from custom_components.yamaha_ynca.const import DOMAIN
+from custom_components.yamaha_ynca.registry_index import YncaRegistryIndex
+
+from .conftest import create_mock_config_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr
+
+
+async def test_registry_index_build(
+    hass: HomeAssistant, device_reg: dr.DeviceRegistry
+) -> None:
+    entry = create_mock_config_entry()
+    entry.add_to_hass(hass)
+    other_entry = MockConfigEntry(domain=DOMAIN, entry_id="other_entry_id")
+    other_entry.add_to_hass(hass)
+
+    device = device_reg.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, f"{entry.entry_id}_MAIN")},
+    )
+    device_reg.async_get_or_create(
+        config_entry_id=other_entry.entry_id,
+        identifiers={(DOMAIN, f"{other_entry.entry_id}_ZONE2")},
+    )
+    entity_reg = er.async_get(hass)
+    entity = entity_reg.async_get_or_create(
+        "select",
+        DOMAIN,
+        f"{entry.entry_id}_MAIN_twochdecoder",
+        config_entry=entry,
+    )
+    entity_reg.async_get_or_create(
+        "select",
+        DOMAIN,
+        f"{other_entry.entry_id}_MAIN_hdmiout",
+        config_entry=other_entry,
+    )
+
+    registry_index = YncaRegistryIndex(hass, entry.entry_id)
+    registry_index.async_build()
+
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_MAIN")) == device.id
+    assert registry_index.device_id((DOMAIN, f"{other_entry.entry_id}_ZONE2")) is None
+    assert registry_index.entity_id("MAIN_twochdecoder") == entity.entity_id
+    assert registry_index.entity_id("MAIN_hdmiout") is None
+
+
+async def test_registry_index_follows_registry_updates(
+    hass: HomeAssistant, device_reg: dr.DeviceRegistry
+) -> None:
+    entry = create_mock_config_entry()
+    entry.add_to_hass(hass)
+    entity_reg = er.async_get(hass)
+
+    registry_index = YncaRegistryIndex(hass, entry.entry_id)
+    stop = registry_index.async_start()
+
+    # Create
+    device = device_reg.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, f"{entry.entry_id}_MAIN")},
+    )
+    entity = entity_reg.async_get_or_create(
+        "select", DOMAIN, f"{entry.entry_id}_MAIN_hdmiout", config_entry=entry
+    )
+    await hass.async_block_till_done()
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_MAIN")) == device.id
+    assert registry_index.entity_id("MAIN_hdmiout") == entity.entity_id
+
+    # Update
+    device_reg.async_update_device(
+        device.id, new_identifiers={(DOMAIN, f"{entry.entry_id}_ZONE2")}
+    )
+    entity_reg.async_update_entity(entity.entity_id, new_entity_id="select.renamed")
+    await hass.async_block_till_done()
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_MAIN")) is None
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_ZONE2")) == device.id
+    assert registry_index.entity_id("MAIN_hdmiout") == "select.renamed"
+
+    # Remove
+    device_reg.async_remove_device(device.id)
+    entity_reg.async_remove("select.renamed")
+    await hass.async_block_till_done()
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_ZONE2")) is None
+    assert registry_index.entity_id("MAIN_hdmiout") is None
+
+    # No more updates after stopping
+    stop()
+    device_reg.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, f"{entry.entry_id}_MAIN")},
+    )
+    await hass.async_block_till_done()
+    assert registry_index.device_id((DOMAIN, f"{entry.entry_id}_MAIN")) is None
@@ -0,0 +1,209 @@
+"""Test the Yamaha (YNCA) scene learner."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.yamaha_ynca.scene_learner import YncaSceneLearner
+import ynca
+
+from .conftest import create_mock_zone, setup_integration
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+LEARNED_SCENES = {
+    "MAIN": {"1": {"INP": "HDMI1", "SOUNDPRG": "Hall in Munich", "VOL": "-20.5"}}
+}
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts() -> None:
+    with patch("custom_components.yamaha_ynca.scene_learner.SCENE_SETTLE_TIME", 0.05):
+        yield
+
+
+async def wait_for_settle(hass: HomeAssistant) -> None:
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+
+
+async def test_scene_learned_and_persisted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    learner = YncaSceneLearner(hass, "entry_id")
+    zone = create_mock_zone(ynca.subunits.zone.Main)
+    send = AsyncMock()
+
+    await learner.async_recall(zone, 1, send)
+    send.assert_awaited_once()
+
+    update_callback = zone.register_update_callback.call_args.args[0]
+    update_callback("INP", ynca.Input.HDMI1)
+    update_callback("SOUNDPRG", ynca.SoundPrg.HALL_IN_MUNICH)
+    update_callback("VOL", -20.5)
+    # Names are not part of a scene
+    update_callback("SCENE1NAME", "Movie")
+    await wait_for_settle(hass)
+
+    zone.unregister_update_callback.assert_called_once_with(update_callback)
+    assert learner.learned_scenes == LEARNED_SCENES
+    assert learner.metrics.recalls == 1
+
+    # Writes to storage are delayed so multiple recalls end up in one write
+    assert "yamaha_ynca.scenes.entry_id" not in hass_storage
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert hass_storage["yamaha_ynca.scenes.entry_id"]["data"] == {
+        "scenes": LEARNED_SCENES
+    }
+
+    # Receivers only report changes, so recalls add to what was learned
+    await learner.async_recall(zone, 1, send)
+    update_callback = zone.register_update_callback.call_args.args[0]
+    update_callback("STRAIGHT", ynca.Straight.OFF)
+    await wait_for_settle(hass)
+    assert learner.learned_scenes["MAIN"]["1"] == {
+        "INP": "HDMI1",
+        "SOUNDPRG": "Hall in Munich",
+        "STRAIGHT": "Off",
+        "VOL": "-20.5",
+    }
+
+
+async def test_scene_predicted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage["yamaha_ynca.scenes.entry_id"] = {
+        "version": 1,
+        "key": "yamaha_ynca.scenes.entry_id",
+        "data": {"scenes": LEARNED_SCENES},
+    }
+    learner = YncaSceneLearner(hass, "entry_id")
+    await learner.async_load()
+    zone = create_mock_zone(ynca.subunits.zone.Main)
+    zone.inp = ynca.Input.AV1
+
+    learner.async_begin_recall(zone, 1, predict=True)
+    assert learner.get_predicted_value(zone, "inp", zone.inp) is ynca.Input.HDMI1
+    assert learner.get_predicted_value(zone, "vol", None) == -20.5
+    # Other zones and functions are not predicted
+    zone2 = create_mock_zone(ynca.subunits.zone.Zone2)
+    assert learner.get_predicted_value(zone2, "inp", None) is None
+    assert learner.get_predicted_value(zone, "mute", ynca.Mute.OFF) is ynca.Mute.OFF
+
+    # Reported values replace the predictions
+    update_callback = zone.register_update_callback.call_args.args[0]
+    update_callback("INP", ynca.Input.HDMI1)
+    update_callback("SOUNDPRG", ynca.SoundPrg.SCI_FI)
+    await asyncio.sleep(0)
+    assert learner.get_predicted_value(zone, "inp", zone.inp) is ynca.Input.AV1
+    assert learner.get_predicted_value(zone, "vol", None) == -20.5
+
+    # Predictions that were not reported are dropped when the recall is done
+    await wait_for_settle(hass)
+    assert learner.get_predicted_value(zone, "vol", None) is None
+    assert learner.learned_scenes["MAIN"]["1"]["SOUNDPRG"] == "Sci-Fi"
+    assert learner.metrics.as_dict() == {
+        "recalls": 1,
+        "recalls_predicted": 1,
+        "predictions_confirmed": 1,
+        "predictions_corrected": 1,
+        "state_writes_coalesced": 0,
+    }
+
+
+async def test_scene_not_learned_when_recall_fails(hass: HomeAssistant) -> None:
+    learner = YncaSceneLearner(hass, "entry_id")
+    zone = create_mock_zone(ynca.subunits.zone.Main)
+
+    with pytest.raises(ValueError, match="Failed"):
+        await learner.async_recall(zone, 1, AsyncMock(side_effect=ValueError("Failed")))
+
+    zone.unregister_update_callback.assert_called_once()
+    await wait_for_settle(hass)
+    assert learner.learned_scenes == {}
+
+
+async def test_state_writes_coalesced_during_recall(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_ynca: Mock,
+    mock_zone_main: Mock,
+) -> None:
+    hass_storage["yamaha_ynca.scenes.entry_id"] = {
+        "version": 1,
+        "key": "yamaha_ynca.scenes.entry_id",
+        "data": {"scenes": {"MAIN": {"1": {"VOL": "-30.0"}}}},
+    }
+    mock_ynca.main = mock_zone_main
+    mock_ynca.main.pwr = ynca.Pwr.ON
+    mock_ynca.main.vol = -40.0
+    mock_ynca.main.scene1name = "Movie"
+
+    integration = await setup_integration(hass, mock_ynca)
+    learner = integration.entry.runtime_data.scene_learner
+
+    await hass.services.async_call(
+        "button",
+        "press",
+        {"entity_id": "button.modelname_main_movie"},
+        blocking=True,
+    )
+    mock_ynca.main.scene.assert_called_once_with(1)
+
+    # Receiver reports the changes of the scene
+    mock_ynca.main.vol = -20.0
+    for call in mock_ynca.main.register_update_callback.call_args_list:
+        call.args[0]("VOL", -20.0)
+    await asyncio.sleep(0)
+
+    state = hass.states.get("media_player.modelname_main")
+    assert state.attributes["volume_level"] == pytest.approx(0.4175, abs=0.001)
+    coalesced = learner.metrics.state_writes_coalesced
+    assert coalesced > 0
+
+    # Functions the scene did not change before are written immediately
+    for call in mock_ynca.main.register_update_callback.call_args_list:
+        call.args[0]("MUTE", ynca.Mute.OFF)
+    await asyncio.sleep(0)
+    assert learner.metrics.state_writes_coalesced == coalesced
+
+    # Written once the receiver is done
+    await wait_for_settle(hass)
+    state = hass.states.get("media_player.modelname_main")
+    assert state.attributes["volume_level"] == pytest.approx(0.6237, abs=0.001)
+    assert learner.learned_scenes == {"MAIN": {"1": {"MUTE": "Off", "VOL": "-20.0"}}}
+
+
+async def test_defer_update_only_for_expected_functions(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage["yamaha_ynca.scenes.entry_id"] = {
+        "version": 1,
+        "key": "yamaha_ynca.scenes.entry_id",
+        "data": {"scenes": LEARNED_SCENES},
+    }
+    learner = YncaSceneLearner(hass, "entry_id")
+    await learner.async_load()
+    zone = create_mock_zone(ynca.subunits.zone.Main)
+    entity = Mock(device_info={"identifiers": {("yamaha_ynca", "entry_id_MAIN")}})
+
+    learner.async_begin_recall(zone, 1)
+    assert learner.defer_update(entity, "MUTE") is False
+
+    # Deferring from the reader thread is handed to the event loop
+    loop = asyncio.get_running_loop()
+    assert await loop.run_in_executor(None, learner.defer_update, entity, "VOL")
+    await asyncio.sleep(0)
+    assert learner.metrics.state_writes_coalesced == 1
+
+    await wait_for_settle(hass)
+    entity.async_write_ha_state.assert_called_once()
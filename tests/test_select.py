@@ -9,11 +9,13 @@ from custom_components import yamaha_ynca
 from custom_components.yamaha_ynca.const import CONF_SELECTED_SURROUND_DECODERS
 from custom_components.yamaha_ynca.select import (
     ENTITY_DESCRIPTIONS,
+    SURROUND_DECODER_SLUG_TABLE,
     YamahaYncaSelect,
     YamahaYncaSelectInitialVolumeMode,
     YamahaYncaSelectSurroundDecoder,
     YncaSelectEntityDescription,
     async_setup_entry,
+    get_slug_table,
 )
 from tests.conftest import setup_integration
 import ynca
@@ -64,6 +66,34 @@ async def test_async_setup_entry(
     assert len(entities) == 5
 
 
+def test_slug_table() -> None:
+    slug_table = get_slug_table(ynca.HdmiOut)
+    assert get_slug_table(ynca.HdmiOut) is slug_table
+
+    assert slug_table.to_slug[ynca.HdmiOut.OUT1_PLUS_2] == "out1_2"
+    assert slug_table.from_slug["out1_2"] is ynca.HdmiOut.OUT1_PLUS_2
+    assert "unknown" not in slug_table.options
+    assert slug_table.options == [
+        slug_table.to_slug[member]
+        for member in ynca.HdmiOut
+        if member is not ynca.HdmiOut.UNKNOWN
+    ]
+
+
+def test_surround_decoder_slug_table() -> None:
+    # All ProLogic II variants are shown as the standard version
+    for member in [
+        ynca.TwoChDecoder.DolbyPl2xMovie,
+        ynca.TwoChDecoder.DolbyProLogicII_Movie,
+        ynca.TwoChDecoder.DolbyPl2Movie,
+    ]:
+        assert SURROUND_DECODER_SLUG_TABLE.to_slug[member] == "dolby_plii_movie"
+    assert (
+        SURROUND_DECODER_SLUG_TABLE.from_slug["dolby_plii_movie"]
+        is ynca.TwoChDecoder.DolbyPl2Movie
+    )
+
+
 async def test_select_entity_fields(
     mock_zone: ZoneBase,
     mock_config_entry: MockConfigEntry,
@@ -347,3 +377,26 @@ async def test_hdmiout_supported_but_with_two_hdmi_outputs(
 
     hdmiout = hass.states.get("select.modelname_main_hdmi_out")
     assert hdmiout is not None
+
+
+async def test_select_surrounddecoder_options_applied_without_reload(
+    hass: HomeAssistant, mock_ynca: ynca.YncaApi, mock_zone_main: ZoneBase
+) -> None:
+    mock_ynca.main = mock_zone_main
+    mock_ynca.main.pwr = ynca.Pwr.ON
+    mock_ynca.main.twochdecoder = ynca.TwoChDecoder.Auto
+
+    integration = await setup_integration(hass, mock_ynca)
+    entity_id = "select.modelname_main_surround_decoder"
+    assert len(hass.states.get(entity_id).attributes["options"]) == 10
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={CONF_SELECTED_SURROUND_DECODERS: ["dts_neural_x", "auto"]},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).attributes["options"] == [
+        "auto",
+        "dts_neural_x",
+    ]
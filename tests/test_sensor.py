@@ -82,3 +82,29 @@ async def test_sensor_supported(
     await hass.async_block_till_done()
     source = hass.states.get("sensor.modelname_main_source")
     assert source.state == "AUDIO1"
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_sensor_input_options_applied_without_reload(
+    hass: HomeAssistant, mock_ynca: ynca.YncaApi, mock_zone_main: ZoneBase
+) -> None:
+    mock_ynca.main = mock_zone_main
+    mock_ynca.main.inp = ynca.Input.HDMI1
+    mock_ynca.sys.inpnamehdmi1 = "HDMI One"
+    mock_ynca.sys.inpnamehdmi2 = "HDMI Two"
+
+    integration = await setup_integration(hass, mock_ynca)
+    entity_id = "sensor.modelname_main_source"
+    assert hass.states.get(entity_id).attributes["options"] == [
+        "HDMI One",
+        "HDMI Two",
+        "Main Zone Sync",
+    ]
+
+    hass.config_entries.async_update_entry(
+        integration.entry,
+        options={"MAIN": {yamaha_ynca.const.CONF_SELECTED_INPUTS: ["HDMI1"]}},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).attributes["options"] == ["HDMI One"]
@@ -7,13 +7,20 @@ from unittest.mock import call
 
 from homeassistant.exceptions import ServiceValidationError
 import pytest
+import voluptuous as vol
 
 from custom_components import yamaha_ynca
-from custom_components.yamaha_ynca.services import SERVICE_SEND_RAW_YNCA
+from custom_components.yamaha_ynca.services import (
+    SERVICE_BROADCAST,
+    SERVICE_SEND_RAW_YNCA,
+)
+import ynca
 
 from .conftest import setup_integration
 
 if TYPE_CHECKING:
+    from unittest.mock import Mock
+
     from homeassistant.core import HomeAssistant
 
     from ynca import YncaApi
@@ -57,3 +64,146 @@ async def test_service_raw_ynca_invalid_config_entry_id(
         )
 
     await hass.async_block_till_done()
+
+
+async def test_service_broadcast(
+    hass: HomeAssistant,
+    mock_ynca: YncaApi,
+    mock_zone_main: Mock,
+    mock_zone_zone2: Mock,
+) -> None:
+    mock_ynca.main = mock_zone_main
+    mock_ynca.zone2 = mock_zone_zone2
+    mock_zone_main.pwr = ynca.Pwr.ON
+    mock_zone_zone2.pwr = ynca.Pwr.ON
+    integration = await setup_integration(hass, mock_ynca)
+
+    response = await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"power": "Standby"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert mock_zone_main.pwr is ynca.Pwr.STANDBY
+    assert mock_zone_zone2.pwr is ynca.Pwr.STANDBY
+    result = response["receivers"][integration.entry.entry_id]
+    assert result["title"] == integration.entry.title
+    assert result["success"] is True
+    assert result["duration"] >= 0
+    assert response["duration"] >= 0
+
+    # Selected zones only
+    await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {
+            "config_entry_id": [integration.entry.entry_id],
+            "zones": ["zone2"],
+            "volume": -20,
+        },
+        blocking=True,
+    )
+    assert mock_zone_zone2.vol == -20
+    assert mock_zone_main.vol != -20
+
+    # Volume is rounded to the 0.5 dB steps of the receiver
+    await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"zones": ["zone2"], "volume": -20.3},
+        blocking=True,
+    )
+    assert mock_zone_zone2.vol == -20.5
+
+    await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"input": "HDMI2"},
+        blocking=True,
+    )
+    assert mock_zone_main.inp is ynca.Input.HDMI2
+    assert mock_zone_zone2.inp is ynca.Input.HDMI2
+
+    await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"raw_data": "@MAIN:PWR=On\n@ZONE2:PWR=On"},
+        blocking=True,
+    )
+    mock_ynca.send_raw.assert_has_calls([call("@MAIN:PWR=On"), call("@ZONE2:PWR=On")])
+
+
+async def test_service_broadcast_failure(
+    hass: HomeAssistant, mock_ynca: YncaApi, mock_zone_main: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main
+    mock_zone_main.scene.side_effect = Exception("Failed")
+    integration = await setup_integration(hass, mock_ynca)
+
+    response = await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"scene": 3},
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_zone_main.scene.assert_called_once_with(3)
+    result = response["receivers"][integration.entry.entry_id]
+    assert result["success"] is False
+    assert result["error"] == "Failed"
+
+
+async def test_service_broadcast_no_zones(
+    hass: HomeAssistant, mock_ynca: YncaApi, mock_zone_main: Mock
+) -> None:
+    mock_ynca.main = mock_zone_main
+    integration = await setup_integration(hass, mock_ynca)
+
+    response = await hass.services.async_call(
+        yamaha_ynca.DOMAIN,
+        SERVICE_BROADCAST,
+        {"zones": ["zone2"], "power": "On"},
+        blocking=True,
+        return_response=True,
+    )
+
+    result = response["receivers"][integration.entry.entry_id]
+    assert result["success"] is False
+    assert result["error"] == "Receiver has none of the zones to broadcast to"
+
+
+@pytest.mark.parametrize(
+    "service_data",
+    [
+        {},
+        {"power": "On", "volume": -20},
+        {"scene": 13},
+        {"input": "Does not exist"},
+    ],
+)
+async def test_service_broadcast_invalid_action(
+    hass: HomeAssistant, mock_ynca: YncaApi, service_data: dict
+) -> None:
+    await setup_integration(hass, mock_ynca)
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            yamaha_ynca.DOMAIN, SERVICE_BROADCAST, service_data, blocking=True
+        )
+
+
+async def test_service_broadcast_invalid_config_entry_id(
+    hass: HomeAssistant, mock_ynca: YncaApi
+) -> None:
+    await setup_integration(hass, mock_ynca)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            yamaha_ynca.DOMAIN,
+            SERVICE_BROADCAST,
+            {"config_entry_id": ["does_not_exist"], "power": "On"},
+            blocking=True,
+        )
@@ -0,0 +1,163 @@
+"""Test the asyncio transport for network connected receivers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+from homeassistant.config_entries import ConfigEntryState
+import pytest
+
+from custom_components import yamaha_ynca
+from custom_components.yamaha_ynca.transport import (
+    YncaSocketApi,
+    YncaSocketConnection,
+    is_socket_url,
+)
+import ynca
+
+from .conftest import create_mock_config_entry
+from .ynca_simulator import YncaSimulator
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+def test_is_socket_url() -> None:
+    assert is_socket_url("socket://1.2.3.4:50000")
+    assert is_socket_url("socket://receiver.local:50000")
+    assert not is_socket_url("/dev/ttyUSB0")
+    assert not is_socket_url("rfc2217://1.2.3.4:50000")
+
+
+async def test_connection_messages_on_event_loop(simulator: YncaSimulator) -> None:
+    loop = asyncio.get_running_loop()
+    connection = YncaSocketConnection(simulator.serial_url, loop)
+    await loop.run_in_executor(None, connection.connect)
+    assert connection.connected
+
+    received: list[tuple[str | None, str | None, str | None]] = []
+    threads: set[int] = set()
+    done = asyncio.Event()
+
+    def message_callback(
+        _status: ynca.YncaProtocolStatus,
+        subunit: str | None,
+        function_: str | None,
+        value: str | None,
+    ) -> None:
+        threads.add(threading.get_ident())
+        received.append((subunit, function_, value))
+        if function_ == "VOL":
+            done.set()
+
+    connection.register_message_callback(message_callback)
+
+    # Commands can be sent from any thread
+    await loop.run_in_executor(None, connection.put, "MAIN", "PWR", "On")
+    connection.get("MAIN", "VOL")
+    async with asyncio.timeout(2):
+        await done.wait()
+
+    assert ("MAIN", "PWR", "On") in received
+    assert ("MAIN", "VOL", "-40.0") in received
+    # Keep-alive responses are filtered
+    assert ("SYS", "MODELNAME", "RX-A810") not in received
+    assert threads == {threading.get_ident()}
+    assert connection.num_commands_sent == 2
+    # Communication log is disabled by default
+    assert connection.get_communication_log_items() == []
+
+    connection.close()
+    await asyncio.sleep(0.01)
+    assert not connection.connected
+
+
+async def test_connection_connect_failed(socket_enabled: None) -> None:  # noqa: ARG001
+    loop = asyncio.get_running_loop()
+    simulator = YncaSimulator()
+    await simulator.start()
+    serial_url = simulator.serial_url
+    await simulator.stop()
+
+    connection = YncaSocketConnection(serial_url, loop)
+    with pytest.raises(ynca.YncaConnectionError):
+        await loop.run_in_executor(None, connection.connect)
+
+
+async def test_connection_not_from_event_loop(simulator: YncaSimulator) -> None:
+    connection = YncaSocketConnection(simulator.serial_url, asyncio.get_running_loop())
+    with pytest.raises(RuntimeError):
+        connection.connect()
+
+
+async def test_connection_disconnect_callback(simulator: YncaSimulator) -> None:
+    loop = asyncio.get_running_loop()
+    disconnected = asyncio.Event()
+    connection = YncaSocketConnection(simulator.serial_url, loop)
+    await loop.run_in_executor(None, connection.connect, disconnected.set)
+
+    await simulator.disconnect_clients()
+    async with asyncio.timeout(2):
+        await disconnected.wait()
+    assert not connection.connected
+
+    # No callback on explicit close
+    disconnect_callback = Mock()
+    connection = YncaSocketConnection(simulator.serial_url, loop)
+    await loop.run_in_executor(None, connection.connect, disconnect_callback)
+    connection.close()
+    await asyncio.sleep(0.01)
+    disconnect_callback.assert_not_called()
+
+
+async def test_api_initialize(simulator: YncaSimulator) -> None:
+    loop = asyncio.get_running_loop()
+    api = YncaSocketApi(simulator.serial_url, loop=loop)
+    await loop.run_in_executor(None, api.initialize)
+
+    try:
+        assert api.sys.modelname == "RX-A810"
+        assert api.main.pwr is ynca.Pwr.STANDBY
+        assert api.zone4 is not None
+        assert api.netradio.song == "Song"
+
+        updates: list[tuple[str, Any, int]] = []
+        api.main.register_update_callback(
+            lambda function, value: updates.append(
+                (function, value, threading.get_ident())
+            )
+        )
+        simulator.broadcast("MAIN", "VOL", "-20.0")
+        await asyncio.sleep(0.05)
+        assert updates == [("VOL", -20.0, threading.get_ident())]
+    finally:
+        await loop.run_in_executor(None, api.close)
+        await asyncio.sleep(0.01)
+
+
+async def test_setup_entry_uses_socket_transport(
+    hass: HomeAssistant, simulator: YncaSimulator
+) -> None:
+    entry = create_mock_config_entry(
+        modelname="RX-A810",
+        zones=["MAIN", "ZONE2", "ZONE3", "ZONE4"],
+        serial_url=simulator.serial_url,
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    assert isinstance(entry.runtime_data.api, YncaSocketApi)
+
+    simulator.broadcast("MAIN", "PWR", "On")
+    await asyncio.sleep(0.05)
+    assert hass.states.get("media_player.rx_a810_main").state == "on"
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert yamaha_ynca.DOMAIN in hass.config.components
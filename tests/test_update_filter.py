@@ -0,0 +1,99 @@
+"""Test the Yamaha (YNCA) update filter."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import Mock
+
+from custom_components.yamaha_ynca.update_filter import YncaUpdateFilter
+import ynca
+from ynca.constants import Subunit
+
+
+def create_api(connection: Mock) -> Mock:
+    api = Mock(spec=ynca.YncaApi)
+    for subunit_id in Subunit:
+        setattr(api, subunit_id.value.lower(), None)
+    api.main = ynca.subunits.zone.Main(connection)
+    # Skip initialization, it needs a receiver
+    api.main._initialized = True  # noqa: SLF001
+    return api
+
+
+async def test_unchanged_updates_suppressed() -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    api = create_api(connection)
+    update_filter = YncaUpdateFilter(asyncio.get_running_loop(), connection)
+    update_filter.attach(api)
+
+    # Filter takes over the registration of the subunit
+    connection.unregister_message_callback.assert_called_once_with(
+        api.main._protocol_message_received  # noqa: SLF001
+    )
+    connection.register_message_callback.assert_called_with(
+        update_filter.message_callback
+    )
+
+    update_callback = Mock()
+    api.main.register_update_callback(update_callback)
+
+    update_filter.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "VOL", "-20.0")
+    update_callback.assert_called_once_with("VOL", -20.0)
+    assert api.main.vol == -20.0
+
+    # Replies to refreshes and keep-alives with the same value do not reach the entities
+    update_callback.reset_mock()
+    update_filter.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "VOL", "-20.0")
+    await asyncio.sleep(0)
+    update_callback.assert_not_called()
+
+    update_filter.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "MUTE", "Off")
+    update_filter.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "VOL", "-19.5")
+    await asyncio.sleep(0)
+    assert update_callback.call_count == 2
+    assert api.main.vol == -19.5
+
+    # Subunits that are not available and errors are ignored
+    update_filter.message_callback(ynca.YncaProtocolStatus.OK, "ZONE2", "VOL", "-20.0")
+    update_filter.message_callback(ynca.YncaProtocolStatus.UNDEFINED, None, None, None)
+    await asyncio.sleep(0)
+
+    metrics = update_filter.metrics.as_dict()
+    assert metrics["updates_received"] == 4
+    assert metrics["updates_dispatched"] == 3
+    assert metrics["updates_suppressed"] == 1
+    # Messages on the event loop are dispatched directly, without a handoff
+    assert metrics["batches"] == 0
+
+
+async def test_updates_handed_off_in_batches() -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    api = create_api(connection)
+    update_filter = YncaUpdateFilter(asyncio.get_running_loop(), connection)
+    update_filter.attach(api)
+
+    update_thread_ids = set()
+
+    def update_callback(_function_name: str, _value: object) -> None:
+        update_thread_ids.add(threading.get_ident())
+
+    api.main.register_update_callback(update_callback)
+
+    # A burst of messages on the reader thread wakes up the loop once
+    def reader() -> None:
+        for volume in range(-30, -20):
+            update_filter.message_callback(
+                ynca.YncaProtocolStatus.OK, "MAIN", "VOL", f"{volume}.0"
+            )
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    thread.join()
+    await asyncio.sleep(0)
+
+    assert api.main.vol == -21.0
+    assert update_thread_ids == {threading.get_ident()}
+    assert update_filter.metrics.batches == 1
+    assert update_filter.metrics.max_batch_size == 10
+    assert update_filter.metrics.max_handoff_latency > 0
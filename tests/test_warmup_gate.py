@@ -0,0 +1,180 @@
+"""Test the Yamaha (YNCA) warmup gate."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.yamaha_ynca.command_worker import YncaCommandWorker
+from custom_components.yamaha_ynca.warmup_gate import YncaWarmupGate
+import ynca
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+@pytest.fixture
+async def command_worker() -> AsyncGenerator[YncaCommandWorker]:
+    command_worker = YncaCommandWorker("Test")
+    command_worker.start()
+    yield command_worker
+    await command_worker.async_stop()
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts() -> None:
+    with (
+        patch("custom_components.yamaha_ynca.warmup_gate.WARMUP_TIMEOUT", 0.5),
+        patch("custom_components.yamaha_ynca.warmup_gate.READY_PROBE_TIMEOUT", 0.05),
+        patch("custom_components.yamaha_ynca.warmup_gate.READY_PROBE_INTERVAL", 0),
+    ):
+        yield
+
+
+def create_gate(
+    command_worker: YncaCommandWorker, avail_replies: list[str]
+) -> tuple[YncaWarmupGate, Mock]:
+    connection = Mock(spec=ynca.YncaConnection)
+    gate = YncaWarmupGate(asyncio.get_running_loop(), command_worker, connection)
+
+    def get(subunit: str, function_: str) -> None:
+        if avail_replies:
+            gate.message_callback(
+                ynca.YncaProtocolStatus.OK, subunit, function_, avail_replies.pop(0)
+            )
+
+    connection.get.side_effect = get
+    return gate, connection
+
+
+def report_power_on(gate: YncaWarmupGate) -> None:
+    gate.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "PWR", "On")
+
+
+async def test_not_warming_up(command_worker: YncaCommandWorker) -> None:
+    gate, _ = create_gate(command_worker, [])
+
+    async def command() -> str:
+        return "result"
+
+    assert not gate.is_warming_up("MAIN")
+    assert await gate.async_run("MAIN", command) == "result"
+    assert gate.metrics.commands_held == 0
+
+
+async def test_commands_held_until_ready(command_worker: YncaCommandWorker) -> None:
+    gate, connection = create_gate(command_worker, ["Not Ready", "Ready"])
+    subunit = Mock(id="MAIN")
+    executed = []
+
+    def command(name: str):  # noqa: ANN202
+        async def run() -> str:
+            executed.append(name)
+            return name
+
+        return run
+
+    gate.async_begin("MAIN", subunit, "PWR")
+    assert gate.is_warming_up("MAIN")
+
+    held = [
+        asyncio.ensure_future(gate.async_run("MAIN", command("vol1"), key="vol")),
+        asyncio.ensure_future(gate.async_run("MAIN", command("inp"), key="inp")),
+        asyncio.ensure_future(gate.async_run("MAIN", command("scene"))),
+        asyncio.ensure_future(gate.async_run("MAIN", command("vol2"), key="vol")),
+        asyncio.ensure_future(gate.async_run("ZONE2", command("zone2"))),
+    ]
+    await asyncio.sleep(0.01)
+
+    # Other zones are not held
+    assert executed == ["zone2"]
+
+    # Standby from an earlier command does not end the warmup
+    gate.message_callback(ynca.YncaProtocolStatus.OK, "MAIN", "PWR", "Standby")
+    await asyncio.sleep(0.01)
+    assert executed == ["zone2"]
+    connection.get.assert_not_called()
+
+    # Power on is reported, but zone is not ready yet on first probe
+    report_power_on(gate)
+    results = await asyncio.gather(*held)
+
+    # Held writes to the same function are collapsed into the last one
+    assert executed == ["zone2", "inp", "scene", "vol2"]
+    assert results == ["vol2", "inp", "scene", "vol2", "zone2"]
+    assert connection.get.call_count == 2
+    assert not gate.is_warming_up("MAIN")
+    assert gate.metrics.as_dict() == {
+        "warmups": 1,
+        "warmups_timed_out": 0,
+        "commands_held": 4,
+        "commands_collapsed": 1,
+    }
+
+
+async def test_commands_released_on_timeout(command_worker: YncaCommandWorker) -> None:
+    gate, _ = create_gate(command_worker, [])
+
+    async def command() -> None:
+        msg = "Failed"
+        raise ValueError(msg)
+
+    gate.async_begin("MAIN", Mock(id="MAIN"), "PWR")
+
+    # Exceptions are passed to the caller of the held command
+    with pytest.raises(ValueError, match="Failed"):
+        await gate.async_run("MAIN", command)
+
+    assert gate.metrics.warmups_timed_out == 1
+    assert not gate.is_warming_up("MAIN")
+
+
+async def test_commands_released_on_abort(command_worker: YncaCommandWorker) -> None:
+    gate, connection = create_gate(command_worker, [])
+
+    async def command() -> str:
+        return "result"
+
+    gate.async_begin("MAIN", Mock(id="MAIN"), "PWR")
+    held = asyncio.ensure_future(gate.async_run("MAIN", command))
+    await asyncio.sleep(0)
+
+    gate.async_abort("MAIN")
+    assert await held == "result"
+    assert not gate.is_warming_up("MAIN")
+    assert gate.metrics.warmups_timed_out == 0
+    connection.get.assert_not_called()
+
+
+async def test_stop(command_worker: YncaCommandWorker) -> None:
+    gate, connection = create_gate(command_worker, [])
+    executed = []
+
+    async def command() -> None:
+        executed.append("command")
+
+    gate.async_begin("MAIN", Mock(id="MAIN"), "PWR")
+    held = asyncio.ensure_future(gate.async_run("MAIN", command))
+    await asyncio.sleep(0)
+
+    # Connection is going away, held commands are not run
+    gate.async_stop()
+    with pytest.raises(asyncio.CancelledError):
+        await held
+    assert executed == []
+    assert not gate.is_warming_up("MAIN")
+    connection.get.assert_not_called()
+
+
+async def test_wait_ready(command_worker: YncaCommandWorker) -> None:
+    gate, connection = create_gate(command_worker, ["Ready"])
+
+    await gate.async_wait_ready(Mock(id="TUN"))
+    connection.get.assert_called_once_with("TUN", "AVAIL")
+
+    # No reply, gives up after timeout
+    await gate.async_wait_ready(Mock(id="TUN"))
+    assert gate.metrics.warmups_timed_out == 1
@@ -0,0 +1,272 @@
+"""Test the Yamaha (YNCA) acknowledged writes."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock, patch
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.yamaha_ynca.command_worker import YncaCommandWorker
+from custom_components.yamaha_ynca.write_acknowledger import (
+    YncaWriteAcknowledger,
+    _get_function_name,
+)
+import ynca
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+class FakeSubunit:
+    """Subunit like ynca, written values only show up when the receiver reports them."""
+
+    id = "MAIN"
+
+    def __init__(self, id_: str = "MAIN") -> None:
+        self.id = id_
+        self.writes: list[Any] = []
+        self._vol: float | None = -40.0
+
+    @property
+    def vol(self) -> float | None:
+        return self._vol
+
+    @vol.setter
+    def vol(self, value: float) -> None:
+        self.writes.append(value)
+
+
+@pytest.fixture
+async def command_worker() -> AsyncGenerator[YncaCommandWorker]:
+    command_worker = YncaCommandWorker("Test")
+    command_worker.start()
+    yield command_worker
+    await command_worker.async_stop()
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts() -> None:
+    with (
+        patch(
+            "custom_components.yamaha_ynca.write_acknowledger.WRITE_ACK_TIMEOUT", 0.05
+        ),
+        patch(
+            "custom_components.yamaha_ynca.write_acknowledger.WRITE_RETRY_BACKOFF", 0
+        ),
+    ):
+        yield
+
+
+def report(
+    acknowledger: YncaWriteAcknowledger, function: str, subunit: str = "MAIN"
+) -> None:
+    acknowledger.message_callback(
+        ynca.YncaProtocolStatus.OK, subunit, function, "-20.0"
+    )
+
+
+async def test_write_acknowledged(command_worker: YncaCommandWorker) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    subunit = FakeSubunit()
+
+    write = asyncio.ensure_future(acknowledger.async_write(subunit, "vol", -20.0))
+    await asyncio.sleep(0.01)
+    report(acknowledger, "VOL")
+    await write
+
+    assert subunit.writes == [-20.0]
+    assert acknowledger.metrics.as_dict() == {
+        "writes": 1,
+        "writes_acknowledged": 1,
+        "writes_failed": 0,
+        "write_retries": 0,
+        "writes_rolled_back": 0,
+    }
+
+
+async def test_write_unchanged_value_acknowledged(
+    command_worker: YncaCommandWorker,
+) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    subunit = FakeSubunit()
+
+    # Receiver does not report values that did not change
+    await acknowledger.async_write(subunit, "vol", -40.0)
+    assert subunit.writes == [-40.0]
+    assert acknowledger.metrics.writes_acknowledged == 1
+
+
+async def test_write_retried(command_worker: YncaCommandWorker) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    subunit = FakeSubunit()
+
+    write = asyncio.ensure_future(acknowledger.async_write(subunit, "vol", -20.0))
+    # Other functions do not acknowledge the write
+    await asyncio.sleep(0.01)
+    report(acknowledger, "MUTE")
+    await asyncio.sleep(0.06)
+    report(acknowledger, "VOL")
+    await write
+
+    assert subunit.writes == [-20.0, -20.0]
+    assert acknowledger.metrics.write_retries == 1
+    assert acknowledger.metrics.writes_acknowledged == 1
+
+
+async def test_write_not_acknowledged(command_worker: YncaCommandWorker) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    subunit = FakeSubunit()
+
+    with pytest.raises(HomeAssistantError, match="did not acknowledge VOL"):
+        await acknowledger.async_write(subunit, "vol", -20.0)
+
+    assert subunit.writes == [-20.0, -20.0, -20.0]
+    assert acknowledger.metrics.as_dict() == {
+        "writes": 1,
+        "writes_acknowledged": 0,
+        "writes_failed": 1,
+        "write_retries": 2,
+        "writes_rolled_back": 0,
+    }
+
+    # Reports after giving up are ignored
+    report(acknowledger, "VOL")
+
+
+async def test_optimistic_write(command_worker: YncaCommandWorker) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    subunit = FakeSubunit()
+    on_optimistic_update = Mock()
+
+    write = asyncio.ensure_future(
+        acknowledger.async_write(subunit, "vol", -20.0, on_optimistic_update)
+    )
+    await asyncio.sleep(0.01)
+
+    # Written value is shown until the receiver acknowledges it
+    on_optimistic_update.assert_called_once()
+    assert acknowledger.get_optimistic_value(subunit, "vol", subunit.vol) == -20.0
+    assert [
+        pending_write.as_dict()["value"]
+        for pending_write in acknowledger.pending_writes
+    ] == ["-20.0"]
+
+    report(acknowledger, "VOL")
+    await write
+
+    assert on_optimistic_update.call_count == 2
+    assert acknowledger.get_optimistic_value(subunit, "vol", subunit.vol) == -40.0
+    assert acknowledger.pending_writes == []
+
+
+async def test_optimistic_write_rolled_back(
+    command_worker: YncaCommandWorker,
+) -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, connection
+    )
+    subunit = FakeSubunit()
+    on_optimistic_update = Mock()
+
+    with pytest.raises(HomeAssistantError):
+        await acknowledger.async_write(subunit, "vol", -20.0, on_optimistic_update)
+
+    # Rolled back to the value of the receiver and requested again
+    assert on_optimistic_update.call_count == 2
+    assert acknowledger.get_optimistic_value(subunit, "vol", subunit.vol) == -40.0
+    assert acknowledger.metrics.writes_rolled_back == 1
+    connection.get.assert_called_once_with("MAIN", "VOL")
+
+
+async def test_write_batch(command_worker: YncaCommandWorker) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    main = FakeSubunit()
+    zone2 = FakeSubunit("ZONE2")
+
+    with patch.object(
+        command_worker, "async_run", wraps=command_worker.async_run
+    ) as async_run:
+        write = asyncio.ensure_future(
+            acknowledger.async_write_batch(
+                [(main, "vol", -20.0), (zone2, "vol", -30.0)]
+            )
+        )
+        await asyncio.sleep(0.01)
+        report(acknowledger, "VOL", "MAIN")
+        report(acknowledger, "VOL", "ZONE2")
+        await write
+
+    # All values are written in one command
+    assert async_run.call_count == 1
+    assert main.writes == [-20.0]
+    assert zone2.writes == [-30.0]
+    assert acknowledger.metrics.writes == 2
+    assert acknowledger.metrics.writes_acknowledged == 2
+
+
+async def test_write_batch_retried_per_write(
+    command_worker: YncaCommandWorker,
+) -> None:
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, Mock(spec=ynca.YncaConnection)
+    )
+    main = FakeSubunit()
+    zone2 = FakeSubunit("ZONE2")
+
+    write = asyncio.ensure_future(
+        acknowledger.async_write_batch([(main, "vol", -20.0), (zone2, "vol", -30.0)])
+    )
+    await asyncio.sleep(0.01)
+    report(acknowledger, "VOL", "MAIN")
+
+    with pytest.raises(HomeAssistantError, match="did not acknowledge VOL for ZONE2"):
+        await write
+
+    assert main.writes == [-20.0]
+    assert zone2.writes == [-30.0, -30.0, -30.0]
+    assert acknowledger.metrics.writes_failed == 1
+    assert acknowledger.pending_writes == []
+
+
+@pytest.mark.parametrize(
+    ("attribute", "function"), [("vol", "VOL"), ("zonebvol", "ZONEBVOL")]
+)
+async def test_write_rounded_to_current_value_acknowledged(
+    command_worker: YncaCommandWorker, attribute: str, function: str
+) -> None:
+    connection = Mock(spec=ynca.YncaConnection)
+    acknowledger = YncaWriteAcknowledger(
+        asyncio.get_running_loop(), command_worker, connection
+    )
+    main = ynca.subunits.zone.Main(connection)
+    main.function_handlers[function].update("-40.0")
+
+    # Volumes are sent in 0.5 dB steps, the receiver does not report the unchanged value
+    await acknowledger.async_write(main, attribute, -40.1)
+
+    connection.put.assert_called_once_with("MAIN", function, "-40.0")
+    assert acknowledger.metrics.writes_acknowledged == 1
+    assert acknowledger.metrics.write_retries == 0
+
+
+def test_get_function_name() -> None:
+    main = object.__new__(ynca.subunits.zone.Main)
+    assert _get_function_name(main, "twochdecoder") == "2CHDECODER"
+    assert _get_function_name(main, "pwr") == "PWR"
+    assert _get_function_name(FakeSubunit(), "vol") == "VOL"
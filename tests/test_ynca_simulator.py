@@ -0,0 +1,77 @@
+"""Tests for the YNCA receiver simulator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import ynca
+
+from .ynca_simulator import YncaSimulator, YncaSimulatorConfig
+
+
+async def test_connection_check(simulator: YncaSimulator) -> None:
+    api = ynca.YncaApi(simulator.serial_url)
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, api.connection_check
+    )
+
+    assert result.modelname == "RX-A810"
+    assert result.zones == ["MAIN", "ZONE2", "ZONE3", "ZONE4"]
+
+
+@pytest.mark.usefixtures("no_command_spacing")
+async def test_initialize(simulator: YncaSimulator) -> None:
+    api = ynca.YncaApi(simulator.serial_url)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, api.initialize)
+
+    try:
+        assert api.sys.modelname == "RX-A810"
+        assert api.sys.inpnamehdmi1 == "Blu-ray"
+        assert api.main.pwr is ynca.Pwr.STANDBY
+        assert api.main.vol == -40.0
+        assert api.main.scene1name == "Scene 1"
+        assert api.zone4.zonename == "Zone4"
+        assert api.netradio.song == "Song"
+        assert api.tun.band is ynca.BandTun.FM
+        assert api.bt is not None
+        assert api.deezer is None
+    finally:
+        await loop.run_in_executor(None, api.close)
+
+
+async def test_handle_line() -> None:
+    simulator = YncaSimulator(YncaSimulatorConfig(zones=["MAIN"], scenenames={}))
+
+    assert simulator.handle_line("@MAIN:VOL=?") == ["@MAIN:VOL=-40.0"]
+    assert simulator.handle_line("@MAIN:VOL=Up 2 dB") == ["@MAIN:VOL=-38.0"]
+    assert simulator.handle_line("@MAIN:VOL=Down") == ["@MAIN:VOL=-38.5"]
+    assert simulator.handle_line("@MAIN:PWR=On") == ["@MAIN:PWR=On"]
+    assert simulator.handle_line("@MAIN:PWR=On") == []
+    assert simulator.handle_line("@MAIN:SCENENAME=?") == ["@UNDEFINED"]
+    assert simulator.handle_line("@MAIN:UNKNOWN=?") == ["@UNDEFINED"]
+    assert simulator.handle_line("@ZONE2:PWR=?") == ["@UNDEFINED"]
+    assert simulator.handle_line("garbage") == ["@UNDEFINED"]
+    assert simulator.handle_line("@MAIN:BASIC=?") == [
+        "@MAIN:PWR=On",
+        "@MAIN:VOL=-38.5",
+        "@MAIN:MUTE=Off",
+        "@MAIN:INP=HDMI1",
+        "@MAIN:STRAIGHT=Off",
+        "@MAIN:SOUNDPRG=Standard",
+        "@MAIN:DIRMODE=Off",
+    ]
+
+
+async def test_metadata_push(socket_enabled: None) -> None:  # noqa: ARG001
+    config = YncaSimulatorConfig(
+        input_subunits=["NETRADIO"], metadata_push_interval=0.01
+    )
+    async with YncaSimulator(config) as simulator:
+        reader, writer = await asyncio.open_connection("127.0.0.1", simulator.port)
+        line = await asyncio.wait_for(reader.readline(), 1)
+        assert line == b"@NETRADIO:ELAPSEDTIME=0:01\r\n"
+        writer.close()
+        await writer.wait_closed()
@@ -0,0 +1,356 @@
+"""Local TCP YNCA receiver simulator.
+
+Speaks enough YNCA for `ynca.YncaApi("socket://127.0.0.1:PORT")` to initialize
+against it, so tests and benchmarks can exercise the real transport and threading
+instead of mocking at the `YncaApi` level.
+
+It can also be started standalone, e.g. `python -m tests.ynca_simulator --port 50000`
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+import logging
+import re
+from typing import Self
+
+_LOGGER = logging.getLogger(__name__)
+
+RESTRICTED = "@RESTRICTED"
+UNDEFINED = "@UNDEFINED"
+
+ZONE_SUBUNITS = ["MAIN", "ZONE2", "ZONE3", "ZONE4"]
+
+# Functions that are reported together when requesting them with a single GET
+MULTIRESPONSE_FUNCTIONS = {
+    "BASIC": [
+        "PWR",
+        "PWRB",
+        "SLEEP",
+        "VOL",
+        "MUTE",
+        "ZONEBAVAIL",
+        "ZONEBVOL",
+        "ZONEBMUTE",
+        "INP",
+        "STRAIGHT",
+        "ENHANCER",
+        "SOUNDPRG",
+        "DIRMODE",
+    ],
+    "METAINFO": ["ARTIST", "ALBUM", "SONG", "TRACK", "CHNAME"],
+    "RDSINFO": ["RDSPRGTYPE", "RDSPRGSERVICE", "RDSTXTA", "RDSTXTB", "RDSCLOCK"],
+}
+
+# Values of these input subunits are updated by the metadata push task
+METADATA_INPUT_SUBUNITS = [
+    "AIRPLAY",
+    "BT",
+    "DEEZER",
+    "IPOD",
+    "IPODUSB",
+    "NAPSTER",
+    "NETRADIO",
+    "PANDORA",
+    "PC",
+    "RHAP",
+    "SERVER",
+    "SPOTIFY",
+    "TIDAL",
+    "USB",
+]
+
+DEFAULT_INPUT_SUBUNITS = [
+    "AIRPLAY",
+    "BT",
+    "NETRADIO",
+    "SERVER",
+    "SPOTIFY",
+    "TUN",
+    "USB",
+]
+
+DEFAULT_INPNAMES = {
+    "HDMI1": "Blu-ray",
+    "HDMI2": "Console",
+    "HDMI3": "HDMI3",
+    "HDMI4": "HDMI4",
+    "AV1": "AV1",
+    "AUDIO1": "AUDIO1",
+    "USB": "USB",
+}
+
+LINE_REGEX = re.compile(r"@(?P<subunit>.+?):(?P<function>.+?)=(?P<value>.*)")
+VOLUME_STEP_REGEX = re.compile(r"(?P<direction>Up|Down)( (?P<step>\d+) dB)?")
+
+
+@dataclass
+class YncaSimulatorConfig:
+    """Describes the receiver that the simulator pretends to be."""
+
+    modelname: str = "RX-A810"
+    version: str = "1.23/4.56"
+    zones: list[str] = field(default_factory=lambda: list(ZONE_SUBUNITS))
+    input_subunits: list[str] = field(
+        default_factory=lambda: list(DEFAULT_INPUT_SUBUNITS)
+    )
+    inpnames: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_INPNAMES))
+    # Scene names per zone, zones not in the dict get no scenes
+    scenenames: dict[str, list[str]] = field(
+        default_factory=lambda: {
+            zone: [f"Scene {i}" for i in range(1, 5)] for zone in ZONE_SUBUNITS
+        }
+    )
+    # Delay in seconds before a command gets handled
+    command_latency: float = 0.0
+    # Interval in seconds between metadata pushes, 0 disables pushing
+    metadata_push_interval: float = 0.0
+
+
+def build_store(config: YncaSimulatorConfig) -> dict[str, dict[str, str]]:
+    """Build initial receiver state from a simulator configuration."""
+    store: dict[str, dict[str, str]] = {}
+
+    system = {"MODELNAME": config.modelname, "VERSION": config.version, "PWR": "On"}
+    for name, value in config.inpnames.items():
+        system[f"INPNAME{name}"] = value
+    store["SYS"] = system
+
+    for zone in config.zones:
+        values = {
+            "AVAIL": "Ready",
+            "PWR": "Standby",
+            "VOL": "-40.0",
+            "MUTE": "Off",
+            "INP": "HDMI1",
+            "STRAIGHT": "Off",
+            "SOUNDPRG": "Standard",
+            "ZONENAME": zone.capitalize(),
+        }
+        if zone == "MAIN":
+            values["DIRMODE"] = "Off"
+        for index, scenename in enumerate(config.scenenames.get(zone, []), start=1):
+            values[f"SCENE{index}NAME"] = scenename
+        store[zone] = values
+
+    for subunit in config.input_subunits:
+        values = {"AVAIL": "Ready"}
+        if subunit in METADATA_INPUT_SUBUNITS:
+            values.update(
+                {
+                    "PLAYBACKINFO": "Stop",
+                    "ARTIST": "Artist",
+                    "ALBUM": "Album",
+                    "SONG": "Song",
+                    "ELAPSEDTIME": "0:00",
+                    "REPEAT": "Off",
+                    "SHUFFLE": "Off",
+                }
+            )
+        elif subunit == "TUN":
+            values.update({"BAND": "FM", "FMFREQ": "101.60", "AMFREQ": "1080"})
+        store[subunit] = values
+
+    return store
+
+
+def _adjust_volume(current: str, direction: str, step: str | None) -> str:
+    delta = float(step) if step else 0.5
+    volume = float(current) + (delta if direction == "Up" else -delta)
+    return f"{min(16.5, max(-80.5, volume)):.1f}"
+
+
+class YncaSimulator:
+    """YNCA receiver simulator serving one or more TCP clients."""
+
+    def __init__(self, config: YncaSimulatorConfig | None = None) -> None:
+        self.config = config or YncaSimulatorConfig()
+        self.store = build_store(self.config)
+        self.commands_received = 0
+        self.messages_sent = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._push_task: asyncio.Task | None = None
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            msg = "Simulator not started"
+            raise RuntimeError(msg)
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def serial_url(self) -> str:
+        return f"socket://127.0.0.1:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        if self.config.metadata_push_interval > 0:
+            self._push_task = asyncio.create_task(self._push_metadata())
+
+    async def stop(self) -> None:
+        if self._push_task:
+            self._push_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._push_task
+            self._push_task = None
+        await self.disconnect_clients()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def disconnect_clients(self) -> None:
+        """Drop all client connections, e.g. to trigger a reconnect."""
+        for writer in list(self._writers):
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+        self._writers.clear()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.stop()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                if self.config.command_latency > 0:
+                    await asyncio.sleep(self.config.command_latency)
+                self.commands_received += 1
+                for response in self.handle_line(line.decode("utf-8").strip()):
+                    self._write(writer, response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _write(self, writer: asyncio.StreamWriter, line: str) -> None:
+        self.messages_sent += 1
+        writer.write(f"{line}\r\n".encode())
+
+    def broadcast(self, subunit: str, function: str, value: str) -> None:
+        """Store a value and report it to all connected clients."""
+        self.store.setdefault(subunit, {})[function] = value
+        for writer in self._writers:
+            self._write(writer, f"@{subunit}:{function}={value}")
+
+    def handle_line(self, line: str) -> list[str]:
+        """Handle one received YNCA line and return the response lines."""
+        match = LINE_REGEX.match(line)
+        if match is None:
+            return [UNDEFINED]
+
+        subunit = match.group("subunit")
+        function = match.group("function")
+        value = match.group("value")
+
+        if subunit not in self.store:
+            return [UNDEFINED]
+        if value == "?":
+            return self._get(subunit, function)
+        return self._put(subunit, function, value)
+
+    def _get(self, subunit: str, function: str) -> list[str]:
+        values = self.store[subunit]
+
+        if function in MULTIRESPONSE_FUNCTIONS:
+            functions = [f for f in MULTIRESPONSE_FUNCTIONS[function] if f in values]
+        elif function == "INPNAME" and subunit == "SYS":
+            functions = [f for f in values if f.startswith("INPNAME")]
+        elif function == "SCENENAME":
+            functions = [f for f in values if re.fullmatch(r"SCENE\d+NAME", f)]
+        else:
+            functions = [function]
+
+        if not functions or any(f not in values for f in functions):
+            return [UNDEFINED]
+        return [f"@{subunit}:{f}={values[f]}" for f in functions]
+
+    def _put(self, subunit: str, function: str, value: str) -> list[str]:
+        values = self.store[subunit]
+
+        if function == "VOL" and (step := VOLUME_STEP_REGEX.fullmatch(value)):
+            value = _adjust_volume(
+                values["VOL"], step.group("direction"), step.group("step")
+            )
+        elif function == "SCENE":
+            # Recalling a scene does not report anything by itself
+            return []
+        elif function not in values:
+            return [UNDEFINED]
+
+        if values.get(function) == value:
+            return []
+        values[function] = value
+        return [f"@{subunit}:{function}={value}"]
+
+    async def _push_metadata(self) -> None:
+        """Push playback updates like a receiver streaming network audio."""
+        tick = 0
+        subunits = [
+            s for s in self.config.input_subunits if s in METADATA_INPUT_SUBUNITS
+        ]
+        while True:
+            await asyncio.sleep(self.config.metadata_push_interval)
+            tick += 1
+            for subunit in subunits:
+                self.broadcast(subunit, "ELAPSEDTIME", f"{tick // 60}:{tick % 60:02}")
+                if tick % 10 == 0:
+                    self.broadcast(subunit, "SONG", f"Song {tick // 10}")
+            for writer in list(self._writers):
+                with contextlib.suppress(ConnectionError):
+                    await writer.drain()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    config = YncaSimulatorConfig(
+        command_latency=args.latency,
+        metadata_push_interval=args.push_interval,
+    )
+    if args.zones:
+        config.zones = ZONE_SUBUNITS[: args.zones]
+
+    simulator = YncaSimulator(config)
+    await simulator.start(args.host, args.port)
+    _LOGGER.info("YNCA simulator listening on %s:%d", args.host, simulator.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="YNCA receiver simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50000)
+    parser.add_argument("--zones", type=int, choices=range(1, 5), default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Per command latency in seconds"
+    )
+    parser.add_argument(
+        "--push-interval",
+        type=float,
+        default=1.0,
+        help="Metadata push interval in seconds, 0 to disable",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()